@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Vakansiya.biz scraper
+Starts a local mock of the listing API and CV pages in a separate process, crawls it with
+ComprehensiveVakansiyaScraper and reports throughput, peak memory and parse CPU.
+
+    python benchmark.py --candidates 1000 --latency-ms 50 --error-rate 0.01
+    python benchmark.py --candidates 1000000 --limit 20000 --parse-executor process --json bench.json
+
+Listing entries and CV pages are generated from the candidate id, so even 1M candidates take no memory on the
+server side. Retry backoff is scaled down so injected errors measure retry overhead rather than sleeping.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from aiohttp import web
+
+from retry_policy import DEFAULT_RETRY_POLICIES, RetryPolicy
+from vakansiya_scraper import ComprehensiveVakansiyaScraper
+
+CITIES = [(1, 'Bakı', 'Baku'), (2, 'Sumqayıt', 'Sumgait'), (3, 'Gəncə', 'Ganja'), (4, 'Lənkəran', 'Lankaran')]
+INDUSTRIES = [(1, 'İnformasiya texnologiyaları', 'Information technology'), (2, 'Satış', 'Sales'),
+              (3, 'Maliyyə', 'Finance'), (4, 'Təhsil', 'Education'), (5, 'Tikinti', 'Construction')]
+SKILLS = ['Python', 'Excel', 'SQL', 'Photoshop', 'Java', 'Word', '1C', 'AutoCAD', 'JavaScript', 'Power BI']
+LANGUAGES = ['Azərbaycan dili', 'İngilis dili', 'Rus dili', 'Türk dili']
+LEVELS = ['Əla', 'Yaxşı', 'Orta', 'Zəif']
+DEGREES = ['Bakalavr', 'Magistr', 'Orta ixtisas']
+
+
+def synthetic_listing(candidate_id: int) -> Dict:
+    """Listing API entry for a candidate, derived from its id"""
+    rng = random.Random(candidate_id)
+    city = rng.choice(CITIES)
+    industry = rng.choice(INDUSTRIES)
+    return {
+        'id': candidate_id,
+        'user_id': candidate_id + 100000,
+        'slug': f'candidate-{candidate_id}',
+        'title': f'{industry[2]} specialist',
+        'firstname': f'Ad{candidate_id}',
+        'lastname': f'Soyad{candidate_id}',
+        'gender': rng.choice([0, 1]),
+        'age': rng.randint(18, 60),
+        'expected_salary': rng.choice([0, 500, 800, 1000, 1500, 2000, 3000]),
+        'is_premium': int(rng.random() < 0.1),
+        'premium_start': None,
+        'premium_end': None,
+        'show': 1,
+        'cv_language': 'az',
+        'country_id': 1,
+        'city_id': city[0],
+        'industry_id': industry[0],
+        'country': {'id': 1, 'title_az': 'Azərbaycan', 'title_en': 'Azerbaijan', 'title_ru': 'Азербайджан'},
+        'city': {'id': city[0], 'title_az': city[1], 'title_en': city[2], 'title_ru': city[2]},
+        'industry': {'id': industry[0], 'title_az': industry[1], 'title_en': industry[2], 'title_ru': industry[2]}
+    }
+
+
+def entry_block(title: str, paragraphs: List[str]) -> str:
+    return (f'<div class="mb-3 ex_ed_aw"><h5 class="font-16 m-0">{title}</h5>'
+            + ''.join(f'<p class="m-b0">{paragraph}</p>' for paragraph in paragraphs) + '</div>')
+
+
+def synthetic_cv_page(candidate_id: int, padding_kb: int = 60) -> str:
+    """CV page with the section markup of vakansiya.biz, padded with navigation and script noise"""
+    rng = random.Random(candidate_id)
+    experience = ''.join(
+        entry_block(f'Specialist {n}', [f'Company {rng.randint(1, 500)}, Bakı', f'{2010 + n} - {2012 + n}',
+                                        'Responsibilities<br/>and achievements'])
+        for n in range(rng.randint(0, 5))
+    )
+    education = ''.join(
+        entry_block(f'Program {n}', [f'University {rng.randint(1, 40)}, Bakı', rng.choice(DEGREES), f'{2005 + n} - {2009 + n}'])
+        for n in range(rng.randint(0, 3))
+    )
+    awards = ''.join(
+        entry_block(f'Certificate {n}', ['Issuer', 'Description', '2020 - 2021'])
+        for n in range(rng.randint(0, 2))
+    )
+    skills = ''.join(f'<tr><td>{skill}</td><td>{rng.choice(LEVELS)}</td><td>{rng.randint(1, 10)} il</td></tr>'
+                     for skill in rng.sample(SKILLS, rng.randint(0, 6)))
+    languages = ''.join(f'<tr><td>{language}</td><td>{rng.choice(LEVELS)}</td></tr>'
+                        for language in rng.sample(LANGUAGES, rng.randint(1, 3)))
+    padding = '<li><a href="/az/vacancies">Vakansiyalar</a></li>' * (padding_kb * 1024 // 50)
+    return f'''<!DOCTYPE html><html><head><title>CV {candidate_id}</title>
+<script>window.__state = {{"html": "<div id=\\"contacts\\">"}};</script><style>.ex_ed_aw {{ margin: 0 }}</style></head>
+<body><nav><ul>{padding}</ul></nav>
+<div id="resume_headline_bx" class="box"><h3>Haqqında</h3><p>Candidate {candidate_id} summary text.</p></div>
+<div id="contacts">
+<div class="clearfix"><label>Ünvan</label><span class="clearfix">Bakı</span></div>
+<div class="clearfix"><label>Yaş</label><span class="clearfix">{rng.randint(18, 60)}</span></div>
+<div class="clearfix"><label>E-mail</label><span class="clearfix">candidate{candidate_id}@example.az</span></div>
+<div class="clearfix"><label>Telefon nömrəsi</label><span class="clearfix">+994 50 000 00 00</span></div>
+<div class="clearfix"><label>Ailə vəziyyəti</label><span class="clearfix">Subay</span></div>
+<div class="clearfix"><label>Linkedin</label><span class="clearfix">{'linkedin.com/in/c' if rng.random() < 0.3 else '---'}</span></div>
+</div>
+<div id="employment_bx">{experience}</div>
+<div id="education_bx">{education}</div>
+<div id="awards_bx">{awards}</div>
+<div id="it_skills_bx"><table><tbody>{skills}</tbody></table></div>
+<div id="lang_skills_bx"><table><tbody>{languages}</tbody></table></div>
+<footer><p>© vakansiya.biz</p></footer><script>console.log(1)</script></body></html>'''
+
+
+def create_app(candidates: int, per_page: int, latency: Tuple[float, float], error_rate: float,
+               padding_kb: int) -> web.Application:
+    """Mock of /api/v1/resumes/search and /az/cv/{id}/{slug}"""
+    last_page = max(1, (candidates + per_page - 1) // per_page)
+
+    async def respond_slowly():
+        await asyncio.sleep(random.uniform(*latency))
+        return random.random() < error_rate
+
+    async def search(request):
+        if await respond_slowly():
+            return web.Response(status=503)
+        page = int(request.query.get('page', 1))
+        first = (page - 1) * per_page + 1
+        data = [synthetic_listing(candidate_id) for candidate_id in range(first, min(first + per_page, candidates + 1))]
+        return web.json_response({'data': data, 'current_page': page, 'last_page': last_page, 'total': candidates})
+
+    async def cv_page(request):
+        if await respond_slowly():
+            return web.Response(status=503)
+        candidate_id = int(request.match_info['candidate_id'])
+        if not 1 <= candidate_id <= candidates:
+            return web.Response(status=404)
+        return web.Response(text=synthetic_cv_page(candidate_id, padding_kb), content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/api/v1/resumes/search', search)
+    app.router.add_get('/az/cv/{candidate_id}/{slug}', cv_page)
+    return app
+
+
+def serve(port_queue, options: Dict):
+    """Server process: report the bound port, then serve until terminated"""
+    async def run():
+        runner = web.AppRunner(create_app(**options), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port_queue.put(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def run_crawl(scraper: ComprehensiveVakansiyaScraper, limit: int) -> int:
+    """Crawl without keeping records, so memory reflects the scraper itself"""
+    return await scraper.crawl(lambda index, record: None, limit=limit)
+
+
+def cpu_seconds(who) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_benchmark(args) -> Dict:
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, daemon=True, args=(port_queue, {
+        'candidates': args.candidates,
+        'per_page': args.per_page,
+        'latency': (max(0.0, args.latency_ms - args.jitter_ms) / 1000, (args.latency_ms + args.jitter_ms) / 1000),
+        'error_rate': args.error_rate,
+        'padding_kb': args.page_kb
+    }))
+    server.start()
+    port = port_queue.get(timeout=30)
+
+    try:
+        scraper = ComprehensiveVakansiyaScraper(
+            max_concurrent=args.max_concurrent,
+            max_concurrency_limit=args.max_concurrency_limit,
+            requests_per_second=args.requests_per_second,
+            parse_executor=args.parse_executor,
+            parser_backend=args.parser_backend,
+            http_backend=args.http_backend,
+            retry_policies={name: RetryPolicy(policy.attempts, base_delay=0.05, max_delay=1.0)
+                            for name, policy in DEFAULT_RETRY_POLICIES.items()}
+        )
+        scraper.base_api_url = f'http://127.0.0.1:{port}/api/v1/resumes/search'
+        scraper.base_page_url = f'http://127.0.0.1:{port}/az/cv'
+
+        cpu_before = cpu_seconds(resource.RUSAGE_SELF)
+        started = time.perf_counter()
+        scraped = asyncio.run(run_crawl(scraper, args.limit or args.candidates))
+        elapsed = time.perf_counter() - started
+        # Only the parse pool has exited by now; the server child is still running
+        pool_cpu = cpu_seconds(resource.RUSAGE_CHILDREN)
+        loop_cpu = cpu_seconds(resource.RUSAGE_SELF) - cpu_before
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.metrics:
+        scraper.metrics.write(args.metrics)
+    histograms = scraper.metrics.histograms
+    parse_steps = sum(histogram.total for name, histogram in histograms.items() if name.startswith('parse.'))
+    request = histograms['request'].to_dict() if 'request' in histograms else {}
+    return {
+        'candidates': scraped,
+        'elapsed_seconds': elapsed,
+        'candidates_per_second': scraped / elapsed if elapsed else 0.0,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'event_loop_cpu_seconds': loop_cpu,
+        'parse_pool_cpu_seconds': pool_cpu,
+        'parse_cpu_seconds': parse_steps,
+        'parse_ms_per_candidate': parse_steps / scraped * 1000 if scraped else 0.0,
+        'request_p50_ms': request.get('p50', 0.0) * 1000,
+        'request_p95_ms': request.get('p95', 0.0) * 1000,
+        'errors': scraper.metrics.counters.get('http_errors', 0) + scraper.metrics.counters.get('request_errors', 0),
+        'retries': scraper.metrics.counters.get('retries', 0),
+        'megabytes_downloaded': scraper.metrics.counters.get('bytes_downloaded', 0) / 1024 / 1024,
+        'final_concurrency': int(scraper.concurrency.limit),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('json', 'metrics')}
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local mock of vakansiya.biz")
+    parser.add_argument('--candidates', type=int, default=1000, help="candidates served by the mock (1k to 1M)")
+    parser.add_argument('--limit', type=int, help="stop after this many candidates")
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="mean response latency")
+    parser.add_argument('--jitter-ms', type=float, default=25.0, help="uniform latency jitter around the mean")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of responses that are 503")
+    parser.add_argument('--page-kb', type=int, default=60, help="navigation padding per CV page")
+    parser.add_argument('--max-concurrent', type=int, default=10)
+    parser.add_argument('--max-concurrency-limit', type=int)
+    parser.add_argument('--requests-per-second', type=float, default=1000.0)
+    parser.add_argument('--parse-executor', choices=['process', 'thread', 'inline'], default='process')
+    parser.add_argument('--parser-backend', default='bs4')
+    parser.add_argument('--http-backend', default='aiohttp')
+    parser.add_argument('--json', help="write results to this JSON file for comparing runs")
+    parser.add_argument('--metrics', help="write the scraper's per-stage metrics to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = run_benchmark(args)
+
+    print(f"\nCandidates:        {results['candidates']}")
+    print(f"Elapsed:           {results['elapsed_seconds']:.2f}s")
+    print(f"Throughput:        {results['candidates_per_second']:.1f} candidates/s")
+    print(f"Peak memory:       {results['peak_rss_mb']:.1f} MB RSS")
+    print(f"Parse CPU:         {results['parse_cpu_seconds']:.2f}s ({results['parse_ms_per_candidate']:.2f} ms/candidate)")
+    print(f"Event loop CPU:    {results['event_loop_cpu_seconds']:.2f}s, parse pool CPU {results['parse_pool_cpu_seconds']:.2f}s")
+    print(f"Request latency:   p50 {results['request_p50_ms']:.1f} ms, p95 {results['request_p95_ms']:.1f} ms")
+    print(f"Downloaded:        {results['megabytes_downloaded']:.1f} MB, {results['errors']:g} request errors, {results['retries']:g} retries")
+    print(f"Final concurrency: {results['final_concurrency']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Typed record model for scraped Vakansiya.biz candidates
+msgspec Structs decode snapshots straight from JSON bytes; countries, cities and industries are interned so
+every candidate shares the same few place objects instead of carrying its own copy of their titles.
+Fields that are absent in the JSON stay UNSET and are left out again when encoding; fields outside the
+model are dropped, except in contact_info, which keeps every scraped label.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import msgspec
+from msgspec import UNSET, UnsetType
+
+OptionalText = Union[str, None, UnsetType]
+OptionalNumber = Union[int, str, None, UnsetType]
+
+
+class Place(msgspec.Struct, frozen=True, gc=False):
+    """Country, city or industry as returned by the listing API"""
+    id: int
+    title_az: OptionalText = UNSET
+    title_en: OptionalText = UNSET
+    title_ru: OptionalText = UNSET
+
+
+class User(msgspec.Struct, gc=False):
+    id: int
+    thumb: OptionalText = UNSET
+    image: OptionalText = UNSET
+
+
+# Labels of the contacts section: address, age, email, phone, marital_status, linkedin, github, skype, plus
+# any label the site adds later (kept lowercased), so this stays an open mapping rather than a Struct
+ContactInfo = Dict[str, Optional[str]]
+
+
+class Experience(msgspec.Struct, gc=False):
+    job_title: OptionalText = UNSET
+    company: OptionalText = UNSET
+    location: OptionalText = UNSET
+    start_date: OptionalText = UNSET
+    end_date: OptionalText = UNSET
+    dates: OptionalText = UNSET
+    description: OptionalText = UNSET
+
+
+class Education(msgspec.Struct, gc=False):
+    program: OptionalText = UNSET
+    institution: OptionalText = UNSET
+    location: OptionalText = UNSET
+    degree_level: OptionalText = UNSET
+    start_date: OptionalText = UNSET
+    end_date: OptionalText = UNSET
+    dates: OptionalText = UNSET
+
+
+class Award(msgspec.Struct, gc=False):
+    title: OptionalText = UNSET
+    issuer: OptionalText = UNSET
+    description: OptionalText = UNSET
+    start_date: OptionalText = UNSET
+    end_date: OptionalText = UNSET
+    dates: OptionalText = UNSET
+
+
+class Skill(msgspec.Struct, gc=False):
+    skill_name: OptionalText = UNSET
+    proficiency_level: OptionalText = UNSET
+    experience_years: OptionalText = UNSET
+
+
+class Language(msgspec.Struct, gc=False):
+    language: OptionalText = UNSET
+    proficiency_level: OptionalText = UNSET
+
+
+class Candidate(msgspec.Struct):
+    """Listing API fields followed by the scraped CV sections, in snapshot key order"""
+    id: Union[int, UnsetType] = UNSET
+    country_id: OptionalNumber = UNSET
+    city_id: OptionalNumber = UNSET
+    industry_id: OptionalNumber = UNSET
+    user_id: OptionalNumber = UNSET
+    slug: OptionalText = UNSET
+    cv_language: OptionalText = UNSET
+    title: OptionalText = UNSET
+    firstname: OptionalText = UNSET
+    lastname: OptionalText = UNSET
+    gender: OptionalNumber = UNSET
+    age: OptionalNumber = UNSET
+    expected_salary: OptionalNumber = UNSET
+    show: OptionalNumber = UNSET
+    premium_start: OptionalText = UNSET
+    premium_end: OptionalText = UNSET
+    is_premium: OptionalNumber = UNSET
+    user: Union[User, None, UnsetType] = UNSET
+    country: Union[Place, None, UnsetType] = UNSET
+    city: Union[Place, None, UnsetType] = UNSET
+    industry: Union[Place, None, UnsetType] = UNSET
+    candidate_id: Union[int, UnsetType] = UNSET
+    url: OptionalText = UNSET
+    summary: OptionalText = UNSET
+    contact_info: Union[ContactInfo, UnsetType] = UNSET
+    experience: Union[List[Experience], UnsetType] = UNSET
+    education: Union[List[Education], UnsetType] = UNSET
+    awards_certificates: Union[List[Award], UnsetType] = UNSET
+    skills: Union[List[Skill], UnsetType] = UNSET
+    languages: Union[List[Language], UnsetType] = UNSET
+    error: OptionalText = UNSET
+    scraping_error: OptionalText = UNSET
+    deleted: Union[bool, UnsetType] = UNSET
+    deleted_at: OptionalText = UNSET
+
+    @property
+    def key(self) -> Optional[int]:
+        """Candidate id, from the scraped record or the listing entry"""
+        return self.candidate_id or self.id or None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not UNSET or self.scraping_error is not UNSET
+
+
+_decoder = msgspec.json.Decoder(Candidate)
+_list_decoder = msgspec.json.Decoder(List[Candidate])
+_encoder = msgspec.json.Encoder()
+
+
+class PlaceRegistry:
+    """Shares one Place object per distinct country/city/industry"""
+
+    def __init__(self):
+        self.places: Dict[Place, Place] = {}
+
+    def intern(self, candidate: Candidate) -> Candidate:
+        for field in ('country', 'city', 'industry'):
+            place = getattr(candidate, field)
+            if isinstance(place, Place):
+                setattr(candidate, field, self.places.setdefault(place, place))
+        return candidate
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+
+def decode_candidate(data: Union[bytes, str], registry: Optional[PlaceRegistry] = None) -> Candidate:
+    """Decode one JSON object (e.g. a journal or JSON Lines record)"""
+    candidate = _decoder.decode(data)
+    return registry.intern(candidate) if registry is not None else candidate
+
+
+def decode_candidates(data: Union[bytes, str], registry: Optional[PlaceRegistry] = None) -> List[Candidate]:
+    """Decode a JSON array snapshot, interning places into registry (a fresh one when not given)"""
+    registry = registry if registry is not None else PlaceRegistry()
+    return [registry.intern(candidate) for candidate in _list_decoder.decode(data)]
+
+
+def load_candidates(filename: str, registry: Optional[PlaceRegistry] = None) -> List[Candidate]:
+    with open(filename, 'rb') as f:
+        return decode_candidates(f.read(), registry)
+
+
+def iter_json_lines(lines: Iterable[bytes], registry: Optional[PlaceRegistry] = None) -> Iterator[Candidate]:
+    """Decode JSON Lines records, skipping undecodable lines"""
+    registry = registry if registry is not None else PlaceRegistry()
+    for line in lines:
+        try:
+            yield decode_candidate(line, registry)
+        except msgspec.DecodeError:
+            continue
+
+
+def encode_candidate(candidate: Candidate) -> bytes:
+    return _encoder.encode(candidate)
+
+
+def encode_candidates(candidates: Iterable[Candidate]) -> bytes:
+    return _encoder.encode(list(candidates))
+
+
+def to_record(candidate: Candidate) -> Dict:
+    """Plain dict form used by the exporters and the crawl journal"""
+    return msgspec.to_builtins(candidate)
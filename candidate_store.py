@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+SQLite store of scraped Vakansiya.biz candidates
+Candidates and their experience/education/skills/languages/awards rows are upserted by candidate_id; a
+content hash per candidate means re-importing a refreshed snapshot only rewrites the candidates that changed.
+Filters on industry, city, age and salary are served by indexes.
+
+    python candidate_store.py import full_candidates.json full_candidates.db --full
+    python candidate_store.py query full_candidates.db --industry-id 5 --min-age 25 --max-salary 1500
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from exporters import CHILD_TABLE_SOURCES, DIMENSION_COLUMNS, DIMENSIONS, DimensionTables, candidate_row, \
+    read_candidates, to_int
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS candidates (
+    candidate_id INTEGER PRIMARY KEY,
+    user_id INTEGER,
+    slug TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    age INTEGER,
+    job_title TEXT,
+    industry_id INTEGER,
+    city_id INTEGER,
+    country_id INTEGER,
+    expected_salary INTEGER,
+    is_premium INTEGER,
+    premium_start TEXT,
+    premium_end TEXT,
+    url TEXT,
+    summary TEXT,
+    address TEXT,
+    email TEXT,
+    phone TEXT,
+    marital_status TEXT,
+    linkedin TEXT,
+    github TEXT,
+    skype TEXT,
+    experience_count INTEGER,
+    education_count INTEGER,
+    awards_count INTEGER,
+    skills_count INTEGER,
+    languages_count INTEGER,
+    has_error INTEGER,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_industry_id ON candidates (industry_id);
+CREATE INDEX IF NOT EXISTS candidates_city_id ON candidates (city_id);
+CREATE INDEX IF NOT EXISTS candidates_age ON candidates (age);
+CREATE INDEX IF NOT EXISTS candidates_expected_salary ON candidates (expected_salary);
+
+CREATE TABLE IF NOT EXISTS experience (
+    candidate_id INTEGER NOT NULL REFERENCES candidates ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    job_title TEXT,
+    company TEXT,
+    location TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    dates TEXT,
+    description TEXT,
+    PRIMARY KEY (candidate_id, position)
+);
+CREATE TABLE IF NOT EXISTS education (
+    candidate_id INTEGER NOT NULL REFERENCES candidates ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    program TEXT,
+    institution TEXT,
+    location TEXT,
+    degree_level TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    dates TEXT,
+    PRIMARY KEY (candidate_id, position)
+);
+CREATE TABLE IF NOT EXISTS skills (
+    candidate_id INTEGER NOT NULL REFERENCES candidates ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    skill_name TEXT,
+    proficiency_level TEXT,
+    experience_years TEXT,
+    PRIMARY KEY (candidate_id, position)
+);
+CREATE TABLE IF NOT EXISTS languages (
+    candidate_id INTEGER NOT NULL REFERENCES candidates ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    language TEXT,
+    proficiency_level TEXT,
+    PRIMARY KEY (candidate_id, position)
+);
+CREATE TABLE IF NOT EXISTS awards (
+    candidate_id INTEGER NOT NULL REFERENCES candidates ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    issuer TEXT,
+    description TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    dates TEXT,
+    PRIMARY KEY (candidate_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS countries (id INTEGER PRIMARY KEY, title_az TEXT, title_en TEXT, title_ru TEXT);
+CREATE TABLE IF NOT EXISTS cities (id INTEGER PRIMARY KEY, title_az TEXT, title_en TEXT, title_ru TEXT);
+CREATE TABLE IF NOT EXISTS industries (id INTEGER PRIMARY KEY, title_az TEXT, title_en TEXT, title_ru TEXT);
+'''
+
+# Columns of the candidates table filled from exporters.candidate_row
+CANDIDATE_COLUMNS = (
+    'candidate_id', 'user_id', 'slug', 'first_name', 'last_name', 'age', 'job_title',
+    'industry_id', 'city_id', 'country_id', 'expected_salary', 'is_premium', 'premium_start', 'premium_end',
+    'url', 'summary', 'address', 'email', 'phone', 'marital_status', 'linkedin', 'github', 'skype',
+    'experience_count', 'education_count', 'awards_count', 'skills_count', 'languages_count', 'has_error'
+)
+
+CHILD_COLUMNS = {
+    'experience': ('job_title', 'company', 'location', 'start_date', 'end_date', 'dates', 'description'),
+    'education': ('program', 'institution', 'location', 'degree_level', 'start_date', 'end_date', 'dates'),
+    'skills': ('skill_name', 'proficiency_level', 'experience_years'),
+    'languages': ('language', 'proficiency_level'),
+    'awards': ('title', 'issuer', 'description', 'start_date', 'end_date', 'dates')
+}
+
+# Indexed filters accepted by CandidateStore.query: keyword -> SQL condition
+QUERY_FILTERS = {
+    'industry_id': 'industry_id = ?',
+    'city_id': 'city_id = ?',
+    'min_age': 'age >= ?',
+    'max_age': 'age <= ?',
+    'min_salary': 'expected_salary >= ?',
+    'max_salary': 'expected_salary <= ?'
+}
+
+
+def content_hash(candidate: Dict) -> str:
+    """Stable digest of a candidate record, used to skip unchanged candidates on upsert"""
+    data = json.dumps(candidate, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class CandidateStore:
+    """Candidates and their child tables in one SQLite database (WAL mode)"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.db = sqlite3.connect(filename, timeout=60, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('PRAGMA foreign_keys=ON')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def upsert(self, candidates: Iterable[Dict], batch_size: int = 500, full: bool = False) -> Dict[str, int]:
+        """Insert new, update changed and delete tombstoned candidates, one transaction per batch
+
+        With full=True the candidates are a complete crawl: the import runs as one transaction that also
+        deletes every stored candidate the crawl did not contain. Returns counts of 'inserted', 'updated',
+        'unchanged' and 'deleted' candidates.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+        candidates = iter(candidates)
+        batches = iter(lambda: list(islice(candidates, batch_size)), [])
+        if not full:
+            for batch in batches:
+                with self.transaction():
+                    self._upsert_batch(batch, counts)
+            return counts
+
+        self.db.execute('CREATE TEMP TABLE IF NOT EXISTS seen_ids (candidate_id INTEGER PRIMARY KEY)')
+        with self.transaction():
+            self.db.execute('DELETE FROM temp.seen_ids')
+            for batch in batches:
+                self._upsert_batch(batch, counts, seen=True)
+            # An empty crawl is a failed one, not a site without candidates
+            if self.db.execute('SELECT EXISTS (SELECT 1 FROM temp.seen_ids)').fetchone()[0]:
+                counts['deleted'] += self.db.execute(
+                    'DELETE FROM candidates WHERE candidate_id NOT IN (SELECT candidate_id FROM temp.seen_ids)'
+                ).rowcount
+        return counts
+
+    @contextmanager
+    def transaction(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def _upsert_batch(self, batch: List[Dict], counts: Dict[str, int], seen: bool = False):
+        changed = {}
+        deleted = set()
+        for candidate in batch:
+            candidate_id = to_int(candidate.get('id') or candidate.get('candidate_id'))
+            if candidate_id is None:
+                continue
+            if candidate.get('deleted'):
+                deleted.add(candidate_id)
+                changed.pop(candidate_id, None)
+            else:
+                changed[candidate_id] = candidate
+                deleted.discard(candidate_id)
+
+        if seen:
+            self.db.executemany('INSERT OR IGNORE INTO temp.seen_ids VALUES (?)', [(i,) for i in changed])
+        known = self.stored_hashes(list(changed) + list(deleted))
+        hashes = {candidate_id: content_hash(candidate) for candidate_id, candidate in changed.items()}
+        for candidate_id, digest in hashes.items():
+            if known.get(candidate_id) == digest:
+                del changed[candidate_id]
+                counts['unchanged'] += 1
+            else:
+                counts['updated' if candidate_id in known else 'inserted'] += 1
+
+        deleted &= known.keys()
+        if deleted:
+            # Child rows go with their candidate through ON DELETE CASCADE
+            self.db.executemany('DELETE FROM candidates WHERE candidate_id = ?', [(i,) for i in deleted])
+            counts['deleted'] += len(deleted)
+        if not changed:
+            return
+
+        rows = []
+        for candidate_id, candidate in changed.items():
+            row = candidate_row(candidate)
+            rows.append([row[column] for column in CANDIDATE_COLUMNS] + [hashes[candidate_id]])
+        assignments = ', '.join(f'{column} = excluded.{column}' for column in CANDIDATE_COLUMNS[1:] + ('content_hash',))
+        self.db.executemany(f'''
+            INSERT INTO candidates ({', '.join(CANDIDATE_COLUMNS)}, content_hash)
+            VALUES ({', '.join('?' * (len(CANDIDATE_COLUMNS) + 1))})
+            ON CONFLICT (candidate_id) DO UPDATE SET {assignments}
+        ''', rows)
+
+        for table, columns in CHILD_COLUMNS.items():
+            self.db.executemany(f'DELETE FROM {table} WHERE candidate_id = ?', [(i,) for i in changed])
+            self.db.executemany(
+                f"INSERT INTO {table} (candidate_id, position, {', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * (len(columns) + 2))})",
+                [
+                    (candidate_id, position, *(entry.get(column) for column in columns))
+                    for candidate_id, candidate in changed.items()
+                    for position, entry in enumerate(candidate.get(CHILD_TABLE_SOURCES[table]) or [])
+                ]
+            )
+
+        dimensions = DimensionTables()
+        for candidate in changed.values():
+            dimensions.add(candidate)
+        for name in DIMENSIONS:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO {name} ({', '.join(DIMENSION_COLUMNS)}) VALUES (?, ?, ?, ?)",
+                [tuple(row[column] for column in DIMENSION_COLUMNS) for row in dimensions.rows(name)]
+            )
+
+    def stored_hashes(self, candidate_ids: List[int]) -> Dict[int, str]:
+        hashes = {}
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[start:start + 500]
+            hashes.update(self.db.execute(
+                f"SELECT candidate_id, content_hash FROM candidates WHERE candidate_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ).fetchall())
+        return hashes
+
+    def query(self, columns: Iterable[str] = CANDIDATE_COLUMNS, limit: Optional[int] = None, **filters) -> Iterator[Dict]:
+        """Candidates matching the indexed filters of QUERY_FILTERS, e.g. query(industry_id=5, min_age=25)"""
+        unknown = set(filters) - set(QUERY_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+        columns = list(columns)
+        conditions = [QUERY_FILTERS[name] for name, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        sql = f"SELECT {', '.join(columns)} FROM candidates"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY candidate_id'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        for row in self.db.execute(sql, params):
+            yield dict(zip(columns, row))
+
+    def count(self) -> int:
+        return self.db.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+
+
+def import_candidates(candidates: Iterable[Dict], filename: str, full: bool = False) -> Dict[str, int]:
+    """Upsert candidates into the store at filename, creating it if needed; full=True also deletes stored
+    candidates missing from them"""
+    with CandidateStore(filename) as store:
+        return store.upsert(candidates, full=full)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store of scraped candidates")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help="upsert a JSON array or JSON Lines export into the store")
+    import_parser.add_argument('source')
+    import_parser.add_argument('database')
+    import_parser.add_argument('--full', action='store_true',
+                               help="the source is a complete crawl: delete stored candidates it does not contain")
+    query_parser = subparsers.add_parser('query', help="print candidates matching indexed filters as JSON Lines")
+    query_parser.add_argument('database')
+    for name in QUERY_FILTERS:
+        query_parser.add_argument(f"--{name.replace('_', '-')}", type=int)
+    query_parser.add_argument('--limit', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        counts = import_candidates(read_candidates(args.source), args.database, full=args.full)
+        print(f"{args.database}: {', '.join(f'{count} {name}' for name, count in counts.items())}")
+    elif args.command == 'query':
+        with CandidateStore(args.database) as store:
+            filters = {name: getattr(args, name) for name in QUERY_FILTERS}
+            for row in store.query(limit=args.limit, **filters):
+                print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
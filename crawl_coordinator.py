@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Sharded crawl coordinator for the Vakansiya.biz scraper
+Candidates from the listing API go into a SQLite work queue; worker processes (or machines sharing the
+file) lease batches, scrape them with their own rate budget into their own journal shard, and a merge
+step writes the final JSON/CSV. Leases expire, so IDs held by a dead worker are picked up again.
+
+    python crawl_coordinator.py enqueue --queue crawl_queue.db
+    python crawl_coordinator.py run --queue crawl_queue.db --workers 4 --requests-per-second 2
+    python crawl_coordinator.py work --queue crawl_queue.db --worker-id node2   (on another machine)
+    python crawl_coordinator.py status --queue crawl_queue.db
+    python crawl_coordinator.py merge --queue crawl_queue.db --output full
+"""
+import argparse
+import asyncio
+import glob
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from crawl_journal import CrawlJournal
+from exporters import loads_record
+from http_cache import HttpCache
+from vakansiya_scraper import ComprehensiveVakansiyaScraper
+
+
+class WorkQueue:
+    """SQLite-backed queue of candidates with time-limited leases"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.db = sqlite3.connect(filename, timeout=60, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS work (
+                candidate_id INTEGER PRIMARY KEY,
+                position INTEGER NOT NULL,
+                candidate TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS work_status ON work (status, position)')
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, candidates: Iterable[Dict]) -> int:
+        """Add listing candidates in listing order, ignoring IDs already queued"""
+        position = self.db.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM work').fetchone()[0]
+        added = 0
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            for candidate in candidates:
+                if not (candidate.get('id') and candidate.get('slug')):
+                    continue
+                cursor = self.db.execute(
+                    'INSERT OR IGNORE INTO work (candidate_id, position, candidate) VALUES (?, ?, ?)',
+                    (candidate['id'], position, json.dumps(candidate, ensure_ascii=False))
+                )
+                if cursor.rowcount:
+                    position += 1
+                    added += 1
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        return added
+
+    def lease(self, worker: str, batch_size: int, lease_seconds: float) -> List[Dict]:
+        """Take up to batch_size pending candidates or candidates whose lease expired"""
+        now = time.time()
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.db.execute('''
+                SELECT candidate_id, candidate FROM work
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY position LIMIT ?
+            ''', (now, batch_size)).fetchall()
+            self.db.executemany('''
+                UPDATE work SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1
+                WHERE candidate_id = ?
+            ''', [(worker, now + lease_seconds, candidate_id) for candidate_id, _ in rows])
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        return [json.loads(candidate) for _, candidate in rows]
+
+    def renew(self, worker: str, candidate_ids: Iterable[int], lease_seconds: float):
+        """Extend this worker's leases on candidates still in progress"""
+        expires = time.time() + lease_seconds
+        self.db.executemany(
+            "UPDATE work SET lease_expires = ? WHERE candidate_id = ? AND status = 'leased' AND worker = ?",
+            [(expires, candidate_id, worker) for candidate_id in candidate_ids]
+        )
+
+    def complete(self, done_ids: Iterable[int] = (), failed_ids: Iterable[int] = ()):
+        """Mark candidates as scraped or as failed after all retries"""
+        self.db.execute('BEGIN IMMEDIATE')
+        self.db.executemany("UPDATE work SET status = 'done' WHERE candidate_id = ?",
+                            [(candidate_id,) for candidate_id in done_ids])
+        self.db.executemany("UPDATE work SET status = 'failed' WHERE candidate_id = ? AND status != 'done'",
+                            [(candidate_id,) for candidate_id in failed_ids])
+        self.db.execute('COMMIT')
+
+    def release(self, worker: str) -> int:
+        """Return a worker's leases to the queue, e.g. when it restarts under the same ID"""
+        return self.db.execute(
+            "UPDATE work SET status = 'pending', worker = NULL WHERE status = 'leased' AND worker = ?", (worker,)
+        ).rowcount
+
+    def requeue_failed(self) -> int:
+        """Put failed candidates back in the queue"""
+        return self.db.execute("UPDATE work SET status = 'pending', worker = NULL WHERE status = 'failed'").rowcount
+
+    def leased_by_others(self, worker: str) -> int:
+        """Live leases of other workers, which may still come back if those workers die"""
+        return self.db.execute(
+            "SELECT COUNT(*) FROM work WHERE status = 'leased' AND worker != ?", (worker,)
+        ).fetchone()[0]
+
+    def progress(self) -> Dict[str, int]:
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update(self.db.execute('SELECT status, COUNT(*) FROM work GROUP BY status').fetchall())
+        return counts
+
+    def positions(self) -> Iterator[int]:
+        """Candidate IDs in listing order"""
+        for (candidate_id,) in self.db.execute('SELECT candidate_id FROM work ORDER BY position'):
+            yield candidate_id
+
+
+def default_worker_id() -> str:
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+def shard_journal(shard_dir: str, worker_id: str) -> CrawlJournal:
+    return CrawlJournal(os.path.join(shard_dir, f'{worker_id}.journal.jsonl'))
+
+
+async def enqueue_listing(queue: WorkQueue, scraper: ComprehensiveVakansiyaScraper, limit: Optional[int] = None) -> int:
+    """Read the listing API into the work queue"""
+    candidates = []
+    async with scraper.create_session() as session:
+        async for candidate in scraper.iter_candidates_basic(session):
+            candidates.append(candidate)
+            if limit and len(candidates) >= limit:
+                break
+    added = queue.enqueue(candidates)
+    if scraper.listing_incomplete:
+        scraper.logger.warning("Listing API was not fully read, run enqueue again to add the missing pages")
+    scraper.logger.info(f"Queued {added} new candidates ({len(candidates) - added} already queued)")
+    return added
+
+
+async def run_worker(queue_path: str, shard_dir: str, worker_id: str, scraper: ComprehensiveVakansiyaScraper,
+                     batch_size: int = 20, lease_seconds: float = 300) -> int:
+    """Lease and scrape batches into this worker's journal shard until the queue is drained"""
+    queue = WorkQueue(queue_path)
+    os.makedirs(shard_dir, exist_ok=True)
+    journal = shard_journal(shard_dir, worker_id)
+
+    # A restarted worker resumes its shard; records it journaled before dying count as done
+    skip_ids = journal.completed_ids()
+    queue.complete(done_ids=skip_ids)
+    queue.release(worker_id)
+    held = set()
+    done, failed = [], []
+
+    def flush():
+        queue.complete(done, failed)
+        held.difference_update(done)
+        held.difference_update(failed)
+        done.clear()
+        failed.clear()
+        queue.renew(worker_id, held, lease_seconds)
+
+    def on_result(index: int, record: Dict):
+        journal.append(record)
+        candidate_id = record.get('id') or record.get('candidate_id')
+        (failed if 'error' in record or 'scraping_error' in record else done).append(candidate_id)
+
+    async def source(session):
+        while True:
+            batch = queue.lease(worker_id, batch_size, lease_seconds)
+            if batch:
+                held.update(candidate['id'] for candidate in batch)
+                for candidate in batch:
+                    yield candidate
+            elif queue.leased_by_others(worker_id):
+                # Wait for other workers to finish or for their leases to expire
+                await asyncio.sleep(min(lease_seconds / 3, 10))
+            else:
+                return
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            flush()
+
+    journal.open(resume=True)
+    heartbeat_task = asyncio.ensure_future(heartbeat())
+    try:
+        # Other workers may still be writing to the shared cache; the coordinator evicts once they are done
+        scraped = await scraper.crawl(on_result, skip_ids=skip_ids, source=source, evict_cache=False)
+    finally:
+        heartbeat_task.cancel()
+        flush()
+        journal.close()
+        queue.close()
+
+    scraper.logger.info(f"Worker {worker_id} finished {scraped} candidates")
+    return scraped
+
+
+def iter_merged_records(queue_path: str, shard_dir: str) -> Iterator[Dict]:
+    """Yield one record per queued candidate in listing order, preferring successful scrapes across shards"""
+    # Index byte offsets instead of records so the merge stays small in memory
+    best = {}
+    for filename in sorted(glob.glob(os.path.join(shard_dir, '*.journal.jsonl'))):
+        with open(filename, 'rb') as f:
+            offset = f.tell()
+            for line in iter(f.readline, b''):
+                try:
+                    record = loads_record(line)
+                except ValueError:
+                    offset = f.tell()
+                    continue
+                candidate_id = record.get('id') or record.get('candidate_id')
+                ok = 'error' not in record and 'scraping_error' not in record
+                if ok or candidate_id not in best or not best[candidate_id][2]:
+                    best[candidate_id] = (filename, offset, ok)
+                offset = f.tell()
+
+    queue = WorkQueue(queue_path)
+    files = {}
+    try:
+        for candidate_id in queue.positions():
+            if candidate_id not in best:
+                continue
+            filename, offset, _ = best[candidate_id]
+            if filename not in files:
+                files[filename] = open(filename, 'rb')
+            files[filename].seek(offset)
+            yield loads_record(files[filename].readline())
+    finally:
+        for f in files.values():
+            f.close()
+        queue.close()
+
+
+def worker_process(queue_path: str, shard_dir: str, worker_id: str, options: Dict):
+    scraper = create_scraper(options)
+    asyncio.run(run_worker(queue_path, shard_dir, worker_id, scraper,
+                           batch_size=options['batch_size'], lease_seconds=options['lease_seconds']))
+
+
+def create_scraper(options: Dict) -> ComprehensiveVakansiyaScraper:
+    """Scraper with this worker's own rate budget; shards parse inline since each is its own process"""
+    return ComprehensiveVakansiyaScraper(
+        max_concurrent=options['max_concurrent'],
+        requests_per_second=options['requests_per_second'],
+        cache=HttpCache() if options['cache'] else None,
+        parse_executor='inline'
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sharded Vakansiya.biz crawl coordinator")
+    parser.add_argument('--queue', default='crawl_queue.db', help="SQLite work queue shared by all workers")
+    parser.add_argument('--shard-dir', default='crawl_shards', help="directory holding one journal per worker")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = subparsers.add_parser('enqueue', help="read the listing API into the work queue")
+    enqueue.add_argument('--limit', type=int)
+
+    for name, help_text in (('work', "run one worker in this process"),
+                            ('run', "run several local worker processes")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('--requests-per-second', type=float, default=2.0, help="rate budget per worker")
+        command.add_argument('--max-concurrent', type=int, default=3, help="starting concurrency per worker")
+        command.add_argument('--batch-size', type=int, default=20)
+        command.add_argument('--lease-seconds', type=float, default=300)
+        command.add_argument('--no-cache', dest='cache', action='store_false', help="do not use the shared HTTP cache")
+        if name == 'work':
+            command.add_argument('--worker-id', default=None)
+        else:
+            command.add_argument('--workers', type=int, default=4)
+
+    subparsers.add_parser('status', help="show queue progress")
+    subparsers.add_parser('retry-failed', help="put failed candidates back in the queue")
+    merge = subparsers.add_parser('merge', help="merge worker shards into the final JSON and CSV")
+    merge.add_argument('--output', default='full', help="output filename base")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == 'enqueue':
+        queue = WorkQueue(args.queue)
+        scraper = ComprehensiveVakansiyaScraper(cache=HttpCache())
+        asyncio.run(enqueue_listing(queue, scraper, args.limit))
+        queue.close()
+    elif args.command in ('work', 'run'):
+        options = {key: getattr(args, key) for key in
+                   ('requests_per_second', 'max_concurrent', 'batch_size', 'lease_seconds', 'cache')}
+        if args.command == 'work':
+            worker_process(args.queue, args.shard_dir, args.worker_id or default_worker_id(), options)
+        else:
+            processes = [
+                multiprocessing.Process(target=worker_process,
+                                        args=(args.queue, args.shard_dir, f'{socket.gethostname()}-w{number}', options))
+                for number in range(args.workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            if args.cache:
+                evicted = HttpCache().evict()
+                if evicted:
+                    print(f"Evicted {evicted} entries from the HTTP cache")
+    elif args.command == 'retry-failed':
+        queue = WorkQueue(args.queue)
+        print(f"Requeued {queue.requeue_failed()} failed candidates")
+        queue.close()
+
+    if args.command in ('run', 'work', 'status', 'retry-failed'):
+        queue = WorkQueue(args.queue)
+        print(', '.join(f'{count} {status}' for status, count in queue.progress().items()))
+        queue.close()
+
+    if args.command == 'merge':
+        scraper = ComprehensiveVakansiyaScraper()
+        asyncio.run(scraper.save_to_json(iter_merged_records(args.queue, args.shard_dir), f'{args.output}_candidates.json'))
+        scraper.save_to_csv(iter_merged_records(args.queue, args.shard_dir), f'{args.output}_candidates.csv')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Append-only crawl journal for the Vakansiya.biz scraper
+Each finished candidate is written as one JSON line so an interrupted crawl can be resumed
+"""
+import os
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from exporters import dumps_record, loads_record
+
+# Listing position of a journaled candidate; only used to restore listing order on export
+INDEX_KEY = '_index'
+
+
+class CrawlJournal:
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.file = None
+
+    def open(self, resume: bool = False):
+        """Open the journal for appending, starting over unless resuming"""
+        if resume:
+            self.repair()
+            self.file = open(self.filename, 'ab')
+        else:
+            self.file = open(self.filename, 'wb')
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def repair(self):
+        """Drop a partially written last line left behind by a crash"""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def append(self, record: Dict, index: Optional[int] = None):
+        """Write one finished candidate and flush it to disk, with its listing position when known"""
+        if index is not None:
+            record = {**record, INDEX_KEY: index}
+        self.file.write(dumps_record(record) + b'\n')
+        self.file.flush()
+
+    def iter_entries(self) -> Iterator[Tuple[int, Dict]]:
+        """Yield (byte offset, record) for every decodable journal line, listing positions included"""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'rb') as f:
+            offset = f.tell()
+            for line in iter(f.readline, b''):
+                try:
+                    yield offset, loads_record(line)
+                except ValueError:
+                    pass
+                offset = f.tell()
+
+    def iter_lines(self) -> Iterator[Dict]:
+        """Yield every decodable journal line in write order"""
+        for _, record in self.iter_entries():
+            record.pop(INDEX_KEY, None)
+            yield record
+
+    def completed_ids(self) -> Set[int]:
+        """IDs that finished without an error and can be skipped on resume"""
+        completed = set()
+        for record in self.iter_lines():
+            candidate_id = record.get('id') or record.get('candidate_id')
+            if 'error' in record or 'scraping_error' in record:
+                completed.discard(candidate_id)
+            else:
+                completed.add(candidate_id)
+        return completed
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Yield the latest record per candidate in listing order, seeking to byte offsets instead of holding
+        records in memory
+
+        A candidate keeps the listing position of its latest crawl; records journaled without one (e.g. by a
+        dead-letter retry) keep the position of an earlier line, else they follow in journal order.
+        """
+        last_offset = {}
+        positions = {}
+        for offset, record in self.iter_entries():
+            candidate_id = record.get('id') or record.get('candidate_id')
+            if candidate_id not in last_offset:
+                positions[candidate_id] = (1, len(last_offset))
+            last_offset[candidate_id] = offset
+            if INDEX_KEY in record:
+                positions[candidate_id] = (0, record[INDEX_KEY])
+
+        if not last_offset:
+            return
+        with open(self.filename, 'rb') as f:
+            for candidate_id in sorted(last_offset, key=positions.__getitem__):
+                f.seek(last_offset[candidate_id])
+                record = loads_record(f.readline())
+                record.pop(INDEX_KEY, None)
+                yield record
@@ -0,0 +1,188 @@
+"""
+Per-stage timing metrics for the Vakansiya.biz scraper
+Network phases come from aiohttp tracing, waits and parse times from the scraper itself; a run ends with
+p50/p95/p99 summaries and can be written as JSON or Prometheus text
+"""
+import functools
+import inspect
+import json
+import math
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+import aiohttp
+
+# Stages summed up to tell whether a crawl is throttled, network-bound or parse-bound
+THROTTLE_STAGES = ('rate_limit_wait', 'concurrency_wait')
+NETWORK_STAGE = 'request'
+PARSE_STAGE = 'parse'
+
+
+class Histogram:
+    """Durations of one stage, in seconds, counted in log-spaced buckets so memory stays flat however many
+    are observed; percentiles are accurate to about 4% of the value"""
+    MIN_VALUE = 1e-6
+    GROWTH = 1.04
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def bucket(self, value: float) -> int:
+        if value <= self.MIN_VALUE:
+            return 0
+        return int(math.log(value / self.MIN_VALUE, self.GROWTH)) + 1
+
+    def observe(self, value: float):
+        index = self.bucket(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th observation, capped at the largest one seen"""
+        if not self.count:
+            return 0.0
+        rank = min(self.count - 1, int(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return min(self.MIN_VALUE * self.GROWTH ** index, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max
+        }
+
+
+class CrawlMetrics:
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+
+    def observe(self, name: str, seconds: float):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        self.histograms[name].observe(seconds)
+
+    def increment(self, name: str, value: float = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp tracing hooks timing DNS, connection setup, time to first byte and failures"""
+        trace_config = aiohttp.TraceConfig()
+
+        def mark(attribute):
+            async def hook(session, context, params):
+                setattr(context, attribute, time.perf_counter())
+            return hook
+
+        def measure(name, start_attribute):
+            async def hook(session, context, params):
+                started = getattr(context, start_attribute, None)
+                if started is not None:
+                    self.observe(name, time.perf_counter() - started)
+            return hook
+
+        async def on_request_exception(session, context, params):
+            self.increment('request_errors')
+
+        trace_config.on_dns_resolvehost_start.append(mark('dns_started'))
+        trace_config.on_dns_resolvehost_end.append(measure('dns', 'dns_started'))
+        trace_config.on_connection_queued_start.append(mark('queued_started'))
+        trace_config.on_connection_queued_end.append(measure('connection_queue', 'queued_started'))
+        trace_config.on_connection_create_start.append(mark('connect_started'))
+        trace_config.on_connection_create_end.append(measure('connect', 'connect_started'))
+        trace_config.on_request_headers_sent.append(mark('headers_sent'))
+        # on_request_end fires once the response headers are in, before the body is read
+        trace_config.on_request_end.append(measure('ttfb', 'headers_sent'))
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    def summary_lines(self) -> List[str]:
+        """Human readable per-stage percentiles plus where the time went"""
+        lines = []
+        for name in sorted(self.histograms):
+            stats = self.histograms[name].to_dict()
+            lines.append(f"{name}: n={stats['count']} p50={stats['p50'] * 1000:.1f}ms p95={stats['p95'] * 1000:.1f}ms "
+                         f"p99={stats['p99'] * 1000:.1f}ms max={stats['max'] * 1000:.1f}ms total={stats['sum']:.2f}s")
+        for name in sorted(self.counters):
+            lines.append(f"{name}: {self.counters[name]:g}")
+
+        throttled = sum(self.histograms[name].total for name in THROTTLE_STAGES if name in self.histograms)
+        network = self.histograms[NETWORK_STAGE].total if NETWORK_STAGE in self.histograms else 0.0
+        parsing = self.histograms[PARSE_STAGE].total if PARSE_STAGE in self.histograms else 0.0
+        if throttled or network or parsing:
+            # Summed over concurrent tasks, so only the proportions are meaningful
+            busiest = max((throttled, 'throttled'), (network, 'network-bound'), (parsing, 'parse-bound'))[1]
+            lines.append(f"time spent: {throttled:.1f}s waiting for rate/concurrency limits, {network:.1f}s in requests, "
+                         f"{parsing:.1f}s parsing -> mostly {busiest}")
+        return lines
+
+    def to_dict(self) -> Dict:
+        return {
+            'histograms': {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+            'counters': dict(sorted(self.counters.items()))
+        }
+
+    def to_prometheus(self, prefix: str = 'vakansiya_scraper') -> str:
+        """Prometheus text exposition: one summary per stage and one counter per counter"""
+        lines = []
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_seconds"
+            stats = histogram.to_dict()
+            lines.append(f'# TYPE {metric} summary')
+            for quantile in ('0.5', '0.95', '0.99'):
+                lines.append(f'{metric}{{quantile="{quantile}"}} {histogram.percentile(float(quantile))}')
+            lines.append(f'{metric}_sum {stats["sum"]}')
+            lines.append(f'{metric}_count {stats["count"]}')
+        for name, value in sorted(self.counters.items()):
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, filename: str):
+        """Write metrics as Prometheus text for .prom/.txt files, JSON otherwise"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            if filename.endswith(('.prom', '.txt')):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+def timed(name: str):
+    """Method decorator recording the call duration in self.metrics under name"""
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def wrapper(self, *args, **kwargs):
+                with self.metrics.timer(name):
+                    return await method(self, *args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                with self.metrics.timer(name):
+                    return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
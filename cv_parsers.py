@@ -0,0 +1,670 @@
+"""
+Parser backends for Vakansiya.biz candidate (CV) pages
+Backends only locate sections and read text; the record building is shared so every backend
+produces field-for-field identical output.
+
+Parity check against saved pages (the reference is bs4 over the whole document):
+    python cv_parsers.py pages/ --write-golden     # store reference output as golden .json files
+    python cv_parsers.py pages/                    # compare every available backend to the golden files
+    python cv_parsers.py --cache .http_cache       # compare backends on pages in the HTTP cache
+    python cv_parsers.py pages/ --full-document    # check backends without section slicing
+tests/test_cv_parsers.py runs the check for every installed backend on the pages saved in tests/cv_pages.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# (output field, section div id, extractor) for every CV section
+CV_SECTIONS = (
+    ('summary', 'resume_headline_bx', 'extract_summary'),
+    ('contact_info', 'contacts', 'extract_contact_info'),
+    ('experience', 'employment_bx', 'extract_experience'),
+    ('education', 'education_bx', 'extract_education'),
+    ('awards_certificates', 'awards_bx', 'extract_awards_certificates'),
+    ('skills', 'it_skills_bx', 'extract_skills'),
+    ('languages', 'lang_skills_bx', 'extract_languages')
+)
+
+# Tokens the section pre-scan cares about; comments, scripts and styles are matched whole so
+# markup inside them is never mistaken for a div
+SECTION_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<script\b.*?</script\s*>'
+    r'|<style\b.*?</style\s*>'
+    r'|<div\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>'
+    r'|</div\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+DIV_ID_PATTERN = re.compile(r'\sid\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+
+# Map Azerbaijani contact field names to English
+CONTACT_FIELD_MAPPING = {
+    'Ünvan': 'address',
+    'Yaş': 'age',
+    'E-mail': 'email',
+    'Telefon nömrəsi': 'phone',
+    'Ailə vəziyyəti': 'marital_status',
+    'Linkedin': 'linkedin',
+    'Github': 'github',
+    'Skype': 'skype'
+}
+
+
+def locate_sections(html: str) -> Optional[Dict[str, str]]:
+    """Find the HTML slice of each CV section div in a single pass over the page
+    
+    Returns None when a section's div is not balanced, so callers can fall back to
+    parsing the whole document.
+    """
+    wanted = {section_id for _, section_id, _ in CV_SECTIONS}
+    slices = {}
+    open_sections = {}  # section id -> [start offset, div depth]
+
+    for match in SECTION_TOKEN_PATTERN.finditer(html):
+        token = match.group()
+        if token[1] == '/':
+            for section_id in list(open_sections):
+                open_sections[section_id][1] -= 1
+                if open_sections[section_id][1] == 0:
+                    slices[section_id] = html[open_sections.pop(section_id)[0]:match.end()]
+            if len(slices) == len(wanted):
+                break
+        elif token[:4].lower() == '<div':
+            if token.endswith('/>'):
+                # html.parser treats <div/> as an empty element
+                continue
+            for state in open_sections.values():
+                state[1] += 1
+            id_match = DIV_ID_PATTERN.search(token)
+            if id_match:
+                section_id = next(value for value in id_match.groups() if value is not None)
+                if section_id in wanted and section_id not in slices and section_id not in open_sections:
+                    open_sections[section_id] = [match.start(), 1]
+
+    if open_sections:
+        return None
+    return slices
+
+
+class CVParser(ABC):
+    """Shared extraction logic on top of a small set of backend primitives"""
+    name = None
+
+    def __init__(self, section_scoped: bool = True):
+        self.section_scoped = section_scoped
+
+    def parse(self, html: str, timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Extract all CV sections from a candidate page
+        
+        By default only the seven section slices are parsed, so headers, scripts and
+        navigation are never turned into a tree. When a timings dict is given, seconds
+        spent per step (section scan, document load, each extract_* method) are added to it.
+        """
+        def record(step: str, started: float):
+            if timings is not None:
+                timings[step] = timings.get(step, 0.0) + time.perf_counter() - started
+
+        started = time.perf_counter()
+        slices = locate_sections(html) if self.section_scoped else None
+        record('locate_sections', started)
+        if slices is None:
+            started = time.perf_counter()
+            doc = self.load(html)
+            record('load', started)
+
+        details = {}
+        for field, section_id, extractor in CV_SECTIONS:
+            started = time.perf_counter()
+            if slices is not None:
+                # Section slices are tiny, so their load time is counted with the extractor
+                doc = self.load(slices[section_id]) if section_id in slices else None
+            details[field] = getattr(self, extractor)(doc)
+            record(extractor, started)
+        return details
+
+    def section(self, doc, section_id: str):
+        """Section element from a document or section slice (None when the section is absent)"""
+        if doc is None:
+            return None
+        return self.find_section(doc, section_id)
+
+    # Backend primitives
+
+    @abstractmethod
+    def load(self, html: str):
+        """Parsed document or section slice"""
+
+    @abstractmethod
+    def find_section(self, doc, section_id: str):
+        """First div with the given id, or None"""
+
+    @abstractmethod
+    def first_paragraph_text(self, section) -> Optional[str]:
+        """Stripped text of the first p in a section, or None"""
+
+    @abstractmethod
+    def contact_pairs(self, section) -> List[Tuple[str, str]]:
+        """(label, value) texts of every div.clearfix having both a label and a span.clearfix"""
+
+    @abstractmethod
+    def entries(self, section) -> List[Tuple[Optional[str], List[str]]]:
+        """(h5.font-16 text or None, [p.m-b0 texts]) for every div.mb-3.ex_ed_aw entry"""
+
+    @abstractmethod
+    def table_rows(self, section) -> List[List[str]]:
+        """Cell texts of every tr in the first table's tbody"""
+
+    # Shared extraction
+
+    @staticmethod
+    def split_dates(date_info: str, record: Dict):
+        """Parse a 'start - end' date range into the record"""
+        if ' - ' in date_info:
+            dates = date_info.split(' - ')
+            record['start_date'] = dates[0].strip()
+            if len(dates) > 1:
+                end_date = dates[1].strip()
+                # Remove any span tags
+                end_date = re.sub(r'<[^>]+>', '', end_date)
+                record['end_date'] = end_date
+        else:
+            record['dates'] = date_info
+
+    def extract_summary(self, doc) -> str:
+        """Extract summary/headline information"""
+        summary_section = self.section(doc, 'resume_headline_bx')
+        if summary_section is not None:
+            summary = self.first_paragraph_text(summary_section)
+            if summary is not None:
+                return summary
+        return ""
+
+    def extract_contact_info(self, doc) -> Dict:
+        """Extract detailed contact information"""
+        contact_info = {}
+
+        contacts_section = self.section(doc, 'contacts')
+        if contacts_section is not None:
+            for field_name, field_value in self.contact_pairs(contacts_section):
+                if field_value and field_value != '---':
+                    english_field = CONTACT_FIELD_MAPPING.get(field_name, field_name.lower())
+                    contact_info[english_field] = field_value
+
+        return contact_info
+
+    def extract_experience(self, doc) -> List[Dict]:
+        """Extract detailed work experience"""
+        experiences = []
+
+        employment_section = self.section(doc, 'employment_bx')
+        if employment_section is not None:
+            for title, paragraphs in self.entries(employment_section):
+                experience = {}
+
+                if title is not None:
+                    experience['job_title'] = title
+
+                # Company and location, dates, description
+                if len(paragraphs) >= 1:
+                    company_info = paragraphs[0]
+                    if ', ' in company_info:
+                        parts = company_info.split(', ')
+                        experience['company'] = parts[0]
+                        if len(parts) > 1:
+                            experience['location'] = parts[1]
+                    else:
+                        experience['company'] = company_info
+
+                if len(paragraphs) >= 2:
+                    self.split_dates(paragraphs[1], experience)
+
+                if len(paragraphs) >= 3:
+                    experience['description'] = paragraphs[2]
+
+                experiences.append(experience)
+
+        return experiences
+
+    def extract_education(self, doc) -> List[Dict]:
+        """Extract detailed education information"""
+        education_list = []
+
+        education_section = self.section(doc, 'education_bx')
+        if education_section is not None:
+            for title, paragraphs in self.entries(education_section):
+                education = {}
+
+                if title is not None:
+                    education['program'] = title
+
+                # Institution, location, degree level, dates
+                if len(paragraphs) >= 1:
+                    institution_info = paragraphs[0]
+                    if ', ' in institution_info:
+                        parts = institution_info.split(', ')
+                        education['institution'] = parts[0]
+                        if len(parts) > 1:
+                            education['location'] = parts[1]
+                    else:
+                        education['institution'] = institution_info
+
+                if len(paragraphs) >= 2:
+                    education['degree_level'] = paragraphs[1]
+
+                if len(paragraphs) >= 3:
+                    self.split_dates(paragraphs[2], education)
+
+                education_list.append(education)
+
+        return education_list
+
+    def extract_awards_certificates(self, doc) -> List[Dict]:
+        """Extract awards and certificates"""
+        awards_list = []
+
+        awards_section = self.section(doc, 'awards_bx')
+        if awards_section is not None:
+            for title, paragraphs in self.entries(awards_section):
+                award = {}
+
+                if title is not None:
+                    award['title'] = title
+
+                # Issuer, description, dates
+                if len(paragraphs) >= 1:
+                    award['issuer'] = paragraphs[0]
+
+                if len(paragraphs) >= 2:
+                    award['description'] = paragraphs[1]
+
+                if len(paragraphs) >= 3:
+                    self.split_dates(paragraphs[2], award)
+
+                awards_list.append(award)
+
+        return awards_list
+
+    def extract_skills(self, doc) -> List[Dict]:
+        """Extract skills from the skills table"""
+        skills_list = []
+
+        skills_section = self.section(doc, 'it_skills_bx')
+        if skills_section is not None:
+            for cells in self.table_rows(skills_section):
+                if len(cells) >= 3:
+                    skills_list.append({
+                        'skill_name': cells[0],
+                        'proficiency_level': cells[1],
+                        'experience_years': cells[2]
+                    })
+
+        return skills_list
+
+    def extract_languages(self, doc) -> List[Dict]:
+        """Extract language skills from the languages table"""
+        languages_list = []
+
+        lang_section = self.section(doc, 'lang_skills_bx')
+        if lang_section is not None:
+            for cells in self.table_rows(lang_section):
+                if len(cells) >= 2:
+                    languages_list.append({
+                        'language': cells[0],
+                        'proficiency_level': cells[1]
+                    })
+
+        return languages_list
+
+
+class BeautifulSoupCVParser(CVParser):
+    """Reference backend: BeautifulSoup with the stdlib html.parser"""
+    name = 'bs4'
+
+    def load(self, html: str):
+        return BeautifulSoup(html, 'html.parser')
+
+    def find_section(self, doc, section_id: str):
+        return doc.find('div', {'id': section_id})
+
+    def first_paragraph_text(self, section) -> Optional[str]:
+        summary_p = section.find('p')
+        return summary_p.get_text(strip=True) if summary_p else None
+
+    def contact_pairs(self, section) -> List[Tuple[str, str]]:
+        pairs = []
+        for clearfix_div in section.find_all('div', class_='clearfix'):
+            label = clearfix_div.find('label')
+            span = clearfix_div.find('span', class_='clearfix')
+            if label and span:
+                pairs.append((label.get_text(strip=True), span.get_text(strip=True)))
+        return pairs
+
+    def entries(self, section) -> List[Tuple[Optional[str], List[str]]]:
+        entries = []
+        for entry_div in section.find_all('div', class_='mb-3 ex_ed_aw'):
+            title_h5 = entry_div.find('h5', class_='font-16')
+            title = title_h5.get_text(strip=True) if title_h5 else None
+            paragraphs = [p.get_text(strip=True) for p in entry_div.find_all('p', class_='m-b0')]
+            entries.append((title, paragraphs))
+        return entries
+
+    def table_rows(self, section) -> List[List[str]]:
+        rows = []
+        table = section.find('table')
+        if table:
+            tbody = table.find('tbody')
+            if tbody:
+                for row in tbody.find_all('tr'):
+                    rows.append([cell.get_text(strip=True) for cell in row.find_all('td')])
+        return rows
+
+
+def has_class_xpath(class_name: str) -> str:
+    """XPath predicate matching one class among several, like BeautifulSoup's class_ filter"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+class LxmlCVParser(CVParser):
+    """lxml backend using precompiled XPath expressions"""
+    name = 'lxml'
+
+    def __init__(self, section_scoped: bool = True):
+        super().__init__(section_scoped)
+        if lxml is None:
+            raise ImportError("The lxml parser backend requires the lxml package")
+        self.section_xpath = etree.XPath('(//div[@id=$section_id])[1]')
+        self.first_p_xpath = etree.XPath('(.//p)[1]')
+        self.clearfix_xpath = etree.XPath(f".//div[{has_class_xpath('clearfix')}]")
+        self.label_xpath = etree.XPath('(.//label)[1]')
+        self.span_xpath = etree.XPath(f"(.//span[{has_class_xpath('clearfix')}])[1]")
+        # A class_ value with a space matches the whole (whitespace-normalized) attribute in BeautifulSoup
+        self.entry_xpath = etree.XPath(".//div[normalize-space(@class)='mb-3 ex_ed_aw']")
+        self.title_xpath = etree.XPath(f"(.//h5[{has_class_xpath('font-16')}])[1]")
+        self.paragraphs_xpath = etree.XPath(f".//p[{has_class_xpath('m-b0')}]")
+        self.tbody_xpath = etree.XPath('(.//table)[1]/descendant::tbody[1]')
+        self.rows_xpath = etree.XPath('.//tr')
+        self.cells_xpath = etree.XPath('.//td')
+        self.text_xpath = etree.XPath('.//text()[not(parent::script) and not(parent::style)]')
+
+    def load(self, html: str):
+        return lxml.html.document_fromstring(html)
+
+    def text(self, element) -> str:
+        """Equivalent of BeautifulSoup's get_text(strip=True)"""
+        return ''.join(piece.strip() for piece in self.text_xpath(element))
+
+    def first(self, xpath, element):
+        found = xpath(element)
+        return found[0] if found else None
+
+    def find_section(self, doc, section_id: str):
+        found = self.section_xpath(doc, section_id=section_id)
+        return found[0] if found else None
+
+    def first_paragraph_text(self, section) -> Optional[str]:
+        summary_p = self.first(self.first_p_xpath, section)
+        return self.text(summary_p) if summary_p is not None else None
+
+    def contact_pairs(self, section) -> List[Tuple[str, str]]:
+        pairs = []
+        for clearfix_div in self.clearfix_xpath(section):
+            label = self.first(self.label_xpath, clearfix_div)
+            span = self.first(self.span_xpath, clearfix_div)
+            if label is not None and span is not None:
+                pairs.append((self.text(label), self.text(span)))
+        return pairs
+
+    def entries(self, section) -> List[Tuple[Optional[str], List[str]]]:
+        entries = []
+        for entry_div in self.entry_xpath(section):
+            title_h5 = self.first(self.title_xpath, entry_div)
+            title = self.text(title_h5) if title_h5 is not None else None
+            paragraphs = [self.text(p) for p in self.paragraphs_xpath(entry_div)]
+            entries.append((title, paragraphs))
+        return entries
+
+    def table_rows(self, section) -> List[List[str]]:
+        tbody = self.first(self.tbody_xpath, section)
+        if tbody is None:
+            return []
+        return [[self.text(cell) for cell in self.cells_xpath(row)] for row in self.rows_xpath(tbody)]
+
+
+# Table markup in source order, skipping comments, scripts and styles like SECTION_TOKEN_PATTERN
+TABLE_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<script\b.*?</script\s*>'
+    r'|<style\b.*?</style\s*>'
+    r'|<(/?)(table|tbody)\b[^>]*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def explicit_tbody_flags(html: str) -> List[bool]:
+    """For every table in source order, whether a tbody tag is written anywhere inside it"""
+    flags = []
+    open_tables = []
+    for match in TABLE_TOKEN_PATTERN.finditer(html):
+        closing, tag = match.group(1), match.group(2)
+        if tag is None:
+            continue
+        tag = tag.lower()
+        if tag == 'table' and not closing:
+            open_tables.append(len(flags))
+            flags.append(False)
+        elif tag == 'table':
+            if open_tables:
+                open_tables.pop()
+        elif not closing:
+            for index in open_tables:
+                flags[index] = True
+    return flags
+
+
+class LexborNode(NamedTuple):
+    """A selectolax node plus which of its document's tables had tbody tags in the page source
+
+    explicit_tbody maps a table's mem_id to the flag.
+    """
+    node: object
+    explicit_tbody: Dict[int, bool]
+
+
+class SelectolaxCVParser(CVParser):
+    """selectolax (lexbor) backend using CSS selectors"""
+    name = 'selectolax'
+
+    def __init__(self, section_scoped: bool = True):
+        super().__init__(section_scoped)
+        if LexborHTMLParser is None:
+            raise ImportError("The selectolax parser backend requires the selectolax package")
+
+    def load(self, html: str):
+        # lexbor inserts implicit tbody elements like a browser; html.parser does not, so remember per
+        # table whether the source had one
+        doc = LexborHTMLParser(html)
+        tables = doc.css('table')
+        flags = explicit_tbody_flags(html)
+        if len(flags) != len(tables):
+            # Markup lexbor restructured; fall back to whether the document has any tbody tag
+            flags = [any(flags)] * len(tables)
+        return LexborNode(doc, {table.mem_id: flag for table, flag in zip(tables, flags)})
+
+    def text(self, node) -> str:
+        """Equivalent of BeautifulSoup's get_text(strip=True)"""
+        return ''.join(
+            child.text_content.strip()
+            for child in node.traverse(include_text=True)
+            if child.tag == '-text' and child.parent.tag not in ('script', 'style') and child.text_content
+        )
+
+    def find_section(self, doc, section_id: str):
+        section = doc.node.css_first(f'div[id="{section_id}"]')
+        return LexborNode(section, doc.explicit_tbody) if section is not None else None
+
+    def first_paragraph_text(self, section) -> Optional[str]:
+        summary_p = section.node.css_first('p')
+        return self.text(summary_p) if summary_p is not None else None
+
+    def contact_pairs(self, section) -> List[Tuple[str, str]]:
+        pairs = []
+        for clearfix_div in section.node.css('div.clearfix'):
+            label = clearfix_div.css_first('label')
+            span = clearfix_div.css_first('span.clearfix')
+            if label is not None and span is not None:
+                pairs.append((self.text(label), self.text(span)))
+        return pairs
+
+    def entries(self, section) -> List[Tuple[Optional[str], List[str]]]:
+        entries = []
+        for entry_div in section.node.css('div.mb-3.ex_ed_aw'):
+            # Match the whole class attribute like BeautifulSoup's class_='mb-3 ex_ed_aw'
+            if ' '.join((entry_div.attributes.get('class') or '').split()) != 'mb-3 ex_ed_aw':
+                continue
+            title_h5 = entry_div.css_first('h5.font-16')
+            title = self.text(title_h5) if title_h5 is not None else None
+            paragraphs = [self.text(p) for p in entry_div.css('p.m-b0')]
+            entries.append((title, paragraphs))
+        return entries
+
+    def table_rows(self, section) -> List[List[str]]:
+        table = section.node.css_first('table')
+        if table is None or not section.explicit_tbody.get(table.mem_id):
+            return []
+        tbody = table.css_first('tbody')
+        if tbody is None:
+            return []
+        return [[self.text(cell) for cell in row.css('td')] for row in tbody.css('tr')]
+
+
+PARSER_BACKENDS = {
+    'bs4': BeautifulSoupCVParser,
+    'lxml': LxmlCVParser,
+    'selectolax': SelectolaxCVParser
+}
+
+# One parser instance per process, so compiled selectors are reused across pages
+_parsers = {}
+
+
+def get_parser(backend: str = 'bs4', section_scoped: bool = True) -> CVParser:
+    """Get the (cached) parser instance for a backend name"""
+    key = (backend, section_scoped)
+    if key not in _parsers:
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend '{backend}', expected one of {sorted(PARSER_BACKENDS)}")
+        _parsers[key] = PARSER_BACKENDS[backend](section_scoped)
+    return _parsers[key]
+
+
+def available_backends() -> List[str]:
+    """Backend names whose optional dependencies are installed"""
+    backends = []
+    for name in PARSER_BACKENDS:
+        try:
+            get_parser(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+def load_pages(pages_dir: Optional[str], cache_dir: Optional[str]) -> Dict[str, str]:
+    """Collect saved pages as {name: html} from a directory of .html files and/or an HTTP cache"""
+    pages = {}
+    if pages_dir:
+        for name in sorted(os.listdir(pages_dir)):
+            if name.endswith('.html'):
+                with open(os.path.join(pages_dir, name), encoding='utf-8') as f:
+                    pages[name[:-len('.html')]] = f.read()
+    if cache_dir:
+        from http_cache import HttpCache
+        cache = HttpCache(cache_dir)
+        for name in sorted(os.listdir(cache.entries_dir)):
+            with open(os.path.join(cache.entries_dir, name), encoding='utf-8') as f:
+                entry = json.load(f)
+            if '/cv/' in entry['url'] and cache.get_entry(entry['url']):
+                pages[entry['url']] = cache.load_text(entry)
+    return pages
+
+
+def check_parity(pages: Dict[str, str], backends: List[str], golden_dir: Optional[str] = None,
+                 section_scoped: bool = True) -> int:
+    """Compare backends field by field against golden files (or whole-document bs4); returns the mismatch count"""
+    mismatches = 0
+    timings = {backend: 0.0 for backend in backends}
+
+    for name, html in pages.items():
+        golden_path = os.path.join(golden_dir, f'{name}.json') if golden_dir else None
+        if golden_path and os.path.exists(golden_path):
+            with open(golden_path, encoding='utf-8') as f:
+                expected = json.load(f)
+        else:
+            expected = get_parser('bs4', section_scoped=False).parse(html)
+
+        for backend in backends:
+            start = time.perf_counter()
+            actual = get_parser(backend, section_scoped).parse(html)
+            timings[backend] += time.perf_counter() - start
+
+            for field in expected:
+                if actual.get(field) != expected[field]:
+                    mismatches += 1
+                    print(f"MISMATCH {backend} {name} {field}:\n  expected {expected[field]!r}\n  actual   {actual.get(field)!r}")
+
+    for backend in backends:
+        per_page = timings[backend] / len(pages) * 1000 if pages else 0
+        print(f"{backend:>10}: {per_page:.2f} ms/page")
+    print(f"{len(pages)} pages, {len(backends)} backends, {mismatches} mismatches")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CV parser backends for identical output")
+    parser.add_argument('pages_dir', nargs='?', help="directory of saved .html CV pages (golden .json files live next to them)")
+    parser.add_argument('--cache', help="also check pages stored in this HTTP cache directory")
+    parser.add_argument('--backend', action='append', help="backend to check (default: all installed)")
+    parser.add_argument('--write-golden', action='store_true', help="write bs4 output as golden .json files")
+    parser.add_argument('--full-document', action='store_true', help="check backends parsing the whole page instead of section slices")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.cache)
+    if not pages:
+        print("No pages to check")
+        return 1
+
+    if args.write_golden:
+        if not args.pages_dir:
+            parser.error("--write-golden needs a pages directory")
+        for name, html in pages.items():
+            if os.sep in name or '/' in name:
+                continue
+            with open(os.path.join(args.pages_dir, f'{name}.json'), 'w', encoding='utf-8') as f:
+                json.dump(get_parser('bs4', section_scoped=False).parse(html), f, ensure_ascii=False, indent=2)
+        print(f"Wrote golden output for {len(pages)} pages")
+        return 0
+
+    backends = args.backend or available_backends()
+    return 1 if check_parity(pages, backends, args.pages_dir, not args.full_document) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,531 @@
+"""
+Streaming output writers for scraped Vakansiya.biz candidates
+Records are serialized one at a time so peak memory is a single record, not the whole dataset.
+
+Convert a JSON Lines export to the legacy pretty-printed JSON array or to Parquet tables:
+    python exporters.py to-json full_candidates.jsonl.gz full_candidates.json
+    python exporters.py to-parquet full_candidates.json full_candidates_parquet/
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def dumps_record(record: Dict) -> bytes:
+    """Serialize one record as a compact UTF-8 JSON line (without the newline)"""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_record(line) -> Dict:
+    """Deserialize one JSON line"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def infer_compression(filename: str) -> Optional[str]:
+    """Compression implied by a file extension"""
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if filename.endswith(extension):
+            return compression
+    return None
+
+
+def open_binary(filename: str, mode: str, compression: Optional[str] = None) -> IO[bytes]:
+    """Open a file for binary reading or writing, transparently (de)compressing"""
+    compression = compression or infer_compression(filename)
+    if compression == 'gzip':
+        return gzip.open(filename, mode + 'b')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        if mode == 'r':
+            # The zstd reader cannot iterate lines on its own
+            return io.BufferedReader(zstandard.open(filename, 'rb'))
+        return zstandard.open(filename, mode + 'b')
+    if compression is not None:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {sorted(COMPRESSION_EXTENSIONS)}")
+    return open(filename, mode + 'b')
+
+
+class JsonLinesWriter:
+    """Write candidates to an NDJSON/JSON Lines file one record at a time"""
+
+    def __init__(self, filename: str, compression: Optional[str] = None, append: bool = False):
+        self.filename = filename
+        self.file = open_binary(filename, 'a' if append else 'w', compression)
+        self.count = 0
+
+    def write(self, record: Dict):
+        self.file.write(dumps_record(record) + b'\n')
+        self.count += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_json_lines(filename: str, compression: Optional[str] = None) -> Iterator[Dict]:
+    """Yield records from a JSON Lines file, skipping blank or torn lines"""
+    with open_binary(filename, 'r', compression) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads_record(line)
+            except ValueError:
+                continue
+
+
+def read_candidates(filename: str) -> Iterator[Dict]:
+    """Yield candidates from a legacy JSON array or a (compressed) JSON Lines file"""
+    if filename.endswith('.json'):
+        with open(filename, encoding='utf-8') as f:
+            yield from json.load(f)
+    else:
+        yield from read_json_lines(filename)
+
+
+def write_json_lines(records: Iterable[Dict], filename: str, compression: Optional[str] = None) -> int:
+    """Stream records into a JSON Lines file and return how many were written"""
+    with JsonLinesWriter(filename, compression) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
+
+
+def iter_json_array(records: Iterable[Dict]) -> Iterator[str]:
+    """Yield the legacy json.dumps(records, ensure_ascii=False, indent=2) text one record at a time"""
+    first = True
+    for record in records:
+        # json.dumps escapes newlines inside strings, so every raw newline is indentation
+        body = json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        yield ('[\n  ' if first else ',\n  ') + body
+        first = False
+    yield '[]' if first else '\n]'
+
+
+def json_lines_to_array(source: str, destination: str) -> int:
+    """Convert a JSON Lines file to the legacy pretty-printed JSON array"""
+    count = 0
+
+    def counted(records):
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    with open(destination, 'w', encoding='utf-8') as f:
+        for chunk in iter_json_array(counted(read_json_lines(source))):
+            f.write(chunk)
+    return count
+
+
+# Column order of the flat CSV export
+CSV_COLUMNS = (
+    'id', 'user_id', 'slug', 'first_name', 'last_name', 'age', 'job_title',
+    'industry_title_az', 'industry_title_en', 'city', 'country', 'expected_salary', 'is_premium', 'url',
+    'summary',
+    'address', 'email', 'phone', 'marital_status', 'linkedin', 'github', 'skype',
+    'experience_count', 'education_count', 'awards_count', 'skills_count', 'languages_count',
+    'latest_job_title', 'latest_company', 'latest_job_description',
+    'latest_degree', 'latest_institution',
+    'skills_summary', 'languages_summary',
+    'has_error'
+)
+
+
+def flatten_candidate(candidate: Dict) -> Dict:
+    """One flat CSV row for a scraped candidate"""
+    contact = candidate.get('contact_info', {})
+    flattened = {
+        'id': candidate.get('id'),
+        'user_id': candidate.get('user_id'),
+        'slug': candidate.get('slug'),
+        'first_name': candidate.get('firstname'),
+        'last_name': candidate.get('lastname'),
+        'age': candidate.get('age'),
+        'job_title': candidate.get('title'),
+        'industry_title_az': candidate.get('industry', {}).get('title_az', ''),
+        'industry_title_en': candidate.get('industry', {}).get('title_en', ''),
+        'city': candidate.get('city', {}).get('title_en', ''),
+        'country': candidate.get('country', {}).get('title_en', ''),
+        'expected_salary': candidate.get('expected_salary'),
+        'is_premium': candidate.get('is_premium'),
+        'url': candidate.get('url'),
+        'summary': candidate.get('summary', ''),
+        'address': contact.get('address', ''),
+        'email': contact.get('email', ''),
+        'phone': contact.get('phone', ''),
+        'marital_status': contact.get('marital_status', ''),
+        'linkedin': contact.get('linkedin', ''),
+        'github': contact.get('github', ''),
+        'skype': contact.get('skype', ''),
+        'experience_count': len(candidate.get('experience', [])),
+        'education_count': len(candidate.get('education', [])),
+        'awards_count': len(candidate.get('awards_certificates', [])),
+        'skills_count': len(candidate.get('skills', [])),
+        'languages_count': len(candidate.get('languages', [])),
+        'latest_job_title': '',
+        'latest_company': '',
+        'latest_job_description': '',
+        'latest_degree': '',
+        'latest_institution': '',
+        'skills_summary': '',
+        'languages_summary': '',
+        'has_error': 'error' in candidate or 'scraping_error' in candidate
+    }
+
+    if candidate.get('experience'):
+        latest_exp = candidate['experience'][0]
+        flattened['latest_job_title'] = latest_exp.get('job_title', '')
+        flattened['latest_company'] = latest_exp.get('company', '')
+        flattened['latest_job_description'] = latest_exp.get('description', '')
+
+    if candidate.get('education'):
+        latest_edu = candidate['education'][0]
+        flattened['latest_degree'] = latest_edu.get('program', '')
+        flattened['latest_institution'] = latest_edu.get('institution', '')
+
+    if candidate.get('skills'):
+        flattened['skills_summary'] = ', '.join(skill.get('skill_name', '') for skill in candidate['skills'])
+
+    if candidate.get('languages'):
+        flattened['languages_summary'] = ', '.join(
+            f"{lang.get('language', '')}: {lang.get('proficiency_level', '')}" for lang in candidate['languages']
+        )
+
+    return flattened
+
+
+# Dimension table name -> candidate field holding the place object (its id is in '<field>_id')
+DIMENSIONS = {
+    'countries': 'country',
+    'cities': 'city',
+    'industries': 'industry'
+}
+DIMENSION_COLUMNS = ('id', 'title_az', 'title_en', 'title_ru')
+
+# The flat CSV columns with the per-row place titles replaced by dimension ids
+NORMALIZED_CSV_COLUMNS = (
+    'id', 'user_id', 'slug', 'first_name', 'last_name', 'age', 'job_title',
+    'industry_id', 'city_id', 'country_id', 'expected_salary', 'is_premium', 'url',
+    'summary',
+    'address', 'email', 'phone', 'marital_status', 'linkedin', 'github', 'skype',
+    'experience_count', 'education_count', 'awards_count', 'skills_count', 'languages_count',
+    'latest_job_title', 'latest_company', 'latest_job_description',
+    'latest_degree', 'latest_institution',
+    'skills_summary', 'languages_summary',
+    'has_error'
+)
+
+
+def place_id(candidate: Dict, field: str) -> Optional[int]:
+    """Id of a candidate's country/city/industry, from the listing FK or the nested object"""
+    return to_int(candidate.get(f'{field}_id') or (candidate.get(field) or {}).get('id'))
+
+
+class DimensionTables:
+    """Distinct countries, cities and industries seen while exporting, keyed by id"""
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[int, Dict]] = {name: {} for name in DIMENSIONS}
+
+    def add(self, candidate: Dict):
+        for name, field in DIMENSIONS.items():
+            place = candidate.get(field)
+            key = place_id(candidate, field)
+            if key is not None and place and key not in self.tables[name]:
+                self.tables[name][key] = {column: place.get(column) for column in DIMENSION_COLUMNS[1:]}
+
+    def rows(self, name: str) -> List[Dict]:
+        return [{'id': key, **titles} for key, titles in sorted(self.tables[name].items())]
+
+    def write_csv(self, filename: str) -> Dict[str, int]:
+        """Write one '<base>_<dimension>.csv' file per dimension next to filename, returning row counts"""
+        counts = {}
+        for name in DIMENSIONS:
+            with open(dimension_filename(filename, name), 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=DIMENSION_COLUMNS, lineterminator=os.linesep)
+                writer.writeheader()
+                writer.writerows(self.rows(name))
+            counts[name] = len(self.tables[name])
+        return counts
+
+
+def dimension_filename(filename: str, name: str) -> str:
+    """Dimension table path for a candidates CSV, e.g. full_candidates.csv -> full_candidates_cities.csv"""
+    return f'{os.path.splitext(filename)[0]}_{name}.csv'
+
+
+def normalized_row(candidate: Dict) -> Dict:
+    """Flat CSV row carrying dimension ids instead of place titles"""
+    row = flatten_candidate(candidate)
+    for column in ('industry_title_az', 'industry_title_en', 'city', 'country'):
+        del row[column]
+    for field in DIMENSIONS.values():
+        row[f'{field}_id'] = place_id(candidate, field)
+    return row
+
+
+def write_csv(candidates: Iterable[Dict], filename: str, dimensions: Optional[DimensionTables] = None) -> int:
+    """Stream candidates into a flat CSV one row at a time; tombstoned candidates are skipped
+
+    With dimensions given, rows carry country_id/city_id/industry_id and the places are collected there
+    instead of repeating their titles on every row.
+    """
+    count = 0
+    columns = CSV_COLUMNS if dimensions is None else NORMALIZED_CSV_COLUMNS
+    # Same dialect as the former DataFrame.to_csv output
+    with open(filename, 'w', encoding='utf-8', newline='', buffering=1024 * 1024) as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator=os.linesep)
+        writer.writeheader()
+        for candidate in candidates:
+            if candidate.get('deleted'):
+                continue
+            if dimensions is None:
+                writer.writerow(flatten_candidate(candidate))
+            else:
+                dimensions.add(candidate)
+                writer.writerow(normalized_row(candidate))
+            count += 1
+    return count
+
+
+def write_normalized_csv(candidates: Iterable[Dict], filename: str) -> Dict[str, int]:
+    """Write the candidates CSV with dimension ids plus its countries/cities/industries tables"""
+    dimensions = DimensionTables()
+    counts = {'candidates': write_csv(candidates, filename, dimensions)}
+    counts.update(dimensions.write_csv(filename))
+    return counts
+
+
+def to_int(value) -> Optional[int]:
+    """Coerce an API or page value to int, None when missing or not numeric"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def columnar_schemas() -> Dict[str, 'pa.Schema']:
+    """Typed schemas of the candidates table and its child tables keyed by candidate_id"""
+    category = pa.dictionary(pa.int32(), pa.string())
+    entry_key = [('candidate_id', pa.int64()), ('position', pa.int16())]
+    return {
+        'candidates': pa.schema([
+            ('candidate_id', pa.int64()), ('user_id', pa.int64()), ('slug', pa.string()),
+            ('first_name', pa.string()), ('last_name', pa.string()), ('age', pa.int16()),
+            ('job_title', pa.string()), ('industry_id', pa.int32()), ('city_id', pa.int32()),
+            ('country_id', pa.int32()), ('expected_salary', pa.int32()),
+            ('is_premium', pa.bool_()), ('premium_start', pa.string()), ('premium_end', pa.string()),
+            ('url', pa.string()), ('summary', pa.string()), ('address', pa.string()), ('email', pa.string()),
+            ('phone', pa.string()), ('marital_status', category), ('linkedin', pa.string()),
+            ('github', pa.string()), ('skype', pa.string()), ('experience_count', pa.int16()),
+            ('education_count', pa.int16()), ('awards_count', pa.int16()), ('skills_count', pa.int16()),
+            ('languages_count', pa.int16()), ('has_error', pa.bool_())
+        ]),
+        'experience': pa.schema(entry_key + [
+            ('job_title', pa.string()), ('company', pa.string()), ('location', pa.string()),
+            ('start_date', pa.string()), ('end_date', pa.string()), ('dates', pa.string()),
+            ('description', pa.string())
+        ]),
+        'education': pa.schema(entry_key + [
+            ('program', pa.string()), ('institution', pa.string()), ('location', pa.string()),
+            ('degree_level', category), ('start_date', pa.string()), ('end_date', pa.string()),
+            ('dates', pa.string())
+        ]),
+        'skills': pa.schema(entry_key + [
+            ('skill_name', pa.string()), ('proficiency_level', category), ('experience_years', pa.string())
+        ]),
+        'languages': pa.schema(entry_key + [
+            ('language', category), ('proficiency_level', category)
+        ]),
+        'awards': pa.schema(entry_key + [
+            ('title', pa.string()), ('issuer', pa.string()), ('description', pa.string()),
+            ('start_date', pa.string()), ('end_date', pa.string()), ('dates', pa.string())
+        ])
+    }
+
+
+# Child table name -> candidate record field holding its entries
+CHILD_TABLE_SOURCES = {
+    'experience': 'experience',
+    'education': 'education',
+    'skills': 'skills',
+    'languages': 'languages',
+    'awards': 'awards_certificates'
+}
+
+
+def dimension_schema() -> 'pa.Schema':
+    """Schema shared by the countries, cities and industries tables"""
+    return pa.schema([('id', pa.int32())] + [(column, pa.string()) for column in DIMENSION_COLUMNS[1:]])
+
+
+def candidate_row(candidate: Dict) -> Dict:
+    """Typed candidates table row for one scraped candidate"""
+    contact = candidate.get('contact_info') or {}
+    return {
+        'candidate_id': to_int(candidate.get('id') or candidate.get('candidate_id')),
+        'user_id': to_int(candidate.get('user_id')),
+        'slug': candidate.get('slug'),
+        'first_name': candidate.get('firstname'),
+        'last_name': candidate.get('lastname'),
+        'age': to_int(candidate.get('age')),
+        'job_title': candidate.get('title'),
+        'industry_id': place_id(candidate, 'industry'),
+        'city_id': place_id(candidate, 'city'),
+        'country_id': place_id(candidate, 'country'),
+        'expected_salary': to_int(candidate.get('expected_salary')),
+        'is_premium': bool(to_int(candidate.get('is_premium'))),
+        'premium_start': candidate.get('premium_start'),
+        'premium_end': candidate.get('premium_end'),
+        'url': candidate.get('url'),
+        'summary': candidate.get('summary'),
+        'address': contact.get('address'),
+        'email': contact.get('email'),
+        'phone': contact.get('phone'),
+        'marital_status': contact.get('marital_status'),
+        'linkedin': contact.get('linkedin'),
+        'github': contact.get('github'),
+        'skype': contact.get('skype'),
+        'experience_count': len(candidate.get('experience') or []),
+        'education_count': len(candidate.get('education') or []),
+        'awards_count': len(candidate.get('awards_certificates') or []),
+        'skills_count': len(candidate.get('skills') or []),
+        'languages_count': len(candidate.get('languages') or []),
+        'has_error': 'error' in candidate or 'scraping_error' in candidate
+    }
+
+
+class ParquetExporter:
+    """Write candidates and their child tables as Parquet files, batch by batch
+
+    Countries, cities and industries go to their own tables, written on close.
+    """
+
+    def __init__(self, directory: str, batch_size: int = 1000):
+        if pa is None:
+            raise ImportError("Parquet export requires the pyarrow package")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.batch_size = batch_size
+        self.schemas = columnar_schemas()
+        self.writers = {
+            table: pq.ParquetWriter(os.path.join(directory, f'{table}.parquet'), schema)
+            for table, schema in self.schemas.items()
+        }
+        self.buffers = {table: [] for table in self.schemas}
+        self.counts = {table: 0 for table in self.schemas}
+        self.dimensions = DimensionTables()
+
+    def write(self, candidate: Dict):
+        """Add one candidate; tombstoned candidates are skipped like in the CSV export"""
+        if candidate.get('deleted'):
+            return
+        row = candidate_row(candidate)
+        self.buffers['candidates'].append(row)
+        self.dimensions.add(candidate)
+
+        for table, source in CHILD_TABLE_SOURCES.items():
+            columns = self.schemas[table].names[2:]
+            for position, entry in enumerate(candidate.get(source) or []):
+                child = {'candidate_id': row['candidate_id'], 'position': position}
+                child.update((column, entry.get(column)) for column in columns)
+                self.buffers[table].append(child)
+
+        if len(self.buffers['candidates']) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for table, rows in self.buffers.items():
+            if rows:
+                self.writers[table].write_table(pa.Table.from_pylist(rows, schema=self.schemas[table]))
+                self.counts[table] += len(rows)
+                self.buffers[table] = []
+
+    def close(self) -> Dict[str, int]:
+        """Flush remaining rows, close every file and return row counts per table"""
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+        for name in DIMENSIONS:
+            rows = self.dimensions.rows(name)
+            pq.write_table(pa.Table.from_pylist(rows, schema=dimension_schema()),
+                           os.path.join(self.directory, f'{name}.parquet'))
+            self.counts[name] = len(rows)
+        return self.counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_parquet(candidates: Iterable[Dict], directory: str, batch_size: int = 1000) -> Dict[str, int]:
+    """Stream candidates into a directory of Parquet tables and return row counts per table"""
+    exporter = ParquetExporter(directory, batch_size)
+    for candidate in candidates:
+        exporter.write(candidate)
+    return exporter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert scraped candidate exports")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    to_json = subparsers.add_parser('to-json', help="JSON Lines (optionally .gz/.zst) to a pretty JSON array")
+    to_json.add_argument('source')
+    to_json.add_argument('destination')
+    to_parquet = subparsers.add_parser('to-parquet', help="JSON array or JSON Lines to typed Parquet tables")
+    to_parquet.add_argument('source')
+    to_parquet.add_argument('directory')
+    args = parser.parse_args()
+
+    if args.command == 'to-json':
+        count = json_lines_to_array(args.source, args.destination)
+        print(f"Wrote {count} candidates to {args.destination}")
+    elif args.command == 'to-parquet':
+        counts = export_parquet(read_candidates(args.source), args.directory)
+        print(f"Wrote {', '.join(f'{count} {table}' for table, count in counts.items())} to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
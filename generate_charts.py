@@ -3,11 +3,31 @@ Business Analytics Report Generator for Vakansiya.biz Candidate Database
 Generates business-focused visualizations for executive decision-making
 """
 
+import argparse
+import bisect
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import pandas as pd
+import matplotlib
+# Charts are only written to files; Agg also keeps forked render workers clear of GUI state
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-from collections import Counter
+from exporters import dimension_filename, read_candidates, to_int
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -24,26 +44,206 @@ plt.rcParams['ytick.labelsize'] = 10
 BUSINESS_COLORS = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6A994E',
                    '#BC4B51', '#8B8C89', '#5E60CE', '#F72585', '#4361EE']
 
-def load_data():
-    """Load and prepare the candidate data"""
-    df = pd.read_csv('full_candidates.csv')
-    print(f"Loaded {len(df)} candidate records")
+# Dimension id column -> dimension table written next to the candidates CSV
+DIMENSION_TABLES = {'industry_id': 'industries', 'city_id': 'cities', 'country_id': 'countries'}
+
+# Per-row title columns of exports made before the dimension tables existed
+LEGACY_TITLE_COLUMNS = {'industry_id': 'industry_title_en', 'city_id': 'city', 'country_id': 'country'}
+
+# Dimension id column -> English titles indexed by id, filled by load_data
+DIMENSIONS = {}
+
+# Columns each chart's aggregates are built from; only these are read from the data
+CHART_COLUMNS = {
+    'chart_age_distribution': ['age'],
+    'chart_top_industries': ['industry_id'],
+    'chart_salary_distribution': ['expected_salary'],
+    'chart_premium_breakdown': ['is_premium'],
+    'chart_experience_distribution': ['experience_count'],
+    'chart_education_distribution': ['education_count'],
+    'chart_top_skills': ['skills_summary'],
+    'chart_language_distribution': ['languages_count'],
+    'chart_city_distribution': ['city_id'],
+    'chart_digital_presence': ['linkedin', 'github'],
+    'chart_industry_experience': ['industry_id', 'experience_count'],
+    'chart_marital_status': ['marital_status'],
+    'chart_skills_count': ['skills_count'],
+    'chart_awards_distribution': ['awards_count'],
+}
+
+# Explicit dtypes of the loadable columns, so nothing is inferred or coerced after reading
+COLUMN_DTYPES = {
+    'id': 'Int64',
+    'age': 'Int32',
+    'expected_salary': 'Int32',
+    'is_premium': 'boolean',
+    'industry_id': 'Int32',
+    'city_id': 'Int32',
+    'country_id': 'Int32',
+    'experience_count': 'Int16',
+    'education_count': 'Int16',
+    'awards_count': 'Int16',
+    'skills_count': 'Int16',
+    'languages_count': 'Int16',
+    'marital_status': 'category',
+    'linkedin': 'string',
+    'github': 'string',
+    'skills_summary': 'string',
+    'industry_title_en': 'category',
+    'city': 'category',
+    'country': 'category',
+}
+
+NUMERIC_COLUMNS = ['age', 'expected_salary', 'experience_count', 'education_count', 'awards_count',
+                   'skills_count', 'languages_count']
+
+# Columns that are optional in the store and Parquet tables, where a missing value may be ''
+BLANKABLE_COLUMNS = ['marital_status', 'linkedin', 'github']
+
+def required_columns(charts):
+    """Union of the columns the given chart functions declare, in first-use order"""
+    columns = ['id']
+    for chart in charts:
+        columns.extend(column for column in CHART_COLUMNS[chart.__name__] if column not in columns)
+    return columns
+
+def typed(df):
+    """Apply COLUMN_DTYPES, treating empty strings as missing"""
+    for column in df.columns:
+        if column in BLANKABLE_COLUMNS:
+            df[column] = df[column].mask(df[column] == '')
+        if column in COLUMN_DTYPES:
+            df[column] = df[column].astype(COLUMN_DTYPES[column])
     return df
 
-def clean_data(df):
-    """Clean and prepare data for analysis"""
-    # Convert age to numeric
-    df['age'] = pd.to_numeric(df['age'], errors='coerce')
+def load_dimensions(df, tables):
+    """Keep the English titles of the countries/cities/industries tables for labelling
+
+    Some ids share an English title (e.g. several "Other" industries); those are mapped onto the lowest
+    such id so charts group them together, as they did when grouping by title.
+    """
+    for column, titles in tables.items():
+        canonical = titles.index.to_series().groupby(titles.fillna('')).transform('min')
+        df[column] = df[column].map(canonical).astype('Int32')
+        DIMENSIONS[column] = titles
+    return df
+
+def factorize_legacy_titles(df):
+    """Replace per-row place titles of an older export with integer ids and in-memory dimensions"""
+    for column, title_column in LEGACY_TITLE_COLUMNS.items():
+        if title_column not in df.columns:
+            continue
+        codes, titles = pd.factorize(df.pop(title_column))
+        df[column] = pd.Series(codes, index=df.index, dtype='Int32').mask(codes < 0)
+        DIMENSIONS[column] = pd.Series(titles)
+    return df
 
-    # Convert expected_salary to numeric
-    df['expected_salary'] = pd.to_numeric(df['expected_salary'], errors='coerce')
+def dimension_labels(column, ids):
+    """English titles for dimension ids, joined on demand"""
+    titles = DIMENSIONS[column]
+    return [titles.get(i, f'#{i}') for i in ids]
+
+def load_store(filename, columns):
+    """Load the chart columns and dimensions from the SQLite candidate store"""
+    with sqlite3.connect(filename) as db:
+        stored = {row[1] for row in db.execute('PRAGMA table_info(candidates)')}
+        selected = ['candidate_id AS id'] + [column for column in columns if column in stored]
+        df = typed(pd.read_sql_query(f"SELECT {', '.join(selected)} FROM candidates", db))
+        tables = {
+            column: pd.read_sql_query(f'SELECT id, title_en FROM {name}', db, index_col='id')['title_en']
+            for column, name in DIMENSION_TABLES.items() if column in df.columns
+        }
+    return load_dimensions(df, tables)
+
+def load_parquet(directory, columns):
+    """Load the chart columns from the typed Parquet export's candidates and dimension tables"""
+    schema = pq.read_schema(os.path.join(directory, 'candidates.parquet'))
+    selected = ['candidate_id'] + [column for column in columns if column in schema.names]
+    df = pq.read_table(os.path.join(directory, 'candidates.parquet'), columns=selected).to_pandas()
+    df = typed(df.rename(columns={'candidate_id': 'id'}))
+    tables = {
+        column: pq.read_table(os.path.join(directory, f'{name}.parquet')).to_pandas().set_index('id')['title_en']
+        for column, name in DIMENSION_TABLES.items() if column in df.columns
+    }
+    return load_dimensions(df, tables)
+
+def load_skill_names(source):
+    """Skill names straight from the skills table of the store or Parquet export, indexed by candidate id"""
+    if os.path.isdir(source):
+        skills = pq.read_table(os.path.join(source, 'skills.parquet'), columns=['candidate_id', 'skill_name'])
+        return skills.to_pandas().set_index('candidate_id')['skill_name']
+    with sqlite3.connect(source) as db:
+        skills = pd.read_sql_query('SELECT candidate_id, skill_name FROM skills', db, index_col='candidate_id')
+    return skills['skill_name']
+
+def load_csv(filename, columns):
+    """Load the chart columns of the flat CSV export, joining its dimension tables or factorizing an older
+    export's titles"""
+    header = pd.read_csv(filename, nrows=0).columns
+    legacy = 'industry_id' not in header or not os.path.exists(dimension_filename(filename, 'industries'))
+    if legacy:
+        columns = [LEGACY_TITLE_COLUMNS.get(column, column) for column in columns]
+    columns = [column for column in columns if column in header]
+    df = pd.read_csv(filename, usecols=columns, engine='pyarrow' if pa is not None else 'c',
+                     dtype={column: COLUMN_DTYPES[column] for column in columns if column in COLUMN_DTYPES})
+    if legacy:
+        return factorize_legacy_titles(df)
+    tables = {
+        column: pd.read_csv(dimension_filename(filename, name), index_col='id')['title_en']
+        for column, name in DIMENSION_TABLES.items() if column in df.columns
+    }
+    return load_dimensions(df, tables)
+
+def source_mtime(source):
+    """When a data source was last written (a store's recent writes may still sit in its WAL file)"""
+    if source.endswith('.db'):
+        paths = [source, f'{source}-wal']
+    elif os.path.isdir(source):
+        paths = [os.path.join(source, 'candidates.parquet')]
+    else:
+        paths = [source]
+    return max(os.path.getmtime(path) for path in paths if os.path.exists(path))
+
+def data_source(filename='full_candidates.csv', store='full_candidates.db', parquet='full_candidates_parquet'):
+    """The most recently written of the SQLite store, the Parquet export (with pyarrow) and the CSV; on a tie
+    the store, then the Parquet export, as they load faster"""
+    sources = []
+    if store and os.path.exists(store):
+        sources.append(store)
+    if parquet and pa is not None and os.path.exists(os.path.join(parquet, 'candidates.parquet')):
+        sources.append(parquet)
+    if os.path.exists(filename):
+        sources.append(filename)
+    if not sources:
+        return filename
+    newest = max(sources, key=lambda source: (source_mtime(source), -sources.index(source)))
+    for source in sources:
+        if source != newest:
+            print(f"Skipping {source}: older than {newest}")
+    return newest
+
+def load_data(source='full_candidates.csv', columns=None):
+    """Load the given columns (default: every chart's) from a candidates CSV, Parquet export or store"""
+    columns = columns or required_columns(CHARTS)
+    if source.endswith('.db'):
+        df = load_store(source, columns)
+    elif os.path.isdir(source):
+        df = load_parquet(source, columns)
+    else:
+        df = load_csv(source, columns)
+    print(f"Loaded {len(df)} candidate records ({len(df.columns)} columns) from {source}")
+    return df
 
-    # Convert counts to numeric
-    for col in ['experience_count', 'education_count', 'awards_count', 'skills_count', 'languages_count']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+def clean_data(df):
+    """Clean and prepare data for analysis"""
+    # Typed loads are already numeric; only coerce columns that were read as text
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
 
     # Fill NaN values appropriately
-    df['is_premium'] = df['is_premium'].fillna(0).astype(int)
+    if 'is_premium' in df.columns:
+        df['is_premium'] = df['is_premium'].fillna(0).astype(int)
 
     return df
 
@@ -55,26 +255,519 @@ def save_chart(filename):
     print(f"✓ Generated: {filename}")
 
 # ============================================================================
-# CHART 1: Age Distribution of Candidates
+# REPORT CUBE: every count, bin and group statistic the charts draw
 # ============================================================================
-def chart_age_distribution(df):
-    """Workforce age demographics"""
-    fig, ax = plt.subplots(figsize=(12, 7))
-
-    # Remove outliers and NaN
+# Bump when build_cube output changes so cached cubes are rebuilt
+CUBE_VERSION = 2
+
+AGE_BINS = [18, 22, 25, 30, 35, 40, 45, 50, 65]
+AGE_LABELS = ['18-22', '23-25', '26-30', '31-35', '36-40', '41-45', '46-50', '50+']
+SALARY_BINS = [0, 500, 1000, 1500, 2000, 2500, 3000, 5000]
+SALARY_LABELS = ['<500', '500-1K', '1K-1.5K', '1.5K-2K', '2K-2.5K', '2.5K-3K', '3K+']
+EXPERIENCE_BINS = [0, 1, 2, 3, 5, 10, 20]
+EXPERIENCE_LABELS = ['Entry (0-1)', 'Junior (1-2)', 'Mid (2-3)', 'Senior (3-5)', 'Expert (5-10)', 'Master (10+)']
+SKILLS_COUNT_BINS = [0, 1, 3, 5, 7, 10, 15]
+SKILLS_COUNT_LABELS = ['1 skill', '2-3 skills', '4-5 skills', '6-7 skills', '8-10 skills', '10+ skills']
+TOP_SKILLS = 15
+
+# Normalized (casefolded, single-spaced) skill spellings -> the name they are counted under
+SKILL_SYNONYMS = {
+    'word': 'Word', 'ms word': 'Word', 'microsoft word': 'Word',
+    'excel': 'Excel', 'excell': 'Excel', 'ms excel': 'Excel', 'microsoft excel': 'Excel',
+    'microsoft office': 'Microsoft Office', 'ms office': 'Microsoft Office',
+    'microsoft office proqramları': 'Microsoft Office', 'ofis proqramları': 'Microsoft Office',
+    'powerpoint': 'PowerPoint', 'power point': 'PowerPoint', 'ms powerpoint': 'PowerPoint',
+    'ms power point': 'PowerPoint',
+    'outlook': 'Outlook', 'ms outlook': 'Outlook',
+    'javascript': 'JavaScript', 'js': 'JavaScript',
+    'html': 'HTML', 'html5': 'HTML',
+    'css': 'CSS', 'css3': 'CSS',
+    'react': 'React', 'react.js': 'React', 'react js': 'React', 'reactjs': 'React',
+    'node.js': 'Node.js', 'node js': 'Node.js', 'nodejs': 'Node.js',
+    'next.js': 'Next.js', 'next js': 'Next.js', 'nextjs': 'Next.js',
+    'autocad': 'AutoCAD',
+    'photoshop': 'Adobe Photoshop', 'adobe photoshop': 'Adobe Photoshop',
+    'corel draw': 'CorelDRAW', 'coreldraw': 'CorelDRAW',
+    'power bi': 'Power BI',
+    'surucu': 'Driving', 'sürücü': 'Driving', 'sürücülük': 'Driving',
+}
+
+def binned_counts(values, bins, labels):
+    """[label, count] per bin, empty bins included"""
+    groups = pd.cut(values, bins=bins, labels=labels, include_lowest=True)
+    return [[str(label), int(count)] for label, count in groups.value_counts().sort_index().items()]
+
+def ranked(pairs):
+    """[value, count] pairs by descending count, ties by value, so the order does not depend on row order"""
+    return sorted(([value, int(count)] for value, count in pairs), key=lambda pair: (-pair[1], str(pair[0])))
+
+def value_counts(values, sort_index=False):
+    """[value, count] pairs, by descending count or by value"""
+    counts = values.value_counts()
+    pairs = [[value.item() if hasattr(value, 'item') else value, int(count)] for value, count in counts.items()]
+    return sorted(pairs) if sort_index else ranked(pairs)
+
+def labelled_counts(df, column):
+    """[title, count] pairs of a dimension id column, by descending count"""
+    counts = df[column].value_counts()
+    return ranked(zip(dimension_labels(column, counts.index), counts.values))
+
+def split_skills(values):
+    """One skill per row, indexed like values, splitting comma-separated lists (skills_summary strings, or
+    several skills typed into one field)"""
+    values = values.dropna().astype(str)
+    if pa is None:
+        return values.str.split(',').explode().dropna()
+    lists = pc.split_pattern(pa.array(values.to_numpy(dtype=object), pa.string()), ',')
+    parents = pc.list_parent_indices(lists).to_numpy()
+    return pd.Series(pd.arrays.ArrowExtensionArray(pc.list_flatten(lists)), index=values.index[parents])
+
+def normalize_skills(names):
+    """Casefolded, whitespace-collapsed keys with SKILL_SYNONYMS folded together"""
+    keys = names.str.casefold().str.replace(r'\s+', ' ', regex=True)
+    canonical = keys.map({key: name.casefold() for key, name in SKILL_SYNONYMS.items()})
+    return canonical.fillna(keys)
+
+def top_skills(skills, limit=TOP_SKILLS):
+    """[name, candidates] for the most common skills, counting each candidate once per normalized skill
+
+    Work is done on integer codes; only the distinct spellings are normalized. Skills are labelled with
+    their synonym name, or else their most common spelling.
+    """
+    names = skills.str.strip()
+    codes, spellings = pd.factorize(names)
+    spellings = pd.Series(spellings, dtype=object)
+    codes = codes[codes >= 0]
+    candidates = pd.factorize(names.index)[0][names.notna().to_numpy()]
+
+    key_codes, keys = pd.factorize(normalize_skills(spellings))
+    blank = spellings == ''
+    valid = ~blank.to_numpy()[codes]
+    skill_codes = key_codes[codes[valid]]
+    # One count per (candidate, skill) pair
+    pairs = pd.unique(candidates[valid].astype(np.int64) * len(keys) + skill_codes)
+    counts = np.bincount(pairs % len(keys), minlength=len(keys))
+
+    usage = pd.DataFrame({'key': keys[key_codes], 'name': spellings,
+                          'n': np.bincount(codes, minlength=len(spellings))})[~blank]
+    usage = usage.sort_values(['key', 'n', 'name'], ascending=[True, False, True]).drop_duplicates('key')
+    labels = usage.set_index('key')['name']
+    synonyms = {name.casefold(): name for name in SKILL_SYNONYMS.values()}
+    labels = labels.index.to_series().map(synonyms).fillna(labels)
+    return ranked((labels[key], count) for key, count in zip(keys, counts) if count)[:limit]
+
+def build_cube(df, skill_names=None):
+    """One aggregation pass over the cleaned DataFrame producing the small JSON aggregates all charts render
+
+    skill_names (skill entries indexed by candidate, e.g. the store's skills table) is used instead of
+    df['skills_summary'] when given.
+    """
     age_data = df['age'].dropna()
     age_data = age_data[(age_data >= 18) & (age_data <= 65)]
 
-    # Create age bins
-    bins = [18, 22, 25, 30, 35, 40, 45, 50, 65]
-    labels = ['18-22', '23-25', '26-30', '31-35', '36-40', '41-45', '46-50', '50+']
+    salary_data = df[df['expected_salary'] > 0]['expected_salary']
+    salary_data = salary_data[salary_data <= salary_data.quantile(0.95)]
+    salary = None
+    if len(salary_data) > 0:
+        salary = {
+            'bins': binned_counts(salary_data, SALARY_BINS, SALARY_LABELS),
+            'median': float(salary_data.median()),
+            'mean': float(salary_data.mean())
+        }
+
+    exp_data = df['experience_count'].dropna()
+    edu_data = df['education_count'].dropna()
+    lang_data = df['languages_count'].dropna()
+    lang_data = lang_data[lang_data <= 6]
+    skills_data = df['skills_count'].dropna()
+    awards_data = df['awards_count'].dropna()
+
+    skills = split_skills(df['skills_summary'] if skill_names is None else skill_names)
+
+    has_linkedin = df['linkedin'].notna()
+    has_github = df['github'].notna()
+    both_count = int((has_linkedin & has_github).sum())
+
+    industry_exp = df.groupby('industry_id')['experience_count'].agg(['mean', 'count'])
+
+    return {
+        'total': len(df),
+        'age': {
+            'bins': binned_counts(age_data, AGE_BINS, AGE_LABELS),
+            'median': float(age_data.median())
+        },
+        'industries': labelled_counts(df, 'industry_id'),
+        'salary': salary,
+        'premium': value_counts(df['is_premium']),
+        'experience': binned_counts(exp_data[exp_data <= 20], EXPERIENCE_BINS, EXPERIENCE_LABELS),
+        'education': value_counts(edu_data[edu_data <= 5], sort_index=True),
+        'top_skills': top_skills(skills),
+        'languages': {
+            'counts': value_counts(lang_data, sort_index=True),
+            'mean': float(lang_data.mean())
+        },
+        'cities': labelled_counts(df, 'city_id'),
+        'digital_presence': [
+            int(has_linkedin.sum()) - both_count,
+            int(has_github.sum()) - both_count,
+            both_count,
+            int((~has_linkedin & ~has_github).sum())
+        ],
+        'industry_experience': sorted(
+            [title, float(mean), int(count)]
+            for title, mean, count in zip(dimension_labels('industry_id', industry_exp.index),
+                                          industry_exp['mean'], industry_exp['count'])
+        ),
+        'marital_status': value_counts(df['marital_status']),
+        'skills_count': binned_counts(skills_data[skills_data <= 15], SKILLS_COUNT_BINS, SKILLS_COUNT_LABELS),
+        'awards': {
+            'counts': value_counts(awards_data[awards_data <= 5], sort_index=True),
+            'with_awards': int((df['awards_count'] > 0).sum())
+        }
+    }
+
+def source_hash(source):
+    """Content hash of the data the cube is built from: the store's rows, or the data files"""
+    digest = hashlib.sha256(f'cube-v{CUBE_VERSION}'.encode())
+    if source.endswith('.db'):
+        with sqlite3.connect(source) as db:
+            for row in db.execute('SELECT candidate_id, content_hash FROM candidates ORDER BY candidate_id'):
+                digest.update(repr(row).encode())
+            for name in DIMENSION_TABLES.values():
+                for row in db.execute(f'SELECT id, title_en FROM {name} ORDER BY id'):
+                    digest.update(repr(row).encode())
+        return digest.hexdigest()
+    if os.path.isdir(source):
+        paths = [os.path.join(source, f'{table}.parquet') for table in ['candidates', 'skills', *DIMENSION_TABLES.values()]]
+    else:
+        paths = [source] + [dimension_filename(source, name) for name in DIMENSION_TABLES.values()]
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+def cube_filename(source):
+    return f"{os.path.splitext(source.rstrip('/'))[0]}.cube.json"
+
+def load_cube(path, digest):
+    """The persisted cube, or None when missing or built from different data"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached['cube'] if cached.get('source_hash') == digest else None
+
+def save_cube(path, digest, cube):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'source_hash': digest, 'cube': cube}, f, ensure_ascii=False)
+
+def report_cube(source='full_candidates.csv', rebuild=False):
+    """Load the cube persisted next to the data, rebuilding it when the data changed"""
+    path = cube_filename(source)
+    digest = source_hash(source)
+    cube = None if rebuild else load_cube(path, digest)
+    if cube is not None:
+        print(f"Using cached report cube {path} ({cube['total']} candidates)")
+        return cube
+    df = clean_data(load_data(source, required_columns(CHARTS)))
+    # The store and the Parquet export keep skills as rows rather than a joined summary
+    skill_names = load_skill_names(source) if source.endswith('.db') or os.path.isdir(source) else None
+    cube = build_cube(df, skill_names)
+    save_cube(path, digest, cube)
+    print(f"Saved report cube {path}")
+    return cube
+
+# ============================================================================
+# INCREMENTAL AGGREGATES: exact counters updated from crawl deltas
+# ============================================================================
+# Cube sections each chart draws; a chart is re-rendered when one of them changed
+CHART_SECTIONS = {
+    'chart_age_distribution': ['age'],
+    'chart_top_industries': ['industries', 'total'],
+    'chart_salary_distribution': ['salary'],
+    'chart_premium_breakdown': ['premium', 'total'],
+    'chart_experience_distribution': ['experience'],
+    'chart_education_distribution': ['education'],
+    'chart_top_skills': ['top_skills'],
+    'chart_language_distribution': ['languages'],
+    'chart_city_distribution': ['cities', 'total'],
+    'chart_digital_presence': ['digital_presence', 'total'],
+    'chart_industry_experience': ['industry_experience'],
+    'chart_marital_status': ['marital_status'],
+    'chart_skills_count': ['skills_count'],
+    'chart_awards_distribution': ['awards', 'total'],
+}
+
+# Counters kept by ReportAggregates; numeric ones count candidates per exact value
+VALUE_COUNTERS = ['age', 'salary', 'premium', 'experience', 'education', 'languages', 'skills_count', 'awards']
+LABEL_COUNTERS = ['industry', 'city', 'marital', 'digital', 'skills', 'industry_experience_sum',
+                  'industry_experience_n']
+
+def skill_key(name):
+    """Python twin of normalize_skills for a single skill name"""
+    key = re.sub(r'\s+', ' ', name.casefold())
+    return SKILL_SYNONYMS[key].casefold() if key in SKILL_SYNONYMS else key
+
+def candidate_features(record):
+    """The values of one candidate record that the report aggregates count"""
+    contact = record.get('contact_info') or {}
+    skills = []
+    for skill in record.get('skills') or []:
+        skills.extend(name.strip() for name in (skill.get('skill_name') or '').split(','))
+    return {
+        'age': to_int(record.get('age')),
+        'salary': to_int(record.get('expected_salary')),
+        'premium': to_int(record.get('is_premium')) or 0,
+        'experience': len(record.get('experience') or []),
+        'education': len(record.get('education') or []),
+        'languages': len(record.get('languages') or []),
+        'skills_count': len(record.get('skills') or []),
+        'awards': len(record.get('awards_certificates') or []),
+        'industry': (record.get('industry') or {}).get('title_en') or None,
+        'city': (record.get('city') or {}).get('title_en') or None,
+        'marital': contact.get('marital_status') or None,
+        'linkedin': bool(contact.get('linkedin')),
+        'github': bool(contact.get('github')),
+        'skills': [name for name in skills if name],
+    }
+
+def counts_quantile(counts, q):
+    """Linearly interpolated quantile (as pandas computes it) of the values counted in counts"""
+    values = sorted(value for value, count in counts.items() if count > 0)
+    total = sum(counts[value] for value in values)
+    position = q * (total - 1)
+    lower, fraction = int(position), position - int(position)
+
+    def value_at(rank):
+        seen = 0
+        for value in values:
+            seen += counts[value]
+            if rank < seen:
+                return value
+
+    low = value_at(lower)
+    return float(low) if not fraction else low + (value_at(lower + 1) - low) * fraction
+
+def counts_binned(counts, bins, labels):
+    """binned_counts over counted values: right-closed bins, the first one including its lower edge"""
+    result = [0] * len(labels)
+    for value, count in counts.items():
+        if bins[0] <= value <= bins[-1]:
+            result[max(bisect.bisect_left(bins, value) - 1, 0)] += count
+    return [[label, count] for label, count in zip(labels, result)]
+
+def counts_mean(counts):
+    total = sum(counts.values())
+    return sum(value * count for value, count in counts.items()) / total if total else float('nan')
+
+AGGREGATES_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS features (candidate_id INTEGER PRIMARY KEY, features TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+'''
+
+class ReportAggregates:
+    """Exact counters behind the report cube, updated by adding and removing single candidates
+
+    The counters and the last rendered cube are saved as a few small rows of a SQLite file; each candidate's
+    counted features sit in a keyed table, so a delta only reads and writes the candidates it contains.
+    """
+
+    def __init__(self, filename=':memory:'):
+        self.db = sqlite3.connect(filename)
+        self.db.executescript(AGGREGATES_SCHEMA)
+        self.counters = {name: Counter() for name in VALUE_COUNTERS + LABEL_COUNTERS}
+        self.skill_spellings = {}
+        self.total = 0
+        self.cube = None
+
+        state = dict(self.db.execute('SELECT name, value FROM state'))
+        if state.get('version') != str(CUBE_VERSION):
+            # Missing or written by an older cube format: start over
+            self.db.execute('DELETE FROM features')
+            self.db.execute('DELETE FROM state')
+            return
+        for name, pairs in json.loads(state['counters']).items():
+            self.counters[name] = Counter(dict(pairs))
+        self.skill_spellings = {key: Counter(spellings) for key, spellings in json.loads(state['skill_spellings']).items()}
+        self.total = int(state['total'])
+        self.cube = json.loads(state['cube'])
+
+    def close(self):
+        self.db.close()
+
+    def update(self, features, sign):
+        counters = self.counters
+        self.total += sign
+        for name in VALUE_COUNTERS:
+            if features[name] is not None:
+                counters[name][features[name]] += sign
+        for name in ('industry', 'city', 'marital'):
+            if features[name] is not None:
+                counters[name][features[name]] += sign
+        if features['industry'] is not None:
+            counters['industry_experience_sum'][features['industry']] += sign * features['experience']
+            counters['industry_experience_n'][features['industry']] += sign
+        presence = {(True, False): 'linkedin_only', (False, True): 'github_only', (True, True): 'both',
+                    (False, False): 'neither'}[features['linkedin'], features['github']]
+        counters['digital'][presence] += sign
+        for key in {skill_key(name) for name in features['skills']}:
+            counters['skills'][key] += sign
+        for name in features['skills']:
+            self.skill_spellings.setdefault(skill_key(name), Counter())[name] += sign
+
+    def stored_features(self, candidate_ids):
+        features = {}
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[start:start + 500]
+            features.update((candidate_id, json.loads(value)) for candidate_id, value in self.db.execute(
+                f"SELECT candidate_id, features FROM features WHERE candidate_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ))
+        return features
+
+    def apply(self, records, batch_size=500):
+        """Add new, replace changed and remove tombstoned candidates; returns how many changed"""
+        changed = 0
+        records = iter(records)
+        for batch in iter(lambda: list(islice(records, batch_size)), []):
+            keyed = [(to_int(record.get('id') or record.get('candidate_id')), record) for record in batch]
+            keyed = [(key, record) for key, record in keyed if key is not None]
+            current = self.stored_features(list({key for key, _ in keyed}))
+            written = {}
+            for key, record in keyed:
+                old = current.get(key)
+                new = None if record.get('deleted') else candidate_features(record)
+                if old == new:
+                    continue
+                if old is not None:
+                    self.update(old, -1)
+                if new is not None:
+                    self.update(new, 1)
+                current[key] = written[key] = new
+                changed += 1
+            self.db.executemany('DELETE FROM features WHERE candidate_id = ?',
+                                [(key,) for key, new in written.items() if new is None])
+            self.db.executemany('INSERT OR REPLACE INTO features VALUES (?, ?)',
+                                [(key, json.dumps(new, ensure_ascii=False)) for key, new in written.items() if new is not None])
+        for counter in [*self.counters.values(), *self.skill_spellings.values()]:
+            for value in [value for value, count in counter.items() if not count]:
+                del counter[value]
+        for key in [key for key, spellings in self.skill_spellings.items() if not spellings]:
+            del self.skill_spellings[key]
+        return changed
+
+    def skill_label(self, key):
+        synonyms = {name.casefold(): name for name in SKILL_SYNONYMS.values()}
+        if key in synonyms:
+            return synonyms[key]
+        spellings = self.skill_spellings[key]
+        return min((name for name in spellings if spellings[name] > 0), key=lambda name: (-spellings[name], name))
+
+    def to_cube(self):
+        """The same cube build_cube produces for these candidates"""
+        counters = self.counters
+        ages = Counter({age: count for age, count in counters['age'].items() if 18 <= age <= 65})
+        positive = Counter({salary: count for salary, count in counters['salary'].items() if salary > 0})
+        salary = None
+        if positive:
+            cutoff = counts_quantile(positive, 0.95)
+            kept = Counter({value: count for value, count in positive.items() if value <= cutoff})
+            salary = {
+                'bins': counts_binned(kept, SALARY_BINS, SALARY_LABELS),
+                'median': counts_quantile(kept, 0.5),
+                'mean': float(counts_mean(kept))
+            }
+        languages = Counter({value: count for value, count in counters['languages'].items() if value <= 6})
+
+        def upto(name, limit):
+            return sorted([value, count] for value, count in counters[name].items() if value <= limit)
+
+        return {
+            'total': self.total,
+            'age': {
+                'bins': counts_binned(ages, AGE_BINS, AGE_LABELS),
+                'median': counts_quantile(ages, 0.5) if ages else float('nan')
+            },
+            'industries': ranked(counters['industry'].items()),
+            'salary': salary,
+            'premium': ranked(counters['premium'].items()),
+            'experience': counts_binned(counters['experience'], EXPERIENCE_BINS, EXPERIENCE_LABELS),
+            'education': upto('education', 5),
+            'top_skills': ranked((self.skill_label(key), count) for key, count in counters['skills'].items())[:TOP_SKILLS],
+            'languages': {
+                'counts': sorted([value, count] for value, count in languages.items()),
+                'mean': float(counts_mean(languages))
+            },
+            'cities': ranked(counters['city'].items()),
+            'digital_presence': [counters['digital'][name] for name in ('linkedin_only', 'github_only', 'both', 'neither')],
+            'industry_experience': sorted(
+                [industry, counters['industry_experience_sum'][industry] / count, count]
+                for industry, count in counters['industry_experience_n'].items()
+            ),
+            'marital_status': ranked(counters['marital'].items()),
+            'skills_count': counts_binned(counters['skills_count'], SKILLS_COUNT_BINS, SKILLS_COUNT_LABELS),
+            'awards': {
+                'counts': upto('awards', 5),
+                'with_awards': sum(count for value, count in counters['awards'].items() if value > 0)
+            }
+        }
+
+    def save(self, cube):
+        """Commit the touched features together with the counters and the cube rendered from them"""
+        state = {
+            'version': str(CUBE_VERSION),
+            'counters': json.dumps({name: list(counter.items()) for name, counter in self.counters.items()},
+                                   ensure_ascii=False),
+            'skill_spellings': json.dumps(self.skill_spellings, ensure_ascii=False),
+            'total': str(self.total),
+            'cube': json.dumps(cube, ensure_ascii=False)
+        }
+        self.db.executemany('INSERT OR REPLACE INTO state VALUES (?, ?)', state.items())
+        self.db.commit()
+        self.cube = cube
+
+def changed_charts(old_cube, new_cube):
+    """Charts whose cube sections differ between two cubes (all of them without an old cube)"""
+    if old_cube is None:
+        return list(CHARTS)
+    return [chart for chart in CHARTS
+            if any(json.dumps(old_cube.get(section)) != json.dumps(new_cube[section])
+                   for section in CHART_SECTIONS[chart.__name__])]
+
+def refresh_from_delta(delta, snapshot='full_candidates.json', state='full_candidates.aggregates.db'):
+    """Apply a crawl's records (journal or export) to the saved aggregates and return the new cube and
+    the charts that need re-rendering; the first run starts the aggregates from the snapshot"""
+    aggregates = ReportAggregates(state)
+    try:
+        previous = aggregates.cube
+        if previous is None:
+            aggregates.apply(read_candidates(snapshot))
+            print(f"Started report aggregates from {snapshot} ({aggregates.total} candidates)")
+        changed = aggregates.apply(read_candidates(delta))
+        cube = aggregates.to_cube()
+        charts = changed_charts(previous, cube)
+        aggregates.save(cube)
+    finally:
+        aggregates.close()
+    print(f"Applied {changed} changed candidates from {delta}; {len(charts)} of {len(CHARTS)} charts to re-render")
+    return cube, charts
+
+# ============================================================================
+# CHART 1: Age Distribution of Candidates
+# ============================================================================
+def chart_age_distribution(cube):
+    """Workforce age demographics"""
+    fig, ax = plt.subplots(figsize=(12, 7))
 
-    age_groups = pd.cut(age_data, bins=bins, labels=labels, include_lowest=True)
-    age_counts = age_groups.value_counts().sort_index()
+    age_labels, age_counts = zip(*cube['age']['bins'])
 
-    bars = ax.bar(range(len(age_counts)), age_counts.values, color=BUSINESS_COLORS[0], alpha=0.8)
+    bars = ax.bar(range(len(age_counts)), age_counts, color=BUSINESS_COLORS[0], alpha=0.8)
     ax.set_xticks(range(len(age_counts)))
-    ax.set_xticklabels(age_counts.index, rotation=0)
+    ax.set_xticklabels(age_labels, rotation=0)
     ax.set_xlabel('Age Group')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Candidate Age Distribution: Workforce Demographics Analysis', fontweight='bold', pad=20)
@@ -87,7 +780,7 @@ def chart_age_distribution(df):
                 ha='center', va='bottom', fontweight='bold')
 
     # Add median age annotation
-    median_age = age_data.median()
+    median_age = cube['age']['median']
     ax.text(0.98, 0.95, f'Median Age: {median_age:.0f} years',
             transform=ax.transAxes, ha='right', va='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
@@ -98,15 +791,15 @@ def chart_age_distribution(df):
 # ============================================================================
 # CHART 2: Top Industries by Candidate Count
 # ============================================================================
-def chart_top_industries(df):
+def chart_top_industries(cube):
     """Industry talent concentration"""
     fig, ax = plt.subplots(figsize=(14, 8))
 
-    industry_counts = df['industry_title_en'].value_counts().head(15)
+    industry_labels, industry_counts = zip(*cube['industries'][:15])
 
-    bars = ax.barh(range(len(industry_counts)), industry_counts.values, color=BUSINESS_COLORS[1], alpha=0.8)
+    bars = ax.barh(range(len(industry_counts)), industry_counts, color=BUSINESS_COLORS[1], alpha=0.8)
     ax.set_yticks(range(len(industry_counts)))
-    ax.set_yticklabels(industry_counts.index)
+    ax.set_yticklabels(industry_labels)
     ax.set_xlabel('Number of Candidates')
     ax.set_title('Top 15 Industries by Candidate Availability: Market Talent Concentration',
                  fontweight='bold', pad=20)
@@ -115,7 +808,7 @@ def chart_top_industries(df):
     # Add value labels
     for i, bar in enumerate(bars):
         width = bar.get_width()
-        percentage = (width / len(df)) * 100
+        percentage = (width / cube['total']) * 100
         ax.text(width, bar.get_y() + bar.get_height()/2.,
                 f' {int(width)} ({percentage:.1f}%)',
                 ha='left', va='center', fontweight='bold')
@@ -125,25 +818,19 @@ def chart_top_industries(df):
 # ============================================================================
 # CHART 3: Expected Salary Distribution
 # ============================================================================
-def chart_salary_distribution(df):
+def chart_salary_distribution(cube):
     """Compensation expectations analysis"""
     fig, ax = plt.subplots(figsize=(12, 7))
 
-    # Filter out 0 salaries and outliers
-    salary_data = df[df['expected_salary'] > 0]['expected_salary']
-    salary_data = salary_data[salary_data <= salary_data.quantile(0.95)]
-
-    if len(salary_data) > 0:
-        # Create salary bins
-        bins = [0, 500, 1000, 1500, 2000, 2500, 3000, 5000]
-        labels = ['<500', '500-1K', '1K-1.5K', '1.5K-2K', '2K-2.5K', '2.5K-3K', '3K+']
+    # Salaries above 0 and up to the 95th percentile
+    salary = cube['salary']
 
-        salary_groups = pd.cut(salary_data, bins=bins, labels=labels, include_lowest=True)
-        salary_counts = salary_groups.value_counts().sort_index()
+    if salary:
+        salary_labels, salary_counts = zip(*salary['bins'])
 
-        bars = ax.bar(range(len(salary_counts)), salary_counts.values, color=BUSINESS_COLORS[2], alpha=0.8)
+        bars = ax.bar(range(len(salary_counts)), salary_counts, color=BUSINESS_COLORS[2], alpha=0.8)
         ax.set_xticks(range(len(salary_counts)))
-        ax.set_xticklabels(salary_counts.index, rotation=45, ha='right')
+        ax.set_xticklabels(salary_labels, rotation=45, ha='right')
         ax.set_xlabel('Expected Salary Range (AZN)')
         ax.set_ylabel('Number of Candidates')
         ax.set_title('Expected Salary Distribution: Market Compensation Expectations',
@@ -157,8 +844,8 @@ def chart_salary_distribution(df):
                     ha='center', va='bottom', fontweight='bold')
 
         # Add statistics
-        median_salary = salary_data.median()
-        mean_salary = salary_data.mean()
+        median_salary = salary['median']
+        mean_salary = salary['mean']
         stats_text = f'Median: {median_salary:.0f} AZN\nMean: {mean_salary:.0f} AZN'
         ax.text(0.98, 0.95, stats_text,
                 transform=ax.transAxes, ha='right', va='top',
@@ -170,16 +857,16 @@ def chart_salary_distribution(df):
 # ============================================================================
 # CHART 4: Premium vs Non-Premium Candidates
 # ============================================================================
-def chart_premium_breakdown(df):
+def chart_premium_breakdown(cube):
     """Premium membership conversion opportunity"""
     fig, ax = plt.subplots(figsize=(10, 7))
 
-    premium_counts = df['is_premium'].value_counts()
+    premium_counts = dict(cube['premium'])
 
     # Handle case where only one category exists
     if len(premium_counts) == 1:
         # All candidates are either premium or non-premium
-        if 0 in premium_counts.index:
+        if 0 in premium_counts:
             # All are non-premium
             categories = ['Standard', 'Premium (Target)']
             values = [premium_counts[0], 0]
@@ -205,7 +892,7 @@ def chart_premium_breakdown(df):
                  fontweight='bold', pad=20)
 
     # Add value labels and percentages
-    total = len(df)
+    total = cube['total']
     for i, bar in enumerate(bars):
         height = bar.get_height()
         if height > 0:
@@ -238,23 +925,16 @@ def chart_premium_breakdown(df):
 # ============================================================================
 # CHART 5: Experience Level Distribution
 # ============================================================================
-def chart_experience_distribution(df):
+def chart_experience_distribution(cube):
     """Talent maturity analysis"""
     fig, ax = plt.subplots(figsize=(12, 7))
 
-    exp_data = df['experience_count'].dropna()
-    exp_data = exp_data[exp_data <= 20]  # Remove outliers
-
-    # Create experience bins
-    bins = [0, 1, 2, 3, 5, 10, 20]
-    labels = ['Entry (0-1)', 'Junior (1-2)', 'Mid (2-3)', 'Senior (3-5)', 'Expert (5-10)', 'Master (10+)']
-
-    exp_groups = pd.cut(exp_data, bins=bins, labels=labels, include_lowest=True)
-    exp_counts = exp_groups.value_counts().sort_index()
+    # Experience entries up to 20, outliers removed
+    exp_labels, exp_counts = zip(*cube['experience'])
 
-    bars = ax.bar(range(len(exp_counts)), exp_counts.values, color=BUSINESS_COLORS[5], alpha=0.8)
+    bars = ax.bar(range(len(exp_counts)), exp_counts, color=BUSINESS_COLORS[5], alpha=0.8)
     ax.set_xticks(range(len(exp_counts)))
-    ax.set_xticklabels(exp_counts.index, rotation=45, ha='right')
+    ax.set_xticklabels(exp_labels, rotation=45, ha='right')
     ax.set_xlabel('Experience Level (Years)')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Experience Level Distribution: Talent Maturity Landscape',
@@ -272,18 +952,15 @@ def chart_experience_distribution(df):
 # ============================================================================
 # CHART 6: Education Level Distribution
 # ============================================================================
-def chart_education_distribution(df):
+def chart_education_distribution(cube):
     """Qualification landscape"""
     fig, ax = plt.subplots(figsize=(10, 7))
 
-    edu_data = df['education_count'].dropna()
-    edu_data = edu_data[edu_data <= 5]
-
-    edu_counts = edu_data.value_counts().sort_index()
+    edu_values, edu_counts = zip(*cube['education'])
 
-    bars = ax.bar(range(len(edu_counts)), edu_counts.values, color=BUSINESS_COLORS[6], alpha=0.8)
+    bars = ax.bar(range(len(edu_counts)), edu_counts, color=BUSINESS_COLORS[6], alpha=0.8)
     ax.set_xticks(range(len(edu_counts)))
-    ax.set_xticklabels([f'{int(x)} degree(s)' for x in edu_counts.index])
+    ax.set_xticklabels([f'{int(x)} degree(s)' for x in edu_values])
     ax.set_xlabel('Number of Education Degrees')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Education Level Distribution: Qualification Landscape',
@@ -301,20 +978,11 @@ def chart_education_distribution(df):
 # ============================================================================
 # CHART 7: Top Skills in Demand
 # ============================================================================
-def chart_top_skills(df):
+def chart_top_skills(cube):
     """In-demand skills market analysis"""
     fig, ax = plt.subplots(figsize=(14, 8))
 
-    # Extract all skills from skills_summary
-    all_skills = []
-    for skills in df['skills_summary'].dropna():
-        if isinstance(skills, str):
-            skill_list = [s.strip() for s in skills.split(',')]
-            all_skills.extend(skill_list)
-
-    # Count skills
-    skill_counts = Counter(all_skills)
-    top_skills = dict(skill_counts.most_common(15))
+    top_skills = dict(cube['top_skills'])
 
     if top_skills:
         bars = ax.barh(range(len(top_skills)), list(top_skills.values()),
@@ -338,18 +1006,15 @@ def chart_top_skills(df):
 # ============================================================================
 # CHART 8: Language Proficiency Distribution
 # ============================================================================
-def chart_language_distribution(df):
+def chart_language_distribution(cube):
     """Language capabilities in the workforce"""
     fig, ax = plt.subplots(figsize=(12, 7))
 
-    lang_data = df['languages_count'].dropna()
-    lang_data = lang_data[lang_data <= 6]
-
-    lang_counts = lang_data.value_counts().sort_index()
+    lang_values, lang_counts = zip(*cube['languages']['counts'])
 
-    bars = ax.bar(range(len(lang_counts)), lang_counts.values, color=BUSINESS_COLORS[8], alpha=0.8)
+    bars = ax.bar(range(len(lang_counts)), lang_counts, color=BUSINESS_COLORS[8], alpha=0.8)
     ax.set_xticks(range(len(lang_counts)))
-    ax.set_xticklabels([f'{int(x)} language(s)' for x in lang_counts.index])
+    ax.set_xticklabels([f'{int(x)} language(s)' for x in lang_values])
     ax.set_xlabel('Number of Languages Spoken')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Language Proficiency Distribution: Multilingual Talent Pool',
@@ -363,7 +1028,7 @@ def chart_language_distribution(df):
                 ha='center', va='bottom', fontweight='bold')
 
     # Add average
-    avg_langs = lang_data.mean()
+    avg_langs = cube['languages']['mean']
     ax.text(0.98, 0.95, f'Average: {avg_langs:.1f} languages',
             transform=ax.transAxes, ha='right', va='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.5),
@@ -374,22 +1039,22 @@ def chart_language_distribution(df):
 # ============================================================================
 # CHART 9: Geographic Distribution
 # ============================================================================
-def chart_city_distribution(df):
+def chart_city_distribution(cube):
     """Geographic talent concentration"""
     fig, ax = plt.subplots(figsize=(12, 7))
 
-    city_counts = df['city'].value_counts().head(10)
+    city_labels, city_counts = zip(*cube['cities'][:10])
 
-    bars = ax.bar(range(len(city_counts)), city_counts.values, color=BUSINESS_COLORS[9], alpha=0.8)
+    bars = ax.bar(range(len(city_counts)), city_counts, color=BUSINESS_COLORS[9], alpha=0.8)
     ax.set_xticks(range(len(city_counts)))
-    ax.set_xticklabels(city_counts.index, rotation=45, ha='right')
+    ax.set_xticklabels(city_labels, rotation=45, ha='right')
     ax.set_xlabel('City')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Top 10 Cities by Candidate Location: Geographic Talent Distribution',
                  fontweight='bold', pad=20)
 
     # Add value labels and percentages
-    total = len(df)
+    total = cube['total']
     for bar in bars:
         height = bar.get_height()
         percentage = (height / total) * 100
@@ -402,19 +1067,12 @@ def chart_city_distribution(df):
 # ============================================================================
 # CHART 10: Digital Presence Analysis
 # ============================================================================
-def chart_digital_presence(df):
+def chart_digital_presence(cube):
     """Professional digital footprint"""
     fig, ax = plt.subplots(figsize=(10, 7))
 
-    linkedin_count = df['linkedin'].notna().sum()
-    github_count = df['github'].notna().sum()
-    both_count = ((df['linkedin'].notna()) & (df['github'].notna())).sum()
-    neither_count = ((df['linkedin'].isna()) & (df['github'].isna())).sum()
-
     categories = ['LinkedIn Only', 'GitHub Only', 'Both', 'Neither']
-    linkedin_only = linkedin_count - both_count
-    github_only = github_count - both_count
-    counts = [linkedin_only, github_only, both_count, neither_count]
+    counts = cube['digital_presence']
 
     colors_custom = [BUSINESS_COLORS[0], BUSINESS_COLORS[1], BUSINESS_COLORS[4], BUSINESS_COLORS[3]]
     bars = ax.bar(range(len(categories)), counts, color=colors_custom, alpha=0.8)
@@ -425,7 +1083,7 @@ def chart_digital_presence(df):
                  fontweight='bold', pad=20)
 
     # Add value labels and percentages
-    total = len(df)
+    total = cube['total']
     for i, bar in enumerate(bars):
         height = bar.get_height()
         percentage = (height / total) * 100
@@ -438,12 +1096,12 @@ def chart_digital_presence(df):
 # ============================================================================
 # CHART 11: Industry vs Average Experience
 # ============================================================================
-def chart_industry_experience(df):
+def chart_industry_experience(cube):
     """Sector maturity analysis"""
     fig, ax = plt.subplots(figsize=(14, 9))
 
-    # Calculate average experience per industry
-    industry_exp = df.groupby('industry_title_en')['experience_count'].agg(['mean', 'count'])
+    # Average experience per industry
+    industry_exp = pd.DataFrame(cube['industry_experience'], columns=['industry', 'mean', 'count']).set_index('industry')
     industry_exp = industry_exp[industry_exp['count'] >= 10]  # Only industries with 10+ candidates
     industry_exp = industry_exp.sort_values('mean', ascending=True).tail(12)
 
@@ -469,22 +1127,22 @@ def chart_industry_experience(df):
 # ============================================================================
 # CHART 12: Marital Status Distribution
 # ============================================================================
-def chart_marital_status(df):
+def chart_marital_status(cube):
     """Demographic profile analysis"""
     fig, ax = plt.subplots(figsize=(10, 7))
 
-    marital_counts = df['marital_status'].value_counts()
+    marital_labels, marital_counts = zip(*cube['marital_status'])
 
-    bars = ax.bar(range(len(marital_counts)), marital_counts.values,
+    bars = ax.bar(range(len(marital_counts)), marital_counts,
                  color=BUSINESS_COLORS[6], alpha=0.8)
     ax.set_xticks(range(len(marital_counts)))
-    ax.set_xticklabels(marital_counts.index, rotation=0)
+    ax.set_xticklabels(marital_labels, rotation=0)
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Marital Status Distribution: Candidate Demographic Profile',
                  fontweight='bold', pad=20)
 
     # Add value labels and percentages
-    total = marital_counts.sum()
+    total = sum(marital_counts)
     for bar in bars:
         height = bar.get_height()
         percentage = (height / total) * 100
@@ -497,24 +1155,16 @@ def chart_marital_status(df):
 # ============================================================================
 # CHART 13: Skills Count Distribution
 # ============================================================================
-def chart_skills_count(df):
+def chart_skills_count(cube):
     """Professional capabilities breadth"""
     fig, ax = plt.subplots(figsize=(12, 7))
 
-    skills_data = df['skills_count'].dropna()
-    skills_data = skills_data[skills_data <= 15]
-
-    # Create bins
-    bins = [0, 1, 3, 5, 7, 10, 15]
-    labels = ['1 skill', '2-3 skills', '4-5 skills', '6-7 skills', '8-10 skills', '10+ skills']
-
-    skills_groups = pd.cut(skills_data, bins=bins, labels=labels, include_lowest=True)
-    skills_counts = skills_groups.value_counts().sort_index()
+    skills_labels, skills_counts = zip(*cube['skills_count'])
 
-    bars = ax.bar(range(len(skills_counts)), skills_counts.values,
+    bars = ax.bar(range(len(skills_counts)), skills_counts,
                  color=BUSINESS_COLORS[7], alpha=0.8)
     ax.set_xticks(range(len(skills_counts)))
-    ax.set_xticklabels(skills_counts.index, rotation=45, ha='right')
+    ax.set_xticklabels(skills_labels, rotation=45, ha='right')
     ax.set_xlabel('Number of Skills Listed')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Skills Portfolio Distribution: Professional Capabilities Breadth',
@@ -532,19 +1182,16 @@ def chart_skills_count(df):
 # ============================================================================
 # CHART 14: Awards Distribution
 # ============================================================================
-def chart_awards_distribution(df):
+def chart_awards_distribution(cube):
     """Recognition and achievement analysis"""
     fig, ax = plt.subplots(figsize=(10, 7))
 
-    awards_data = df['awards_count'].dropna()
-    awards_data = awards_data[awards_data <= 5]
-
-    awards_counts = awards_data.value_counts().sort_index()
+    awards_values, awards_counts = zip(*cube['awards']['counts'])
 
-    bars = ax.bar(range(len(awards_counts)), awards_counts.values,
+    bars = ax.bar(range(len(awards_counts)), awards_counts,
                  color=BUSINESS_COLORS[2], alpha=0.8)
     ax.set_xticks(range(len(awards_counts)))
-    ax.set_xticklabels([f'{int(x)} award(s)' for x in awards_counts.index])
+    ax.set_xticklabels([f'{int(x)} award(s)' for x in awards_values])
     ax.set_xlabel('Number of Awards/Certifications')
     ax.set_ylabel('Number of Candidates')
     ax.set_title('Awards & Certifications Distribution: Achievement Recognition Analysis',
@@ -558,8 +1205,8 @@ def chart_awards_distribution(df):
                 ha='center', va='bottom', fontweight='bold')
 
     # Calculate percentage with awards
-    with_awards = (df['awards_count'] > 0).sum()
-    pct_with_awards = (with_awards / len(df)) * 100
+    with_awards = cube['awards']['with_awards']
+    pct_with_awards = (with_awards / cube['total']) * 100
     ax.text(0.98, 0.95, f'{pct_with_awards:.1f}% have awards/certifications',
             transform=ax.transAxes, ha='right', va='top',
             bbox=dict(boxstyle='round', facecolor='gold', alpha=0.3),
@@ -567,42 +1214,87 @@ def chart_awards_distribution(df):
 
     save_chart('14_awards_distribution.png')
 
+# ============================================================================
+# PARALLEL RENDERING
+# ============================================================================
+CHARTS = [
+    chart_age_distribution,
+    chart_top_industries,
+    chart_salary_distribution,
+    chart_premium_breakdown,
+    chart_experience_distribution,
+    chart_education_distribution,
+    chart_top_skills,
+    chart_language_distribution,
+    chart_city_distribution,
+    chart_digital_presence,
+    chart_industry_experience,
+    chart_marital_status,
+    chart_skills_count,
+    chart_awards_distribution,
+]
+
+def render_chart(index, cube):
+    CHARTS[index](cube)
+    return CHARTS[index].__name__
+
+def render_parallel(cube, jobs, charts=None):
+    """Render the given charts (default: all) in a process pool; each task only receives the small report cube"""
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    indexes = [CHARTS.index(chart) for chart in (CHARTS if charts is None else charts)]
+    with ProcessPoolExecutor(jobs, mp_context=context) as pool:
+        for future in [pool.submit(render_chart, index, cube) for index in indexes]:
+            future.result()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the business analytics charts")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="render charts in this many processes (0 = one per CPU, default 1)")
+    parser.add_argument('--rebuild-cube', action='store_true',
+                        help="recompute the report cube even if the cached one matches the data")
+    parser.add_argument('--source',
+                        help="candidates CSV, Parquet export directory or SQLite store to chart "
+                             "(default: the most recent of full_candidates.db/_parquet/.csv)")
+    parser.add_argument('--delta', metavar='FILE',
+                        help="apply a crawl's journal or export to the saved report aggregates and only "
+                             "re-render the charts whose numbers changed")
+    parser.add_argument('--snapshot', default='full_candidates.json',
+                        help="snapshot the aggregates start from when none are saved yet (default: %(default)s)")
+    parser.add_argument('--aggregates', default='full_candidates.aggregates.db',
+                        help="file keeping the report aggregates between --delta runs (default: %(default)s)")
+    return parser.parse_args()
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 def main():
     """Generate all business analytics charts"""
+    args = parse_args()
     print("\n" + "="*70)
     print("VAKANSIYA.BIZ CANDIDATE DATABASE - BUSINESS ANALYTICS REPORT")
     print("="*70 + "\n")
 
-    # Load and prepare data
-    df = load_data()
-    df = clean_data(df)
+    if args.delta:
+        # Counters are updated from the crawl delta; unchanged charts keep their existing images
+        cube, charts = refresh_from_delta(args.delta, args.snapshot, args.aggregates)
+    else:
+        # Aggregates are cached next to the data; restyling charts does not reload it
+        cube, charts = report_cube(args.source or data_source(), rebuild=args.rebuild_cube), CHARTS
 
     print(f"\nGenerating business intelligence visualizations...\n")
 
-    # Generate all charts
-    chart_age_distribution(df)
-    chart_top_industries(df)
-    chart_salary_distribution(df)
-    chart_premium_breakdown(df)
-    chart_experience_distribution(df)
-    chart_education_distribution(df)
-    chart_top_skills(df)
-    chart_language_distribution(df)
-    chart_city_distribution(df)
-    chart_digital_presence(df)
-    chart_industry_experience(df)
-    chart_marital_status(df)
-    chart_skills_count(df)
-    chart_awards_distribution(df)
+    jobs = args.jobs or os.cpu_count()
+    if jobs > 1 and len(charts) > 1:
+        render_parallel(cube, jobs, charts)
+    else:
+        for chart in charts:
+            chart(cube)
 
     print("\n" + "="*70)
     print("✓ ALL CHARTS GENERATED SUCCESSFULLY")
     print("="*70)
     print(f"\nLocation: charts/ directory")
-    print(f"Total charts: 14")
+    print(f"Total charts: {len(charts)} of {len(CHARTS)} rendered")
     print("\nNext step: Review README.md for business insights and findings\n")
 
 if __name__ == "__main__":
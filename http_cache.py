@@ -0,0 +1,190 @@
+"""
+Persistent on-disk HTTP cache for the Vakansiya.biz scraper
+Bodies are stored content-addressed by SHA-256, with per-URL validators for conditional requests
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+
+class CacheMissError(aiohttp.ClientError):
+    """Raised in offline replay mode when a URL was never cached"""
+
+
+class HttpCache:
+    def __init__(self, directory: str = '.http_cache', max_bytes: int = 512 * 1024 * 1024,
+                 max_age_seconds: int = 30 * 24 * 3600, offline: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.offline = offline
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.entries_dir = os.path.join(directory, 'entries')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    def entry_path(self, url: str) -> str:
+        """Path of the metadata file for a URL"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.entries_dir, f'{key}.json')
+
+    def object_path(self, body_hash: str) -> str:
+        """Path of the body file for a content hash"""
+        return os.path.join(self.objects_dir, body_hash[:2], body_hash)
+
+    def write_atomic(self, path: str, data: bytes):
+        """Write a file via rename so readers never see a partial file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get_entry(self, url: str) -> Optional[Dict]:
+        """Get cached metadata for a URL if its body is still on disk"""
+        try:
+            with open(self.entry_path(url), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.object_path(entry['body_hash'])):
+            return None
+        return entry
+
+    def save_entry(self, entry: Dict):
+        """Persist metadata for a URL"""
+        self.write_atomic(self.entry_path(entry['url']), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict:
+        """Build If-None-Match/If-Modified-Since headers from cached validators"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_text(self, entry: Dict) -> str:
+        """Read and decode a cached body"""
+        with open(self.object_path(entry['body_hash']), 'rb') as f:
+            return f.read().decode(entry.get('encoding') or 'utf-8', errors='replace')
+
+    def store(self, url: str, body: bytes, encoding: str, headers) -> Dict:
+        """Store a fresh 200 response and return its metadata"""
+        body_hash = hashlib.sha256(body).hexdigest()
+        entry = self.get_entry(url) or {'url': url}
+        if entry.get('body_hash') != body_hash:
+            # Parsed results belong to the previous body
+            entry.pop('parsed', None)
+            entry.pop('parsed_version', None)
+
+        object_path = self.object_path(body_hash)
+        if not os.path.exists(object_path):
+            self.write_atomic(object_path, body)
+
+        now = time.time()
+        entry.update({
+            'body_hash': body_hash,
+            'size': len(body),
+            'encoding': encoding,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': entry.get('fetched_at') if entry.get('body_hash') == body_hash else now,
+            'checked_at': now
+        })
+        self.save_entry(entry)
+        return entry
+
+    def touch(self, entry: Dict):
+        """Record that a cached body was revalidated (304 Not Modified)"""
+        entry['checked_at'] = time.time()
+        self.save_entry(entry)
+
+    def load_parsed(self, url: str, version: int) -> Optional[Dict]:
+        """Get parsed details for the current cached body of a URL"""
+        entry = self.get_entry(url)
+        if entry and entry.get('parsed_version') == version and 'parsed' in entry:
+            return entry['parsed']
+        return None
+
+    def store_parsed(self, url: str, parsed: Dict, version: int):
+        """Attach parsed details to the current cached body of a URL"""
+        entry = self.get_entry(url)
+        if entry:
+            entry['parsed'] = parsed
+            entry['parsed_version'] = version
+            self.save_entry(entry)
+
+    def evict(self) -> int:
+        """Drop entries older than max_age_seconds, then least recently checked ones over max_bytes
+
+        Files being written (.tmp) or written after eviction started are left alone, and files another
+        process removed first are skipped.
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for name in os.listdir(self.entries_dir):
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.entries_dir, name)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError):
+                remove_file(path)
+                continue
+
+            if now - entry.get('checked_at', 0) > self.max_age_seconds:
+                removed += remove_file(path)
+            else:
+                entries.append((entry.get('checked_at', 0), path, entry))
+
+        # Bodies are shared between URLs, so size is counted per unique object
+        entries.sort()
+        sizes = {entry['body_hash']: entry.get('size', 0) for _, _, entry in entries}
+        references = {}
+        for _, _, entry in entries:
+            references[entry['body_hash']] = references.get(entry['body_hash'], 0) + 1
+        total_size = sum(sizes.values())
+
+        for _, path, entry in entries:
+            if total_size <= self.max_bytes:
+                break
+            removed += remove_file(path)
+            references[entry['body_hash']] -= 1
+            if references[entry['body_hash']] == 0:
+                total_size -= sizes[entry['body_hash']]
+
+        # Remove bodies no entry points to anymore
+        live_hashes = {body_hash for body_hash, count in references.items() if count > 0}
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for body_hash in os.listdir(prefix_dir):
+                if body_hash in live_hashes or body_hash.endswith('.tmp'):
+                    continue
+                path = os.path.join(prefix_dir, body_hash)
+                try:
+                    if os.path.getmtime(path) < now:
+                        remove_file(path)
+                except FileNotFoundError:
+                    continue
+
+        return removed
+
+
+def remove_file(path: str) -> int:
+    """Remove a file, returning 0 if another process already did"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return 0
+    return 1
@@ -0,0 +1,169 @@
+"""
+HTTP session backends for the Vakansiya.biz scraper
+One long-lived session serves both api.vakansiya.biz and vakansiya.biz, with connection reuse counted per run
+"""
+from collections import Counter
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+HTTP_BACKENDS = ('aiohttp', 'httpx')
+
+
+class ConnectionStats:
+    """Counts requests, new connections (TCP+TLS handshakes), reused connections and DNS lookups"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_lookups = 0
+        self.dns_cache_hits = 0
+        self.connections_per_host = Counter()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp tracing hooks feeding these counters"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests += 1
+            context.host = params.url.host
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+            self.connections_per_host[context.host] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        async def on_dns_resolvehost_end(session, context, params):
+            self.dns_lookups += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self.dns_cache_hits += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        return trace_config
+
+    def summary(self) -> str:
+        """One-line report for the end of a crawl"""
+        if not self.requests:
+            return "No HTTP requests were made"
+        hosts = ', '.join(f'{host}={count}' for host, count in sorted(self.connections_per_host.items()))
+        summary = (f"{self.requests} HTTP requests over {self.connections_created} new connections"
+                   f" ({hosts or 'none'}), {self.connections_reused} reused")
+        if self.dns_lookups or self.dns_cache_hits:
+            summary += f", {self.dns_lookups} DNS lookups, {self.dns_cache_hits} DNS cache hits"
+        return summary
+
+
+def create_aiohttp_session(stats: ConnectionStats, limit: int = 50, limit_per_host: int = 10,
+                           ttl_dns_cache: int = 300, keepalive_timeout: float = 60,
+                           timeout: float = 30, trace_configs=()) -> aiohttp.ClientSession:
+    """Session with per-host pools, keep-alive and cached DNS"""
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=ttl_dns_cache,
+        keepalive_timeout=keepalive_timeout
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=[stats.trace_config(), *trace_configs]
+    )
+
+
+class HttpxResponse:
+    """The part of aiohttp.ClientResponse used by the scraper, over an httpx response"""
+
+    def __init__(self, response: 'httpx.Response'):
+        self.response = response
+        self.status = response.status_code
+        self.headers = response.headers
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            request = self.response.request
+            request_info = aiohttp.RequestInfo(URL(str(request.url)), request.method,
+                                               CIMultiDictProxy(CIMultiDict(request.headers.items())))
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status,
+                                              message=self.response.reason_phrase, headers=self.headers)
+
+    async def read(self) -> bytes:
+        return self.response.content
+
+    def get_encoding(self) -> str:
+        return self.response.encoding or 'utf-8'
+
+
+class HttpxSession:
+    """The part of aiohttp.ClientSession used by the scraper, backed by httpx with HTTP/2"""
+
+    def __init__(self, stats: ConnectionStats, limit: int = 50, limit_per_host: int = 10,
+                 keepalive_timeout: float = 60, timeout: float = 30):
+        if httpx is None:
+            raise ImportError("The httpx backend requires the httpx[http2] package")
+        self.stats = stats
+        # HTTP/2 multiplexes requests, so a host needs few connections; httpx pools by total only
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit_per_host,
+                                keepalive_expiry=keepalive_timeout),
+            timeout=timeout
+        )
+
+    @asynccontextmanager
+    async def get(self, url: str, params=None, headers=None):
+        """Send a GET request, mapping httpx errors onto the aiohttp exception hierarchy"""
+        self.stats.requests += 1
+        context = SimpleNamespace(connected=False)
+
+        async def trace(event_name, info):
+            if event_name == 'connection.connect_tcp.complete':
+                context.connected = True
+                self.stats.connections_created += 1
+                self.stats.connections_per_host[URL(url).host] += 1
+
+        try:
+            response = await self.client.get(url, params=params, headers=headers, extensions={'trace': trace})
+        except httpx.TimeoutException as e:
+            raise aiohttp.ServerTimeoutError(str(e) or "Request timed out") from e
+        except httpx.TransportError as e:
+            raise aiohttp.ClientConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientError(str(e)) from e
+
+        if not context.connected:
+            self.stats.connections_reused += 1
+        yield HttpxResponse(response)
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+def create_session(backend: str, stats: ConnectionStats, trace_configs=(), **kwargs):
+    """Create an 'aiohttp' or 'httpx' (HTTP/2) session; aiohttp trace configs only apply to aiohttp"""
+    if backend == 'aiohttp':
+        return create_aiohttp_session(stats, trace_configs=trace_configs, **kwargs)
+    if backend == 'httpx':
+        return HttpxSession(stats, **{k: v for k, v in kwargs.items() if k != 'ttl_dns_cache'})
+    raise ValueError(f"Unknown HTTP backend {backend!r}, expected one of {', '.join(HTTP_BACKENDS)}")
@@ -0,0 +1,112 @@
+"""
+Retry policies and dead-letter queue for the Vakansiya.biz scraper
+Transient failures are retried with exponential backoff and full jitter; what still fails is kept for a later retry run
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from exporters import dumps_record, loads_record
+from http_cache import CacheMissError
+
+
+class RetryPolicy:
+    """How often and how patiently to retry one class of errors"""
+
+    def __init__(self, attempts: int = 4, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff before retry number attempt + 1, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after or 0)
+
+
+# Error class -> policy; errors without a policy (404, other 4xx, cache misses) fail immediately
+DEFAULT_RETRY_POLICIES = {
+    'rate_limited': RetryPolicy(attempts=6, base_delay=2.0, max_delay=120.0),
+    'server_error': RetryPolicy(attempts=4, base_delay=1.0, max_delay=30.0),
+    'timeout': RetryPolicy(attempts=3, base_delay=1.0, max_delay=30.0),
+    'connection': RetryPolicy(attempts=4, base_delay=0.5, max_delay=30.0)
+}
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """Map a request exception to a retry policy name, None when retrying cannot help"""
+    if isinstance(error, CacheMissError):
+        return None
+    if isinstance(error, aiohttp.ClientResponseError):
+        if error.status == 429:
+            return 'rate_limited'
+        if error.status >= 500:
+            return 'server_error'
+        if error.status == 408:
+            return 'timeout'
+        return None
+    if isinstance(error, asyncio.TimeoutError):
+        return 'timeout'
+    if isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return 'connection'
+    return None
+
+
+class DeadLetterQueue:
+    """Append-only JSON Lines file of candidates and listing pages that failed after all retries
+
+    Items that succeed in a retry run get a 'resolved' line instead of being removed, so an interrupted
+    retry run leaves every item it did not get to in the queue.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def add(self, kind: str, key, error: str, candidate: Optional[Dict] = None):
+        """Record a failed 'candidate' (keyed by id) or 'listing_page' (keyed by page number)"""
+        record = {'kind': kind, 'key': key, 'error': error, 'failed_at': time.time()}
+        if candidate is not None:
+            record['candidate'] = candidate
+        with open(self.filename, 'ab') as f:
+            f.write(dumps_record(record) + b'\n')
+
+    def resolve(self, kind: str, key):
+        """Record that an item succeeded on retry, so load() no longer returns it"""
+        with open(self.filename, 'ab') as f:
+            f.write(dumps_record({'kind': kind, 'key': key, 'resolved': True, 'resolved_at': time.time()}) + b'\n')
+
+    def load(self) -> List[Dict]:
+        """Latest failure per item that has not been resolved since, in first-failure order"""
+        entries = {}
+        if os.path.exists(self.filename):
+            with open(self.filename, 'rb') as f:
+                for line in f:
+                    try:
+                        record = loads_record(line)
+                    except ValueError:
+                        continue
+                    if record.get('resolved'):
+                        entries.pop((record['kind'], record['key']), None)
+                    else:
+                        entries[(record['kind'], record['key'])] = record
+        return list(entries.values())
+
+    def compact(self):
+        """Rewrite the file with only the outstanding failures"""
+        entries = self.load()
+        if not entries:
+            self.clear()
+            return
+        tmp_filename = f'{self.filename}.tmp'
+        with open(tmp_filename, 'wb') as f:
+            for entry in entries:
+                f.write(dumps_record(entry) + b'\n')
+        os.replace(tmp_filename, self.filename)
+
+    def clear(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
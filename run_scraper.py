@@ -2,10 +2,36 @@
 """
 Comprehensive script to run the Vakansiya.biz candidate scraper with full data extraction
 """
+import argparse
 import asyncio
 from vakansiya_scraper import ComprehensiveVakansiyaScraper
+from http_cache import HttpCache
+from crawl_journal import CrawlJournal
+from retry_policy import DeadLetterQueue
+from candidate_model import load_candidates
+from exporters import COMPRESSION_EXTENSIONS, DIMENSIONS, dimension_filename
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vakansiya.biz comprehensive candidate scraper")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its journal instead of starting over")
+    parser.add_argument('--jsonl', choices=['plain', 'gzip', 'zstd'],
+                        help="also write a JSON Lines export, optionally compressed")
+    parser.add_argument('--parquet', action='store_true',
+                        help="also write typed Parquet tables (requires pyarrow)")
+    parser.add_argument('--sqlite', action='store_true',
+                        help="also upsert the results into a SQLite store, updating only changed candidates")
+    parser.add_argument('--http2', action='store_true',
+                        help="use the httpx HTTP/2 backend instead of aiohttp (requires httpx[http2])")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="write per-stage timing metrics to FILE (.prom for Prometheus text, JSON otherwise)")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help="only retry candidates and listing pages left in the dead-letter queue of the chosen run")
+    return parser.parse_args()
 
 async def main():
+    args = parse_args()
+    
     print("Starting Vakansiya.biz Comprehensive Candidate Scraper...")
     print("This scraper extracts ALL structured data from each candidate page:")
     print("- Complete contact information")
@@ -16,7 +42,9 @@ async def main():
     print("- Awards and certificates")
     print("- Professional summary")
     
-    scraper = ComprehensiveVakansiyaScraper(max_concurrent=5)
+    # Pages are cached on disk so re-runs only download what changed
+    scraper = ComprehensiveVakansiyaScraper(max_concurrent=5, cache=HttpCache(),
+                                            http_backend='httpx' if args.http2 else 'aiohttp')
     
     print("\nScraping options:")
     print("1. Test run (first 5 candidates) - ~30 seconds")
@@ -24,8 +52,11 @@ async def main():
     print("3. Medium batch (100 candidates) - ~12 minutes")
     print("4. Large batch (300 candidates) - ~40 minutes")
     print("5. Full scrape (~700 candidates) - ~2 hours")
+    print("6. Incremental refresh of full_candidates.json (new/changed CVs only)")
+    print("7. Offline replay of cached pages (no network)")
     
-    choice = input("Select option (1-5): ").strip()
+    choice = input("Select option (1-7): ").strip()
+    previous = None
     
     if choice == "1":
         limit = 5
@@ -51,42 +82,81 @@ async def main():
             print("Cancelled.")
             return
         print("Running full scrape (all candidates)...")
+    elif choice == "6":
+        limit = None
+        filename_base = "full"
+        previous = scraper.load_previous_snapshot(f'{filename_base}_candidates.json')
+        print(f"Running incremental refresh against {len(previous)} previously scraped candidates...")
+    elif choice == "7":
+        limit = None
+        filename_base = "replay"
+        scraper.cache.offline = True
+        print("Re-running extraction over cached pages...")
     else:
         print("Invalid choice.")
         return
     
+    # Every finished candidate is journaled so a crash does not lose the run
+    journal = CrawlJournal(f'{filename_base}_candidates.journal.jsonl')
+    # Candidates that still fail after retries are kept for a later --retry-failed run
+    scraper.dead_letters = DeadLetterQueue(f'{filename_base}_candidates.dead_letters.jsonl')
+    
     start_time = asyncio.get_event_loop().time()
-    candidates = await scraper.scrape_all_candidates(limit=limit)
+    if args.retry_failed:
+        await scraper.retry_dead_letters(journal)
+    else:
+        await scraper.crawl_to_journal(journal, limit=limit, previous=previous, resume=args.resume)
     end_time = asyncio.get_event_loop().time()
     
-    if candidates:
-        # Save in both formats
-        await scraper.save_to_json(candidates, f'{filename_base}_candidates.json')
-        scraper.save_to_csv(candidates, f'{filename_base}_candidates.csv')
+    if next(journal.iter_lines(), None) is not None:
+        # Save in both formats, streaming records from the journal
+        saved_files = [f'{filename_base}_candidates.json', f'{filename_base}_candidates.csv']
+        await scraper.save_to_json(journal.iter_records(), saved_files[0])
+        scraper.save_to_csv(journal.iter_records(), saved_files[1])
+        saved_files.extend(dimension_filename(saved_files[1], name) for name in DIMENSIONS)
+        if args.jsonl:
+            compression = None if args.jsonl == 'plain' else args.jsonl
+            saved_files.append(f'{filename_base}_candidates.jsonl{COMPRESSION_EXTENSIONS.get(compression, "")}')
+            scraper.save_to_jsonl(journal.iter_records(), saved_files[-1], compression)
+        if args.parquet:
+            saved_files.append(f'{filename_base}_candidates_parquet/')
+            scraper.save_to_parquet(journal.iter_records(), saved_files[-1])
+        if args.sqlite:
+            saved_files.append(f'{filename_base}_candidates.db')
+            # Only a crawl that read the whole listing tells which candidates left the site
+            complete = limit is None and not args.retry_failed and not scraper.listing_incomplete
+            scraper.save_to_store(journal.iter_records(), saved_files[-1], full=complete)
+        if args.metrics:
+            # Written after the exports so serialization timings are included
+            scraper.metrics.write(args.metrics)
+            saved_files.append(args.metrics)
+        
+        # Statistics decode the snapshot straight into typed records; tombstones are left out
+        candidates = [c for c in load_candidates(saved_files[0]) if not c.deleted]
         
         elapsed_minutes = (end_time - start_time) / 60
         
         print(f"\n🎉 Scraping completed!")
         print(f"⏱️  Time taken: {elapsed_minutes:.1f} minutes")
         print(f"📊 Total candidates: {len(candidates)}")
-        print(f"📁 Files saved: {filename_base}_candidates.json, {filename_base}_candidates.csv")
+        print(f"📁 Files saved: {', '.join(saved_files)}")
         
         # Show detailed statistics
-        with_summary = sum(1 for c in candidates if c.get('summary'))
-        with_email = sum(1 for c in candidates if c.get('contact_info', {}).get('email'))
-        with_phone = sum(1 for c in candidates if c.get('contact_info', {}).get('phone'))
-        with_address = sum(1 for c in candidates if c.get('contact_info', {}).get('address'))
-        with_experience = sum(1 for c in candidates if c.get('experience'))
-        with_education = sum(1 for c in candidates if c.get('education'))
-        with_skills = sum(1 for c in candidates if c.get('skills'))
-        with_languages = sum(1 for c in candidates if c.get('languages'))
-        with_awards = sum(1 for c in candidates if c.get('awards_certificates'))
+        with_summary = sum(1 for c in candidates if c.summary)
+        with_email = sum(1 for c in candidates if c.contact_info and c.contact_info.get('email'))
+        with_phone = sum(1 for c in candidates if c.contact_info and c.contact_info.get('phone'))
+        with_address = sum(1 for c in candidates if c.contact_info and c.contact_info.get('address'))
+        with_experience = sum(1 for c in candidates if c.experience)
+        with_education = sum(1 for c in candidates if c.education)
+        with_skills = sum(1 for c in candidates if c.skills)
+        with_languages = sum(1 for c in candidates if c.languages)
+        with_awards = sum(1 for c in candidates if c.awards_certificates)
         
-        total_experience = sum(len(c.get('experience', [])) for c in candidates)
-        total_education = sum(len(c.get('education', [])) for c in candidates)
-        total_skills = sum(len(c.get('skills', [])) for c in candidates)
-        total_languages = sum(len(c.get('languages', [])) for c in candidates)
-        total_awards = sum(len(c.get('awards_certificates', [])) for c in candidates)
+        total_experience = sum(len(c.experience or []) for c in candidates)
+        total_education = sum(len(c.education or []) for c in candidates)
+        total_skills = sum(len(c.skills or []) for c in candidates)
+        total_languages = sum(len(c.languages or []) for c in candidates)
+        total_awards = sum(len(c.awards_certificates or []) for c in candidates)
         
         print(f"\n📈 Detailed Statistics:")
         print(f"   👤 Contact Information:")
@@ -111,22 +181,22 @@ async def main():
         if candidates:
             print(f"\n🔍 Sample Detailed Candidate:")
             sample = candidates[0]
-            print(f"   Name: {sample.get('firstname', 'N/A')} {sample.get('lastname', 'N/A')}")
-            print(f"   Age: {sample.get('age', 'N/A')}")
-            print(f"   Job: {sample.get('title', 'N/A')}")
-            if sample.get('summary'):
-                print(f"   Summary: {sample.get('summary')[:100]}...")
-            if sample.get('contact_info'):
-                contact = sample.get('contact_info')
-                print(f"   📧 Email: {contact.get('email', 'N/A')}")
-                print(f"   📞 Phone: {contact.get('phone', 'N/A')}")
-                print(f"   🏠 Address: {contact.get('address', 'N/A')}")
-            if sample.get('experience'):
-                exp = sample.get('experience')[0]
-                print(f"   💼 Latest Job: {exp.get('job_title', 'N/A')} at {exp.get('company', 'N/A')}")
-            if sample.get('education'):
-                edu = sample.get('education')[0]
-                print(f"   🎓 Latest Education: {edu.get('program', 'N/A')} at {edu.get('institution', 'N/A')}")
+            print(f"   Name: {sample.firstname or 'N/A'} {sample.lastname or 'N/A'}")
+            print(f"   Age: {sample.age or 'N/A'}")
+            print(f"   Job: {sample.title or 'N/A'}")
+            if sample.summary:
+                print(f"   Summary: {sample.summary[:100]}...")
+            if sample.contact_info:
+                contact = sample.contact_info
+                print(f"   📧 Email: {contact.get('email') or 'N/A'}")
+                print(f"   📞 Phone: {contact.get('phone') or 'N/A'}")
+                print(f"   🏠 Address: {contact.get('address') or 'N/A'}")
+            if sample.experience:
+                exp = sample.experience[0]
+                print(f"   💼 Latest Job: {exp.job_title or 'N/A'} at {exp.company or 'N/A'}")
+            if sample.education:
+                edu = sample.education[0]
+                print(f"   🎓 Latest Education: {edu.program or 'N/A'} at {edu.institution or 'N/A'}")
         
     else:
         print("❌ No candidates were scraped.")
@@ -0,0 +1,26 @@
+"""
+Golden-file parity of the CV parser backends on the saved pages in tests/cv_pages
+Regenerate the golden files after an intended output change with:
+    python cv_parsers.py tests/cv_pages --write-golden
+"""
+import os
+
+import pytest
+
+from cv_parsers import available_backends, check_parity, load_pages
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'cv_pages')
+
+
+@pytest.mark.parametrize('section_scoped', [True, False], ids=['sections', 'full-document'])
+@pytest.mark.parametrize('backend', available_backends())
+def test_backend_matches_golden_files(backend, section_scoped):
+    pages = load_pages(PAGES_DIR, None)
+    assert check_parity(pages, [backend], PAGES_DIR, section_scoped) == 0
+
+
+def test_every_page_has_a_golden_file():
+    pages = load_pages(PAGES_DIR, None)
+    assert pages
+    for name in pages:
+        assert os.path.exists(os.path.join(PAGES_DIR, f'{name}.json')), name
@@ -2,20 +2,180 @@ import asyncio
 import aiohttp
 import json
 import time
-from bs4 import BeautifulSoup
-import pandas as pd
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from collections import deque
+from contextlib import aclosing
 import logging
 import aiofiles
 # from urllib.parse import urljoin  # Not needed
-import re
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from yarl import URL
+from http_cache import CacheMissError, HttpCache
+from crawl_journal import CrawlJournal
+from http_transport import HTTP_BACKENDS, ConnectionStats, create_session
+from candidate_store import import_candidates
+from candidate_model import UNSET, Candidate, PlaceRegistry, load_candidates, to_record
+from crawl_metrics import CrawlMetrics, timed
+from retry_policy import DEFAULT_RETRY_POLICIES, DeadLetterQueue, RetryPolicy, classify_error
+from cv_parsers import get_parser
+from exporters import export_parquet, iter_json_array, write_csv, write_json_lines, write_normalized_csv
+
+# Bump when the extract_* output changes so cached parse results are invalidated
+PARSER_VERSION = 1
+
+# Listing API fields compared against the previous snapshot to detect changed CVs
+LISTING_CHANGE_FIELDS = (
+    'slug', 'title', 'firstname', 'lastname', 'gender', 'age', 'expected_salary',
+    'is_premium', 'premium_start', 'premium_end', 'show', 'cv_language',
+    'country_id', 'city_id', 'industry_id'
+)
+
+class TokenBucket:
+    """Token bucket rate limiter shared by all concurrent requests"""
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: grows while responses stay fast and healthy, halves on 429/5xx or rising p95 latency"""
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None,
+                 window: int = 20, latency_factor: float = 2.0):
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else initial
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.window = window
+        self.latency_factor = latency_factor
+        self.latencies = []
+        self.baseline_p95 = None
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease_at = 0.0
+        self.decreases = 0
+        self.peak_limit = self.limit
+        self.condition = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot (and any Retry-After pause) and return the request start time"""
+        while True:
+            # Pauses are waited out before taking a slot so no slot sits idle
+            delay = self.paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            async with self.condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return time.monotonic()
+                await self.condition.wait()
+
+    async def release(self, started_at: float, status: Optional[int] = None, retry_after: Optional[float] = None):
+        """Free a slot and adjust the limit from the response status and latency"""
+        now = time.monotonic()
+        async with self.condition:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if status is not None and (status == 429 or status >= 500):
+                self.decrease(started_at, f"HTTP {status}")
+            elif status is not None and status < 400:
+                self.latencies.append(now - started_at)
+                if len(self.latencies) >= self.window:
+                    self.check_latency(started_at)
+                # Only grow when the current limit is actually the bottleneck
+                if saturated and self.limit < self.maximum:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                    self.peak_limit = max(self.peak_limit, self.limit)
+            self.condition.notify_all()
+
+    def check_latency(self, started_at: float):
+        """Back off when the window's p95 latency rises well above the best observed p95"""
+        latencies = sorted(self.latencies)
+        self.latencies = []
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        if self.baseline_p95 is None:
+            self.baseline_p95 = p95
+        elif p95 > self.baseline_p95 * self.latency_factor:
+            self.decrease(started_at, f"p95 latency {p95:.2f}s")
+        else:
+            # Let the baseline follow a slowly changing site
+            self.baseline_p95 = min(p95, self.baseline_p95 * 1.1)
+
+    def decrease(self, started_at: float, reason: str):
+        # Responses to requests sent before the last decrease already reflect the old limit
+        if started_at < self.last_decrease_at:
+            return
+        self.last_decrease_at = time.monotonic()
+        self.limit = max(float(self.minimum), self.limit / 2)
+        self.latencies = []
+        self.decreases += 1
+        logging.getLogger(__name__).warning(f"Backing off to {int(self.limit)} concurrent requests ({reason})")
+
+    def summary(self) -> str:
+        return (f"concurrency limit {int(self.limit)} (peak {int(self.peak_limit)}, range {self.minimum}-{self.maximum}), "
+                f"{self.decreases} backoffs")
 
 class ComprehensiveVakansiyaScraper:
-    def __init__(self, max_concurrent=10):
+    def __init__(self, max_concurrent=10, requests_per_second=5.0, cache: Optional[HttpCache] = None,
+                 max_concurrency_limit: Optional[int] = None,
+                 parse_executor: str = 'process', parse_workers: Optional[int] = None, parser_backend: str = 'bs4',
+                 http_backend: str = 'aiohttp', retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+                 dead_letters: Optional[DeadLetterQueue] = None):
         self.base_api_url = "https://api.vakansiya.biz/api/v1/resumes/search"
         self.base_page_url = "https://vakansiya.biz/az/cv"
+        # max_concurrent is the starting point; the limiter adapts it up to max_concurrency_limit
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            max_concurrent,
+            maximum=max_concurrency_limit if max_concurrency_limit is not None else max_concurrent * 4
+        )
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self.cache = cache
+        self.parse_executor = parse_executor
+        self.parse_workers = parse_workers
+        self.parse_pool = None
+        self.parser_backend = parser_backend
+        get_parser(parser_backend)  # fail fast on an unknown backend or missing dependency
+        if http_backend not in HTTP_BACKENDS:
+            raise ValueError(f"Unknown HTTP backend {http_backend!r}, expected one of {', '.join(HTTP_BACKENDS)}")
+        self.http_backend = http_backend
+        self.connection_stats = ConnectionStats()
+        self.metrics = CrawlMetrics()
+        self.retry_policies = DEFAULT_RETRY_POLICIES if retry_policies is None else retry_policies
+        self.dead_letters = dead_letters
+        self.listing_incomplete = False
         self.setup_logging()
         
     def setup_logging(self):
@@ -65,6 +225,94 @@ class ComprehensiveVakansiyaScraper:
             'x-requested-with': 'XMLHttpRequest'
         }
 
+    def create_session(self) -> aiohttp.ClientSession:
+        """Create the long-lived HTTP session shared by listing and detail requests"""
+        self.connection_stats = ConnectionStats()
+        return create_session(
+            self.http_backend,
+            self.connection_stats,
+            trace_configs=[self.metrics.trace_config()],
+            limit=self.concurrency.maximum * 2,
+            limit_per_host=self.concurrency.maximum
+        )
+
+    def create_parse_pool(self) -> Optional[Executor]:
+        """Create the executor used for HTML parsing ('process', 'thread' or 'inline')"""
+        if self.parse_executor == 'process':
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        if self.parse_executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self.parse_workers)
+        return None
+
+    async def fetch_text(self, session: aiohttp.ClientSession, url: str, headers: Dict, params: Optional[Dict] = None) -> str:
+        """Fetch a URL as text, retrying transient failures with backoff according to their error class"""
+        attempt = 0
+        while True:
+            try:
+                return await self.fetch_text_once(session, url, headers, params)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error_class = classify_error(e)
+                policy = self.retry_policies.get(error_class) if error_class else None
+                if policy is None or attempt + 1 >= policy.attempts:
+                    raise
+                retry_after = None
+                if isinstance(e, aiohttp.ClientResponseError) and e.headers:
+                    retry_after = parse_retry_after(e.headers.get('Retry-After'))
+                delay = policy.delay(attempt, retry_after)
+                attempt += 1
+                self.metrics.increment('retries')
+                self.logger.warning(f"Retrying {url} in {delay:.1f}s after {error_class} "
+                                    f"(attempt {attempt + 1}/{policy.attempts}): {str(e) or type(e).__name__}")
+                await asyncio.sleep(delay)
+
+    async def fetch_text_once(self, session: aiohttp.ClientSession, url: str, headers: Dict, params: Optional[Dict] = None) -> str:
+        """Fetch a URL as text, revalidating against and updating the HTTP cache"""
+        cache_url = str(URL(url).with_query(params)) if params else url
+        entry = self.cache.get_entry(cache_url) if self.cache else None
+        
+        if self.cache and self.cache.offline:
+            if entry is None:
+                raise CacheMissError(f"{cache_url} is not in the HTTP cache")
+            return self.cache.load_text(entry)
+        
+        # Politeness is enforced by the shared rate limiter, not by idling inside a concurrency slot
+        waiting_since = time.monotonic()
+        await self.rate_limiter.acquire()
+        self.metrics.observe('rate_limit_wait', time.monotonic() - waiting_since)
+        
+        waiting_since = time.monotonic()
+        started_at = await self.concurrency.acquire()
+        self.metrics.observe('concurrency_wait', started_at - waiting_since)
+        status = retry_after = None
+        try:
+            request_headers = {**headers, **(self.cache.conditional_headers(entry) if self.cache else {})}
+            async with session.get(url, params=params, headers=request_headers) as response:
+                status = response.status
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if status >= 400:
+                    self.metrics.increment('http_errors')
+                if response.status == 304 and entry:
+                    self.metrics.increment('not_modified')
+                    self.metrics.observe('request', time.monotonic() - started_at)
+                    self.cache.touch(entry)
+                    return self.cache.load_text(entry)
+                
+                response.raise_for_status()
+                with self.metrics.timer('body_download'):
+                    body = await response.read()
+                encoding = response.get_encoding()
+                self.metrics.increment('bytes_downloaded', len(body))
+                self.metrics.observe('request', time.monotonic() - started_at)
+        except asyncio.TimeoutError:
+            status = 504  # a timeout counts as overload, like a gateway timeout
+            raise
+        finally:
+            await self.concurrency.release(started_at, status, retry_after)
+        
+        if self.cache:
+            self.cache.store(cache_url, body, encoding, response.headers)
+        return body.decode(encoding, errors='replace')
+
     async def get_candidates_from_api(self, session: aiohttp.ClientSession, page: int = 1) -> Optional[Dict]:
         """Fetch candidates from the general listing API"""
         params = {
@@ -78,58 +326,60 @@ class ComprehensiveVakansiyaScraper:
             'title': ''
         }
         
-        async with self.semaphore:
-            try:
-                headers = self.get_api_headers()
-                async with session.get(self.base_api_url, params=params, headers=headers) as response:
-                    response.raise_for_status()
-                    return await response.json()
-            except aiohttp.ClientError as e:
-                self.logger.error(f"Error fetching API page {page}: {e}")
-                return None
-
-    async def get_all_candidates_basic(self) -> List[Dict]:
+        try:
+            text = await self.fetch_text(session, self.base_api_url, self.get_api_headers(), params)
+            return json.loads(text)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.logger.error(f"Error fetching API page {page}: {str(e) or type(e).__name__}")
+            if self.dead_letters:
+                self.dead_letters.add('listing_page', page, str(e) or type(e).__name__)
+            return None
+
+    async def iter_candidates_basic(self, session: aiohttp.ClientSession, prefetch_pages: int = 3) -> AsyncIterator[Dict]:
+        """Yield candidates from the listing API in page order as each page arrives"""
+        self.listing_incomplete = False
+        
+        # Get first page to determine total pages
+        first_page = await self.get_candidates_from_api(session, 1)
+        if not first_page:
+            self.listing_incomplete = True
+            return
+        
+        for candidate in first_page.get('data', []):
+            yield candidate
+        last_page = first_page.get('last_page', 1)
+        
+        # Keep a few pages in flight ahead of the consumer
+        pending = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= last_page:
+                while next_page <= last_page and len(pending) < prefetch_pages:
+                    pending.append((next_page, asyncio.ensure_future(self.get_candidates_from_api(session, next_page))))
+                    next_page += 1
+                
+                page, task = pending.popleft()
+                result = await task
+                if result and result.get('data'):
+                    for candidate in result['data']:
+                        yield candidate
+                else:
+                    self.listing_incomplete = True
+                    self.logger.error(f"API page {page} returned no candidates")
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def get_all_candidates_basic(self, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
         """Get all candidates from the API with basic info"""
-        connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
-        timeout = aiohttp.ClientTimeout(total=30)
-        
-        async with aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout
-        ) as session:
-            all_candidates = []
-            
-            # Get first page to determine total pages
-            first_page = await self.get_candidates_from_api(session, 1)
-            if not first_page:
-                return []
-                
-            all_candidates.extend(first_page['data'])
-            last_page = first_page.get('last_page', 1)
-            
-            if last_page > 1:
-                # Process remaining pages in smaller batches to avoid rate limiting
-                batch_size = 5
-                for start_page in range(2, last_page + 1, batch_size):
-                    end_page = min(start_page + batch_size, last_page + 1)
-                    tasks = []
-                    
-                    for page in range(start_page, end_page):
-                        task = self.get_candidates_from_api(session, page)
-                        tasks.append(task)
-                    
-                    self.logger.info(f"Fetching API pages {start_page}-{end_page-1}...")
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    for result in results:
-                        if isinstance(result, dict) and result.get('data'):
-                            all_candidates.extend(result['data'])
-                        elif isinstance(result, Exception):
-                            self.logger.error(f"API request failed: {result}")
-                    
-                    # Delay between batches
-                    await asyncio.sleep(1)
-                        
+        if session is None:
+            async with self.create_session() as session:
+                return await self.get_all_candidates_basic(session)
+        
+        all_candidates = []
+        async for candidate in self.iter_candidates_basic(session):
+            all_candidates.append(candidate)
+        
         self.logger.info(f"Total candidates fetched from API: {len(all_candidates)}")
         return all_candidates
 
@@ -137,418 +387,342 @@ class ComprehensiveVakansiyaScraper:
         """Scrape comprehensive detailed information from individual candidate page"""
         url = f"{self.base_page_url}/{candidate_id}/{slug}"
         
-        async with self.semaphore:
-            try:
-                await asyncio.sleep(0.2)  # Small delay to be respectful
-                
-                headers = self.get_headers()
-                async with session.get(url, headers=headers) as response:
-                    response.raise_for_status()
-                    html = await response.text()
-                    
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                details = {
-                    'candidate_id': candidate_id,
-                    'slug': slug,
-                    'url': url,
-                    'summary': self.extract_summary(soup),
-                    'contact_info': self.extract_contact_info(soup),
-                    'experience': self.extract_experience(soup),
-                    'education': self.extract_education(soup),
-                    'awards_certificates': self.extract_awards_certificates(soup),
-                    'skills': self.extract_skills(soup),
-                    'languages': self.extract_languages(soup)
-                }
-                
-                return details
-                
-            except aiohttp.ClientError as e:
-                self.logger.error(f"Error scraping candidate {candidate_id}: {e}")
-                return {'candidate_id': candidate_id, 'slug': slug, 'error': str(e), 'url': url}
-            except Exception as e:
-                self.logger.error(f"Unexpected error scraping candidate {candidate_id}: {e}")
-                return {'candidate_id': candidate_id, 'slug': slug, 'error': str(e), 'url': url}
-
-    def extract_summary(self, soup: BeautifulSoup) -> str:
-        """Extract summary/headline information"""
-        summary_section = soup.find('div', {'id': 'resume_headline_bx'})
-        if summary_section:
-            summary_p = summary_section.find('p')
-            if summary_p:
-                return summary_p.get_text(strip=True)
-        return ""
-
-    def extract_contact_info(self, soup: BeautifulSoup) -> Dict:
-        """Extract detailed contact information"""
-        contact_info = {}
-        
-        contacts_section = soup.find('div', {'id': 'contacts'})
-        if contacts_section:
-            # Extract all labeled contact fields
-            for clearfix_div in contacts_section.find_all('div', class_='clearfix'):
-                label = clearfix_div.find('label')
-                span = clearfix_div.find('span', class_='clearfix')
-                
-                if label and span:
-                    field_name = label.get_text(strip=True)
-                    field_value = span.get_text(strip=True)
-                    
-                    if field_value and field_value != '---':
-                        # Map Azerbaijani field names to English
-                        field_mapping = {
-                            'Ünvan': 'address',
-                            'Yaş': 'age', 
-                            'E-mail': 'email',
-                            'Telefon nömrəsi': 'phone',
-                            'Ailə vəziyyəti': 'marital_status',
-                            'Linkedin': 'linkedin',
-                            'Github': 'github',
-                            'Skype': 'skype'
-                        }
-                        
-                        english_field = field_mapping.get(field_name, field_name.lower())
-                        contact_info[english_field] = field_value
-        
-        return contact_info
-
-    def extract_experience(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract detailed work experience"""
-        experiences = []
-        
-        employment_section = soup.find('div', {'id': 'employment_bx'})
-        if employment_section:
-            # Find all experience entries
-            for exp_div in employment_section.find_all('div', class_='mb-3 ex_ed_aw'):
-                experience = {}
-                
-                # Job title
-                title_h5 = exp_div.find('h5', class_='font-16')
-                if title_h5:
-                    experience['job_title'] = title_h5.get_text(strip=True)
-                
-                # Company and location, dates, description
-                paragraphs = exp_div.find_all('p', class_='m-b0')
-                
-                if len(paragraphs) >= 1:
-                    company_info = paragraphs[0].get_text(strip=True)
-                    if ', ' in company_info:
-                        parts = company_info.split(', ')
-                        experience['company'] = parts[0]
-                        if len(parts) > 1:
-                            experience['location'] = parts[1]
-                    else:
-                        experience['company'] = company_info
-                
-                if len(paragraphs) >= 2:
-                    date_info = paragraphs[1].get_text(strip=True)
-                    # Parse date range
-                    if ' - ' in date_info:
-                        dates = date_info.split(' - ')
-                        experience['start_date'] = dates[0].strip()
-                        if len(dates) > 1:
-                            end_date = dates[1].strip()
-                            # Remove any span tags
-                            end_date = re.sub(r'<[^>]+>', '', end_date)
-                            experience['end_date'] = end_date
-                    else:
-                        experience['dates'] = date_info
-                
-                if len(paragraphs) >= 3:
-                    experience['description'] = paragraphs[2].get_text(strip=True)
-                
-                experiences.append(experience)
-        
-        return experiences
+        try:
+            html = await self.fetch_text(session, url, self.get_headers())
+            
+            # An unchanged page (304 or same body hash) reuses its previous parse
+            if self.cache and not self.cache.offline:
+                cached_details = self.cache.load_parsed(url, PARSER_VERSION)
+                if cached_details is not None:
+                    return cached_details
+            
+            # Parsing is CPU bound, so it runs in the parse pool while the loop keeps fetching
+            with self.metrics.timer('parse'):
+                if self.parse_pool:
+                    loop = asyncio.get_running_loop()
+                    sections, timings = await loop.run_in_executor(self.parse_pool, parse_candidate_html_timed,
+                                                                   html, self.parser_backend)
+                else:
+                    sections, timings = parse_candidate_html_timed(html, self.parser_backend)
+            for step, seconds in timings.items():
+                self.metrics.observe(f'parse.{step}', seconds)
+            
+            details = {
+                'candidate_id': candidate_id,
+                'slug': slug,
+                'url': url,
+                **sections
+            }
+            
+            if self.cache and not self.cache.offline:
+                self.cache.store_parsed(url, details, PARSER_VERSION)
+            
+            return details
+            
+        except aiohttp.ClientError as e:
+            self.logger.error(f"Error scraping candidate {candidate_id}: {e}")
+            return {'candidate_id': candidate_id, 'slug': slug, 'error': str(e), 'url': url}
+        except Exception as e:
+            self.logger.error(f"Unexpected error scraping candidate {candidate_id}: {e}")
+            return {'candidate_id': candidate_id, 'slug': slug, 'error': str(e), 'url': url}
 
-    def extract_education(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract detailed education information"""
-        education_list = []
+    def load_previous_snapshot(self, filename: str) -> Dict[int, Candidate]:
+        """Load a previous JSON snapshot into typed records indexed by candidate id"""
+        if not os.path.exists(filename):
+            self.logger.warning(f"No previous snapshot at {filename}, every candidate will be scraped")
+            return {}
         
-        education_section = soup.find('div', {'id': 'education_bx'})
-        if education_section:
-            # Find all education entries
-            for edu_div in education_section.find_all('div', class_='mb-3 ex_ed_aw'):
-                education = {}
-                
-                # Degree/Program title
-                title_h5 = edu_div.find('h5', class_='font-16')
-                if title_h5:
-                    education['program'] = title_h5.get_text(strip=True)
-                
-                # Institution, location, degree level, dates
-                paragraphs = edu_div.find_all('p', class_='m-b0')
-                
-                if len(paragraphs) >= 1:
-                    institution_info = paragraphs[0].get_text(strip=True)
-                    if ', ' in institution_info:
-                        parts = institution_info.split(', ')
-                        education['institution'] = parts[0]
-                        if len(parts) > 1:
-                            education['location'] = parts[1]
-                    else:
-                        education['institution'] = institution_info
-                
-                if len(paragraphs) >= 2:
-                    degree_level = paragraphs[1].get_text(strip=True)
-                    education['degree_level'] = degree_level
-                
-                if len(paragraphs) >= 3:
-                    date_info = paragraphs[2].get_text(strip=True)
-                    # Parse date range
-                    if ' - ' in date_info:
-                        dates = date_info.split(' - ')
-                        education['start_date'] = dates[0].strip()
-                        if len(dates) > 1:
-                            end_date = dates[1].strip()
-                            end_date = re.sub(r'<[^>]+>', '', end_date)
-                            education['end_date'] = end_date
-                    else:
-                        education['dates'] = date_info
-                
-                education_list.append(education)
+        places = PlaceRegistry()
+        previous = {}
+        for candidate in load_candidates(filename, places):
+            if candidate.key:
+                previous[candidate.key] = candidate
         
-        return education_list
+        self.logger.info(f"Loaded {len(previous)} candidates from previous snapshot {filename} ({len(places)} distinct places)")
+        return previous
 
-    def extract_awards_certificates(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract awards and certificates"""
-        awards_list = []
+    def is_candidate_unchanged(self, candidate: Dict, previous_candidate: Optional[Candidate]) -> bool:
+        """Check whether a listing entry matches a successfully scraped previous record"""
+        if previous_candidate is None or previous_candidate.failed or previous_candidate.deleted:
+            return False
+        for field in LISTING_CHANGE_FIELDS:
+            previous_value = getattr(previous_candidate, field)
+            if candidate.get(field) != (None if previous_value is UNSET else previous_value):
+                return False
+        return True
+
+    async def crawl(self, on_result: Callable[[int, Dict], None], limit: Optional[int] = None,
+                    previous: Optional[Dict[int, Candidate]] = None, skip_ids: Optional[Set[int]] = None,
+                    source: Optional[Callable[[aiohttp.ClientSession], AsyncIterator[Dict]]] = None,
+                    evict_cache: bool = True) -> int:
+        """Scrape candidates and hand each finished record to on_result(index, record)
         
-        awards_section = soup.find('div', {'id': 'awards_bx'})
-        if awards_section:
-            for award_div in awards_section.find_all('div', class_='mb-3 ex_ed_aw'):
-                award = {}
-                
-                # Award title
-                title_h5 = award_div.find('h5', class_='font-16')
-                if title_h5:
-                    award['title'] = title_h5.get_text(strip=True)
-                
-                # Issuer, description, dates
-                paragraphs = award_div.find_all('p', class_='m-b0')
-                
-                if len(paragraphs) >= 1:
-                    award['issuer'] = paragraphs[0].get_text(strip=True)
-                
-                if len(paragraphs) >= 2:
-                    award['description'] = paragraphs[1].get_text(strip=True)
-                
-                if len(paragraphs) >= 3:
-                    date_info = paragraphs[2].get_text(strip=True)
-                    if ' - ' in date_info:
-                        dates = date_info.split(' - ')
-                        award['start_date'] = dates[0].strip()
-                        if len(dates) > 1:
-                            end_date = dates[1].strip()
-                            end_date = re.sub(r'<[^>]+>', '', end_date)
-                            award['end_date'] = end_date
-                    else:
-                        award['dates'] = date_info
-                
-                awards_list.append(award)
-        
-        return awards_list
-
-    def extract_skills(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract skills from the skills table"""
-        skills_list = []
-        
-        skills_section = soup.find('div', {'id': 'it_skills_bx'})
-        if skills_section:
-            table = skills_section.find('table')
-            if table:
-                tbody = table.find('tbody')
-                if tbody:
-                    for row in tbody.find_all('tr'):
-                        cells = row.find_all('td')
-                        if len(cells) >= 3:
-                            skill = {
-                                'skill_name': cells[0].get_text(strip=True),
-                                'proficiency_level': cells[1].get_text(strip=True),
-                                'experience_years': cells[2].get_text(strip=True)
-                            }
-                            skills_list.append(skill)
-        
-        return skills_list
-
-    def extract_languages(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract language skills from the languages table"""
-        languages_list = []
-        
-        lang_section = soup.find('div', {'id': 'lang_skills_bx'})
-        if lang_section:
-            table = lang_section.find('table')
-            if table:
-                tbody = table.find('tbody')
-                if tbody:
-                    for row in tbody.find_all('tr'):
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            language = {
-                                'language': cells[0].get_text(strip=True),
-                                'proficiency_level': cells[1].get_text(strip=True)
-                            }
-                            languages_list.append(language)
-        
-        return languages_list
-
-    async def scrape_all_candidates(self, limit: Optional[int] = None) -> List[Dict]:
-        """Scrape all candidates with comprehensive detailed information"""
+        Records are passed on as soon as they complete instead of being collected,
+        so memory stays flat regardless of crawl size. When a previous snapshot
+        (see load_previous_snapshot) is given, only new or changed candidates are
+        scraped; the rest reuse their previous details and candidates missing from
+        the listing are emitted as tombstones. Candidates in skip_ids (e.g. already
+        journaled by an interrupted run) are not scraped again. A source, called
+        with the session, replaces the listing API as the candidate feed; no
+        tombstones are emitted then since the listing was not read. Crawls
+        sharing a cache with other processes pass evict_cache=False and leave
+        eviction to whoever runs them.
+        """
         start_time = time.time()
+        skip_ids = skip_ids or set()
+        seen_ids = set()
+        emitted = 0
+        reused_count = 0
+        queued = 0
+        limit_reached = False
         
-        # Get basic info from API
-        basic_candidates = await self.get_all_candidates_basic()
+        self.logger.info("Starting comprehensive scraping...")
         
-        if limit:
-            basic_candidates = basic_candidates[:limit]
-            
-        self.logger.info(f"Starting comprehensive scraping for {len(basic_candidates)} candidates...")
+        def emit(index: int, record: Dict):
+            nonlocal emitted
+            on_result(index, record)
+            emitted += 1
+            if emitted % 25 == 0:
+                self.logger.info(f"Scraped {emitted} candidates")
         
-        connector = aiohttp.TCPConnector(limit=30, limit_per_host=10)
-        timeout = aiohttp.ClientTimeout(total=30)
+        self.parse_pool = self.create_parse_pool()
         
-        async with aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout
-        ) as session:
-            
-            # Create tasks for detailed scraping
-            tasks = []
-            for candidate in basic_candidates:
-                if candidate.get('id') and candidate.get('slug'):
-                    task = self.scrape_candidate_details(
-                        session,
-                        candidate.get('id'), 
-                        candidate.get('slug')
-                    )
-                    tasks.append((candidate, task))
+        async with self.create_session() as session:
+            # Listing pages feed the queue while workers are already scraping detail pages
+            # One worker per slot the concurrency limiter may grow to
+            workers = self.concurrency.maximum
+            queue = asyncio.Queue(maxsize=workers * 4)
             
-            # Execute scraping tasks in small batches
-            detailed_candidates = []
-            batch_size = 5  # Smaller batch size for detailed scraping
+            async def producer():
+                nonlocal reused_count, limit_reached, queued
+                try:
+                    candidates = source(session) if source else self.iter_candidates_basic(session)
+                    async with aclosing(candidates):
+                        async for candidate in candidates:
+                            if limit and queued >= limit:
+                                limit_reached = True
+                                break
+                            if not (candidate.get('id') and candidate.get('slug')):
+                                continue
+                            
+                            seen_ids.add(candidate['id'])
+                            if candidate['id'] in skip_ids:
+                                pass
+                            elif previous and self.is_candidate_unchanged(candidate, previous.get(candidate['id'])):
+                                # Unchanged CV: refresh listing fields, keep previously scraped details
+                                emit(queued, {**to_record(previous[candidate['id']]), **candidate})
+                                reused_count += 1
+                            else:
+                                await queue.put((queued, candidate))
+                            queued += 1
+                finally:
+                    self.logger.info(f"Queued {queued} candidates from the listing API")
+                    for _ in range(workers):
+                        await queue.put(None)
             
-            for i in range(0, len(tasks), batch_size):
-                batch = tasks[i:i + batch_size]
-                self.logger.info(f"Processing comprehensive batch {i//batch_size + 1}/{(len(tasks) + batch_size - 1)//batch_size}")
-                
-                batch_results = await asyncio.gather(*[task for _, task in batch], return_exceptions=True)
-                
-                for j, result in enumerate(batch_results):
-                    candidate = batch[j][0]
-                    if isinstance(result, dict):
+            async def worker():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    index, candidate = item
+                    try:
+                        result = await self.scrape_candidate_details(
+                            session,
+                            candidate.get('id'),
+                            candidate.get('slug')
+                        )
+                        if 'error' in result and self.dead_letters:
+                            self.dead_letters.add('candidate', candidate['id'], result['error'], candidate)
                         # Combine basic and detailed info
-                        combined = {**candidate, **result}
-                        detailed_candidates.append(combined)
-                    else:
-                        self.logger.error(f"Failed to scrape candidate {candidate.get('slug')}: {result}")
-                        detailed_candidates.append({**candidate, 'scraping_error': str(result)})
-                
-                # Longer delay between batches for comprehensive scraping
-                await asyncio.sleep(2)
+                        emit(index, {**candidate, **result})
+                    except Exception as e:
+                        self.logger.error(f"Failed to scrape candidate {candidate.get('slug')}: {e}")
+                        if self.dead_letters:
+                            self.dead_letters.add('candidate', candidate['id'], str(e), candidate)
+                        emit(index, {**candidate, 'scraping_error': str(e)})
+            
+            try:
+                await asyncio.gather(producer(), *[worker() for _ in range(workers)])
+            finally:
+                if self.parse_pool:
+                    self.parse_pool.shutdown()
+                    self.parse_pool = None
+        
+        self.logger.info(f"Connections: {self.connection_stats.summary()}")
+        self.logger.info(f"Adaptive concurrency: {self.concurrency.summary()}")
+        self.log_metrics()
+        
+        if skip_ids:
+            self.logger.info(f"Skipped {len(seen_ids & skip_ids)} candidates completed by a previous run")
+        
+        if previous:
+            deleted_count = 0
+            if limit_reached or self.listing_incomplete or source:
+                self.logger.warning("Listing was not fully read, skipping tombstones for missing candidates")
+            else:
+                deleted_at = datetime.now(timezone.utc).isoformat()
+                for candidate_id, previous_candidate in previous.items():
+                    if candidate_id in seen_ids or candidate_id in skip_ids:
+                        continue
+                    record = to_record(previous_candidate)
+                    if not previous_candidate.deleted:
+                        record.update(deleted=True, deleted_at=deleted_at)
+                    emit(queued, record)
+                    queued += 1
+                    deleted_count += 1
+            
+            scraped_count = len(seen_ids - skip_ids) - reused_count
+            self.logger.info(f"Incremental crawl: {scraped_count} scraped, {reused_count} unchanged, {deleted_count} deleted")
                 
+        if evict_cache and self.cache and not self.cache.offline:
+            evicted = self.cache.evict()
+            if evicted:
+                self.logger.info(f"Evicted {evicted} entries from the HTTP cache")
+        
         elapsed_time = time.time() - start_time
         self.logger.info(f"Comprehensive scraping completed in {elapsed_time:.2f} seconds")
-        self.logger.info(f"Average time per candidate: {elapsed_time/len(detailed_candidates):.2f} seconds")
+        if emitted:
+            self.logger.info(f"Average time per candidate: {elapsed_time/emitted:.2f} seconds")
         
-        return detailed_candidates
+        return emitted
 
-    async def save_to_json(self, candidates: List[Dict], filename: str = 'candidates.json'):
-        """Save candidates data to JSON file"""
-        async with aiofiles.open(filename, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(candidates, ensure_ascii=False, indent=2))
-        self.logger.info(f"Saved {len(candidates)} comprehensive candidates to {filename}")
+    def log_metrics(self):
+        """Log the per-stage timing summary collected so far"""
+        self.logger.info("Crawl metrics:")
+        for line in self.metrics.summary_lines():
+            self.logger.info(f"  {line}")
 
-    def save_to_csv(self, candidates: List[Dict], filename: str = 'candidates.csv'):
-        """Save candidates data to CSV file with flattened structure"""
-        if not candidates:
-            self.logger.warning("No candidates data to save")
-            return
-            
-        flattened_candidates = []
+    async def scrape_all_candidates(self, limit: Optional[int] = None, previous: Optional[Dict[int, Candidate]] = None) -> List[Dict]:
+        """Scrape all candidates with comprehensive detailed information"""
+        results = {}
+        
+        def collect(index: int, record: Dict):
+            results[index] = record
+        
+        await self.crawl(collect, limit=limit, previous=previous)
+        return [results[index] for index in sorted(results)]
+
+    async def crawl_to_journal(self, journal: CrawlJournal, limit: Optional[int] = None,
+                               previous: Optional[Dict[int, Candidate]] = None, resume: bool = False) -> int:
+        """Scrape candidates straight into an on-disk journal, optionally resuming an interrupted run"""
+        skip_ids = journal.completed_ids() if resume else set()
+        if resume:
+            self.logger.info(f"Resuming crawl with {len(skip_ids)} candidates already in {journal.filename}")
         
+        if self.dead_letters and not resume:
+            self.dead_letters.clear()
+        
+        journal.open(resume=resume)
+        try:
+            return await self.crawl(lambda index, record: journal.append(record, index),
+                                    limit=limit, previous=previous, skip_ids=skip_ids)
+        finally:
+            journal.close()
+
+    async def retry_dead_letters(self, journal: CrawlJournal) -> int:
+        """Retry only the candidates and listing pages in the dead-letter queue, appending results to the journal"""
+        entries = self.dead_letters.load() if self.dead_letters else []
+        if not entries:
+            self.logger.info("Dead-letter queue is empty, nothing to retry")
+            return 0
+        
+        candidates = [entry['candidate'] for entry in entries if entry['kind'] == 'candidate']
+        pages = [entry['key'] for entry in entries if entry['kind'] == 'listing_page']
+        self.logger.info(f"Retrying {len(candidates)} failed candidates and {len(pages)} failed listing pages")
+        # Entries are only resolved once their retry succeeded; whatever fails again is queued afresh
+        fetched_pages = []
+        
+        def on_result(index: int, record: Dict):
+            journal.append(record)
+            if 'error' not in record and 'scraping_error' not in record:
+                self.dead_letters.resolve('candidate', record.get('id') or record.get('candidate_id'))
+        
+        async def source(session: aiohttp.ClientSession) -> AsyncIterator[Dict]:
+            for candidate in candidates:
+                yield candidate
+            for page in pages:
+                result = await self.get_candidates_from_api(session, page)
+                if result is not None:
+                    fetched_pages.append(page)
+                for candidate in (result or {}).get('data', []):
+                    yield candidate
+        
+        skip_ids = journal.completed_ids()
         for candidate in candidates:
-            # Basic info
-            flattened = {
-                'id': candidate.get('id'),
-                'user_id': candidate.get('user_id'),
-                'slug': candidate.get('slug'),
-                'first_name': candidate.get('firstname'),
-                'last_name': candidate.get('lastname'),
-                'age': candidate.get('age'),
-                'job_title': candidate.get('title'),
-                'industry_title_az': candidate.get('industry', {}).get('title_az', ''),
-                'industry_title_en': candidate.get('industry', {}).get('title_en', ''),
-                'city': candidate.get('city', {}).get('title_en', ''),
-                'country': candidate.get('country', {}).get('title_en', ''),
-                'expected_salary': candidate.get('expected_salary'),
-                'is_premium': candidate.get('is_premium'),
-                'url': candidate.get('url'),
-                
-                # Summary
-                'summary': candidate.get('summary', ''),
-                
-                # Contact info
-                'address': candidate.get('contact_info', {}).get('address', ''),
-                'email': candidate.get('contact_info', {}).get('email', ''),
-                'phone': candidate.get('contact_info', {}).get('phone', ''),
-                'marital_status': candidate.get('contact_info', {}).get('marital_status', ''),
-                'linkedin': candidate.get('contact_info', {}).get('linkedin', ''),
-                'github': candidate.get('contact_info', {}).get('github', ''),
-                'skype': candidate.get('contact_info', {}).get('skype', ''),
-                
-                # Counts
-                'experience_count': len(candidate.get('experience', [])),
-                'education_count': len(candidate.get('education', [])),
-                'awards_count': len(candidate.get('awards_certificates', [])),
-                'skills_count': len(candidate.get('skills', [])),
-                'languages_count': len(candidate.get('languages', [])),
-                
-                # Latest/Primary Experience
-                'latest_job_title': '',
-                'latest_company': '',
-                'latest_job_description': '',
-                
-                # Latest Education
-                'latest_degree': '',
-                'latest_institution': '',
-                
-                # Skills summary
-                'skills_summary': '',
-                'languages_summary': '',
-                
-                # Error flag
-                'has_error': 'error' in candidate or 'scraping_error' in candidate
-            }
-            
-            # Add latest experience info
-            if candidate.get('experience') and len(candidate['experience']) > 0:
-                latest_exp = candidate['experience'][0]
-                flattened['latest_job_title'] = latest_exp.get('job_title', '')
-                flattened['latest_company'] = latest_exp.get('company', '')
-                flattened['latest_job_description'] = latest_exp.get('description', '')
-            
-            # Add latest education info
-            if candidate.get('education') and len(candidate['education']) > 0:
-                latest_edu = candidate['education'][0]
-                flattened['latest_degree'] = latest_edu.get('program', '')
-                flattened['latest_institution'] = latest_edu.get('institution', '')
-            
-            # Add skills summary
-            if candidate.get('skills'):
-                skills_names = [skill.get('skill_name', '') for skill in candidate['skills']]
-                flattened['skills_summary'] = ', '.join(skills_names)
-            
-            # Add languages summary
-            if candidate.get('languages'):
-                lang_info = [f"{lang.get('language', '')}: {lang.get('proficiency_level', '')}" 
-                           for lang in candidate['languages']]
-                flattened['languages_summary'] = ', '.join(lang_info)
-            
-            flattened_candidates.append(flattened)
-            
-        df = pd.DataFrame(flattened_candidates)
-        df.to_csv(filename, index=False)
-        self.logger.info(f"Saved {len(candidates)} candidates to {filename}")
+            if candidate['id'] in skip_ids:
+                self.dead_letters.resolve('candidate', candidate['id'])
+        journal.open(resume=True)
+        try:
+            scraped = await self.crawl(on_result, skip_ids=skip_ids, source=source)
+            # A page is done once every candidate on it has been handed to the journal
+            for page in fetched_pages:
+                self.dead_letters.resolve('listing_page', page)
+            return scraped
+        finally:
+            journal.close()
+            self.dead_letters.compact()
+            self.logger.info(f"{len(self.dead_letters.load())} items left in the dead-letter queue")
+
+    @timed('save_json')
+    async def save_to_json(self, candidates: Iterable[Dict], filename: str = 'candidates.json'):
+        """Save candidates data to JSON file, streaming one record at a time"""
+        chunks = 0
+        async with aiofiles.open(filename, 'w', encoding='utf-8') as f:
+            for chunk in iter_json_array(candidates):
+                await f.write(chunk)
+                chunks += 1
+        # One chunk per record plus the closing bracket
+        self.logger.info(f"Saved {chunks - 1} comprehensive candidates to {filename}")
+
+    @timed('save_jsonl')
+    def save_to_jsonl(self, candidates: Iterable[Dict], filename: str = 'candidates.jsonl', compression: Optional[str] = None):
+        """Save candidates as JSON Lines, optionally gzip or zstd compressed"""
+        count = write_json_lines(candidates, filename, compression)
+        self.logger.info(f"Saved {count} candidates to {filename}")
+
+    @timed('save_parquet')
+    def save_to_parquet(self, candidates: Iterable[Dict], directory: str = 'candidates_parquet'):
+        """Save candidates as typed Parquet tables with child tables keyed by candidate_id"""
+        counts = export_parquet(candidates, directory)
+        self.logger.info(f"Saved {counts['candidates']} candidates to {directory} "
+                         f"({', '.join(f'{count} {table}' for table, count in counts.items() if table != 'candidates')})")
+
+    @timed('save_store')
+    def save_to_store(self, candidates: Iterable[Dict], filename: str = 'candidates.db', full: bool = False):
+        """Upsert candidates into the SQLite store, rewriting only the candidates that changed; after a
+        complete crawl (full=True) candidates no longer listed are deleted"""
+        counts = import_candidates(candidates, filename, full=full)
+        self.logger.info(f"Updated {filename}: {', '.join(f'{count} {name}' for name, count in counts.items())}")
+
+    @timed('save_csv')
+    def save_to_csv(self, candidates: Iterable[Dict], filename: str = 'candidates.csv', normalized: bool = True):
+        """Save candidates data to CSV file with flattened structure, streaming one row at a time
+
+        Normalized output carries country/city/industry ids, with the titles in '<name>_countries.csv',
+        '<name>_cities.csv' and '<name>_industries.csv' next to it.
+        """
+        if normalized:
+            counts = write_normalized_csv(candidates, filename)
+            count = counts.pop('candidates')
+        else:
+            count = write_csv(candidates, filename)
+        if not count:
+            self.logger.warning("No candidates data to save")
+        elif normalized:
+            self.logger.info(f"Saved {count} candidates to {filename} "
+                             f"({', '.join(f'{n} {name}' for name, n in counts.items())})")
+        else:
+            self.logger.info(f"Saved {count} candidates to {filename}")
+
+def parse_candidate_html(html: str, backend: str = 'bs4') -> Dict:
+    """Extract all CV sections from a candidate page (module level so it can run in a process pool)"""
+    return get_parser(backend).parse(html)
+
+def parse_candidate_html_timed(html: str, backend: str = 'bs4') -> Tuple[Dict, Dict[str, float]]:
+    """Like parse_candidate_html, also returning the seconds spent in each parse step"""
+    timings = {}
+    return get_parser(backend).parse(html, timings), timings
 
 async def main():
     scraper = ComprehensiveVakansiyaScraper(max_concurrent=5)